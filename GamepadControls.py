@@ -10,114 +10,3020 @@ bl_info = {
 
 import bpy
 import mathutils
+import csv
+import ctypes
+import errno
+import glob
+import importlib
+import json
+import math
+import mmap
+import operator
+import os
+import queue
+import select
+import sys
 import threading
+import struct
 import time
+from array import array
+
+try:
+    import fcntl  # 仅 Unix，evdev 后端查询设备信息用
+except ImportError:
+    fcntl = None
 from bpy.types import Operator, Panel, PropertyGroup
-from bpy.props import FloatProperty, PointerProperty, BoolProperty
+from bpy.props import (FloatProperty, PointerProperty, BoolProperty, EnumProperty, StringProperty,
+                       FloatVectorProperty, CollectionProperty, IntProperty)
+
+# inputs 包的延迟解析：成功与失败都缓存，面板重绘和读取线程不再反复执行 import
+_inputs_module = None
+_inputs_probed = False
+
+
+def get_inputs_module(reprobe=False):
+    """返回 inputs 模块，未安装时返回 None；只有 reprobe=True 时才重新尝试导入"""
+    global _inputs_module, _inputs_probed
+    if reprobe or not _inputs_probed:
+        if reprobe:
+            importlib.invalidate_caches()  # 让刚 pip 安装的包可以被找到
+        try:
+            import inputs
+        except ImportError:
+            inputs = None
+        _inputs_module = inputs
+        _inputs_probed = True
+    return _inputs_module
+
+
+# 手柄设备发现（只枚举设备，不读取事件）
+class GamepadDiscovery:
+    """
+    旧的检测方式调用 get_gamepad()，手柄已连接但没有输入时会一直阻塞。
+    这里只枚举设备列表，结果缓存 ttl 秒；缓存过期或 /dev/input 目录发生变化（热插拔）时
+    在后台线程刷新，查询总是立即返回缓存值，不会阻塞主线程。
+    """
+
+    def __init__(self, ttl=5.0, enumerate_fn=None, watch_path='/dev/input'):
+        self.ttl = ttl
+        self._enumerate = enumerate_fn or _enumerate_gamepads
+        self._watch_path = watch_path
+        self._names = ()
+        self._checked = None  # 上次枚举完成的时间
+        self._watch_mtime = None
+        self._refreshing = False
+        self._lock = threading.Lock()
+
+    @property
+    def checked(self):
+        """是否已完成过至少一次枚举"""
+        return self._checked is not None
+
+    @property
+    def names(self):
+        """已发现的手柄名称"""
+        self._maybe_refresh()
+        return self._names
+
+    def available(self):
+        self._maybe_refresh()
+        return bool(self._names)
+
+    def invalidate(self):
+        """下一次查询时在后台重新枚举"""
+        self._checked = None
+
+    def refresh(self):
+        """同步重新枚举（不在主线程热路径上调用）"""
+        try:
+            names = tuple(self._enumerate())
+        except Exception:
+            names = ()
+        self._names = names
+        self._checked = time.monotonic()
+        self._refreshing = False
+        return names
+
+    def _maybe_refresh(self):
+        if self._refreshing:
+            return
+        if self._checked is not None and not self._hotplugged():
+            if time.monotonic() - self._checked < self.ttl:
+                return
+        with self._lock:
+            if self._refreshing:
+                return
+            self._refreshing = True
+        threading.Thread(target=self.refresh, name="GamepadDiscovery", daemon=True).start()
+
+    def _hotplugged(self):
+        # 设备节点增删会改变目录的修改时间，一次 stat 即可发现热插拔
+        try:
+            mtime = os.stat(self._watch_path).st_mtime_ns
+        except OSError:
+            return False
+        changed = self._watch_mtime is not None and mtime != self._watch_mtime
+        self._watch_mtime = mtime
+        return changed
+
+
+def _enumerate_gamepads():
+    inputs = get_inputs_module()
+    if inputs is None:
+        # 没有 inputs 包时，Linux 上仍可通过 evdev 后端使用手柄
+        return [os.path.basename(path) for path in find_evdev_gamepads()]
+    # 新建 DeviceManager 重新扫描设备，只枚举不读取
+    return [device.name for device in inputs.DeviceManager().gamepads]
+
+
+gamepad_discovery = GamepadDiscovery()
+
+
+# 动态检测函数
+def check_gamepad_available():
+    """非阻塞：返回最近一次后台枚举的结果"""
+    return gamepad_discovery.available()
+
+from bpy_extras import view3d_utils
+from bpy_extras.io_utils import ExportHelper, ImportHelper
+
+# Blender 自带 numpy；缺失时关键帧精简和摇杆响应查找表退回纯 Python 实现
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+# 快照帧布局：轴值 + 按键电平 + 延迟时间戳，全部存放在同一个定长 list 中
+AXIS_LEFT_X = 0
+AXIS_LEFT_Y = 1
+AXIS_RIGHT_X = 2
+AXIS_RIGHT_Y = 3
+AXIS_LEFT_TRIGGER = 4
+AXIS_RIGHT_TRIGGER = 5
+AXIS_HAT_X = 6
+AXIS_HAT_Y = 7
+AXIS_COUNT = 8
+
+# 十字键被拆成四个虚拟按键，两个扳机按行程转成虚拟按键，方便与普通按键一样产生边沿和绑定动作
+BUTTON_CODES = (
+    'BTN_SOUTH', 'BTN_EAST', 'BTN_WEST', 'BTN_NORTH',
+    'BTN_TL', 'BTN_TR', 'BTN_SELECT', 'BTN_START', 'BTN_MODE',
+    'BTN_THUMBL', 'BTN_THUMBR',
+    'DPAD_UP', 'DPAD_DOWN', 'DPAD_LEFT', 'DPAD_RIGHT',
+    'TRIGGER_LEFT', 'TRIGGER_RIGHT',
+)
+BUTTON_INDEX = {code: i for i, code in enumerate(BUTTON_CODES)}
+BUTTON_COUNT = len(BUTTON_CODES)
+
+BUTTON_LEVEL_BASE = AXIS_COUNT
+# 时间戳随帧一起发布，主线程读到的总是与该帧匹配的一组
+TIMING_BASE = AXIS_COUNT + BUTTON_COUNT
+FRAME_EVENT_AGE = TIMING_BASE  # 接收时距事件（内核）时间戳已过去的秒数，未知为 NaN
+FRAME_RECEIVE_TIME = TIMING_BASE + 1  # 读取线程收到该帧首个事件的时刻（perf_counter）
+FRAME_PUBLISH_TIME = TIMING_BASE + 2  # 发布时刻（perf_counter）
+FRAME_SIZE = TIMING_BASE + 3
+
+
+# 摇杆/扳机轴对应的帧槽位
+AXIS_SLOTS = {
+    'ABS_X': AXIS_LEFT_X,
+    'ABS_Y': AXIS_LEFT_Y,
+    'ABS_RX': AXIS_RIGHT_X,
+    'ABS_RY': AXIS_RIGHT_Y,
+    'ABS_Z': AXIS_LEFT_TRIGGER,
+    'ABS_RZ': AXIS_RIGHT_TRIGGER,
+}
+_ANALOG_SLOTS = tuple(sorted(AXIS_SLOTS.values()))
+_ANALOG_END = len(_ANALOG_SLOTS)  # 摇杆和扳机占据帧开头连续的槽位 0 ~ _ANALOG_END - 1
+# 虚拟扳机按键：(按键索引, 扳机轴槽位)；按下与松开的阈值不同（回差），行程停在阈值附近时不会反复触发
+TRIGGER_BUTTONS = (
+    (BUTTON_INDEX['TRIGGER_LEFT'], AXIS_LEFT_TRIGGER),
+    (BUTTON_INDEX['TRIGGER_RIGHT'], AXIS_RIGHT_TRIGGER),
+)
+_TRIGGER_SLOTS = slice(AXIS_LEFT_TRIGGER, AXIS_RIGHT_TRIGGER + 1)  # 两个扳机轴相邻
+TRIGGER_PRESS_THRESHOLD = 0.6
+TRIGGER_RELEASE_THRESHOLD = 0.4
+# 十字键轴：(帧槽位, 负方向虚拟按键, 正方向虚拟按键)
+HAT_SLOTS = {
+    'ABS_HAT0X': (AXIS_HAT_X, 'DPAD_LEFT', 'DPAD_RIGHT'),
+    'ABS_HAT0Y': (AXIS_HAT_Y, 'DPAD_UP', 'DPAD_DOWN'),
+}
+
+# 手柄设备配置：各轴的中心偏移与满量程，用于把原始值归一化
+class DeviceProfile:
+    __slots__ = ('name', 'axis_ranges', 'axis_offsets')
+
+    def __init__(self, name, axis_ranges, axis_offsets=None):
+        self.name = name
+        self.axis_ranges = axis_ranges
+        self.axis_offsets = axis_offsets or {}
+
+
+DEFAULT_PROFILE = DeviceProfile('Xbox', {
+    'ABS_X': 32768.0,
+    'ABS_Y': 32768.0,
+    'ABS_RX': 32768.0,
+    'ABS_RY': 32768.0,
+    'ABS_Z': 255.0,
+    'ABS_RZ': 255.0,
+})
+
+
+# 解码表项：0 ~ AXIS_COUNT - 1 为轴槽位，_DECODE_BUTTON 起为按键（减去它即按键索引），
+# 负数为其他处理类型。表项是整数，最常见的轴事件只需一次查表、两次比较，不必解包元组
+_DECODE_BUTTON = AXIS_COUNT
+_DECODE_SYNC = -1
+_DECODE_HAT = -2
+_DECODE_IGNORE = -3
+
+
+class _DecodeTable(dict):
+    """未知编码统一映射为忽略项，解码循环里只需一次下标访问"""
+    __slots__ = ()
+
+    def __missing__(self, code):
+        return _DECODE_IGNORE
+
+
+# 表驱动的事件解码器
+class EventDecoder:
+    """
+    按设备配置预先生成 事件编码 -> 整数表项 的分派表，十字键另查 hats。
+    轴事件只记下原始值，换算交给 EventCoalescer 在报告结束（SYN_REPORT）后统一完成；
+    按键与十字键事件逐个处理。返回 (按键类事件数, 是否遇到报告结束)。
+    """
+    __slots__ = ('profile', 'table', 'hats', 'axis_scales', 'axis_offsets')
+
+    def __init__(self, profile=DEFAULT_PROFILE):
+        self.profile = profile
+        table = _DecodeTable()
+        scales = [1.0] * AXIS_COUNT
+        offsets = [0] * AXIS_COUNT
+        for code, slot in AXIS_SLOTS.items():
+            table[code] = slot
+            scales[slot] = 1.0 / profile.axis_ranges[code]
+            offsets[slot] = profile.axis_offsets.get(code, 0)
+        for code, index in BUTTON_INDEX.items():
+            if code.startswith('BTN_'):
+                table[code] = _DECODE_BUTTON + index
+        self.hats = {}  # 十字键编码 -> (帧槽位, 负方向按键索引, 正方向按键索引)
+        for code, (slot, negative, positive) in HAT_SLOTS.items():
+            table[code] = _DECODE_HAT
+            self.hats[code] = (slot, BUTTON_INDEX[negative], BUTTON_INDEX[positive])
+        table['SYN_REPORT'] = _DECODE_SYNC
+        self.table = table
+        self.axis_scales = scales  # 按槽位索引的量程倒数，乘法代替除法
+        self.axis_offsets = offsets  # 按槽位索引的中心偏移
+
+    def decode_batch(self, events, raw_axes, values, edges=None):
+        """一次遍历解码 get_gamepad() 返回的整批事件，按键边沿追加到 edges"""
+        table = self.table
+        buttons = _DECODE_BUTTON
+        keys = 0
+        synced = False
+        for event in events:
+            entry = table[event.code]
+            if entry >= 0:
+                if entry < buttons:
+                    raw_axes[entry] = event.state
+                    continue
+                index = entry - buttons
+                pressed = event.state > 0
+                if _set_button(values, index, pressed) and edges is not None:
+                    edges.push(index, pressed, event.timestamp)
+                keys += 1
+            elif entry == _DECODE_SYNC:
+                synced = True
+            elif entry == _DECODE_HAT:
+                slot, negative, positive = self.hats[event.code]
+                state = event.state
+                values[slot] = state
+                if _set_button(values, negative, state < 0) and edges is not None:
+                    edges.push(negative, state < 0, event.timestamp)
+                if _set_button(values, positive, state > 0) and edges is not None:
+                    edges.push(positive, state > 0, event.timestamp)
+                keys += 1
+        return keys, synced
+
+
+# 摇杆响应：径向死区、反死区和响应曲线，按 16 位原始精度预先制表
+RESPONSE_LUT_SIZE = 1 << 16
+RESPONSE_CURVES = ('LINEAR', 'EXPONENT', 'CUSTOM')
+
+
+def response_curve(t, curve='LINEAR', exponent=2.0, points=(0.25, 0.5, 0.75)):
+    """死区外归一化的推杆幅度 t（0~1）对应的输出幅度（0~1）"""
+    if curve == 'EXPONENT':
+        return t ** exponent
+    if curve == 'CUSTOM':
+        # 经过 (0, 0)、(0.25, p0)、(0.5, p1)、(0.75, p2)、(1, 1) 的折线
+        knots = (0.0, *points, 1.0)
+        position = t * (len(knots) - 1)
+        i = min(int(position), len(knots) - 2)
+        return knots[i] + (knots[i + 1] - knots[i]) * (position - i)
+    return t
+
+
+def build_response_table(dead_zone=0.1, anti_dead_zone=0.0, curve='LINEAR', exponent=2.0,
+                         points=(0.25, 0.5, 0.75)):
+    """
+    预先计算 推杆幅度 -> 增益 的查找表，table[int(r * (RESPONSE_LUT_SIZE - 1))] 乘以摇杆两个轴即为整形结果，
+    方向不变。死区内增益为 0；死区外把 [dead_zone, 1] 重新映射到 [0, 1] 经过曲线，
+    再抬高到 [anti_dead_zone, 1]，抵消游戏自身的死区或电机的起步阈值。
+    """
+    if np is not None:
+        # 整张表向量化计算后整块拷贝进 array：读取线程查表得到的是 Python float 而不是 numpy 标量
+        return array('d', response_gains(dead_zone, anti_dead_zone, curve, exponent, points).tobytes())
+    top = RESPONSE_LUT_SIZE - 1
+    span = 1.0 - dead_zone
+    table = array('d', bytes(8 * RESPONSE_LUT_SIZE))
+    for i in range(int(dead_zone * top), RESPONSE_LUT_SIZE):
+        r = i / top
+        if r <= dead_zone:
+            continue
+        shaped = response_curve((r - dead_zone) / span, curve, exponent, points)
+        table[i] = (anti_dead_zone + (1.0 - anti_dead_zone) * shaped) / r
+    return table
+
+
+def response_gains(dead_zone, anti_dead_zone, curve, exponent, points):
+    """build_response_table 的 numpy 实现，返回 RESPONSE_LUT_SIZE 个增益"""
+    r = np.arange(RESPONSE_LUT_SIZE, dtype=np.float64) / (RESPONSE_LUT_SIZE - 1)
+    gains = np.zeros(RESPONSE_LUT_SIZE)
+    outside = r > dead_zone
+    r = r[outside]
+    t = (r - dead_zone) / (1.0 - dead_zone)
+    if curve == 'EXPONENT':
+        shaped = t ** exponent
+    elif curve == 'CUSTOM':
+        knots = (0.0, *points, 1.0)
+        shaped = np.interp(t, np.linspace(0.0, 1.0, len(knots)), knots)
+    else:
+        shaped = t
+    gains[outside] = (anti_dead_zone + (1.0 - anti_dead_zone) * shaped) / r
+    return gains
+
+
+def _response_key(settings, prefix):
+    return (getattr(settings, prefix + '_dead_zone'),
+            getattr(settings, prefix + '_anti_dead_zone'),
+            getattr(settings, prefix + '_response_curve'),
+            getattr(settings, prefix + '_response_exponent'),
+            tuple(getattr(settings, prefix + '_response_points')))
+
+
+class StickResponse:
+    """
+    左右摇杆各一张增益查找表。读取线程在报告结束时按摇杆整体（径向）整形：
+    一次 hypot、一次查表、两次乘法，主线程每个周期不再做死区判断和 pow() 运算。
+    设置变化时 configure() 在主线程重建查找表并整体替换 sticks，读取线程不会读到半张表；
+    未配置时不整形。
+    """
+    __slots__ = ('sticks', '_keys')
+
+    def __init__(self):
+        self.sticks = ()  # ((x 槽位, y 槽位, 查找表), ...)
+        self._keys = [None, None]
+
+    def configure(self, settings):
+        """按设置重建查找表，只重建参数变化的摇杆"""
+        sticks = []
+        for i, (prefix, x_slot, y_slot) in enumerate((('left', AXIS_LEFT_X, AXIS_LEFT_Y),
+                                                      ('right', AXIS_RIGHT_X, AXIS_RIGHT_Y))):
+            key = _response_key(settings, prefix)
+            if key == self._keys[i] and len(self.sticks) > i:
+                table = self.sticks[i][2]
+            elif i and key == self._keys[0]:
+                table = sticks[0][2]  # 两个摇杆参数相同时共用一张表
+            else:
+                table = build_response_table(*key)
+            self._keys[i] = key
+            sticks.append((x_slot, y_slot, table))
+        self.sticks = tuple(sticks)
+
+    def apply(self, linear, values):
+        """把线性换算后的摇杆值整形后写入 values"""
+        top = RESPONSE_LUT_SIZE - 1
+        hypot = math.hypot
+        for x_slot, y_slot, table in self.sticks:
+            x = linear[x_slot]
+            y = linear[y_slot]
+            r = hypot(x, y)
+            # 方形外框的对角超出单位圆，饱和到幅度 1
+            gain = table[int(r * top)] if r < 1.0 else 1.0 / r
+            values[x_slot] = x * gain
+            values[y_slot] = y * gain
+
+
+stick_response = StickResponse()
+
+
+def update_stick_response(self, context):
+    stick_response.configure(self)
+
+
+# 读取线程中的轴事件合并
+class EventCoalescer:
+    """
+    主线程只按 60Hz 采样，同一个轴的中间值没有意义：解码阶段每个轴只保留最后的原始值，
+    报告结束（SYN_REPORT，可能跨越多次 get_gamepad() 调用）后，由读取线程按发布窗口
+    （PUBLISH_INTERVAL）决定何时 flush：只有数值真正变化的轴才会被换算并交付，之后才发布一帧。
+    按键事件不经过合并，每一次按下/松开都会被计数，边沿立即写入边沿队列。
+    摇杆经过 response 整形后输出不变的（如死区内的抖动）也不交付。
+    """
+    __slots__ = ('axis_scales', 'axis_offsets', 'response', 'raw_events', 'delivered_events',
+                 'published_frames', 'triggers_changed', '_last_raw', '_linear', '_shaped', '_pending_keys')
+
+    def __init__(self, decoder, response=None):
+        self.bind(decoder)
+        self.response = response if response is not None else StickResponse()
+        self.raw_events = 0  # 从设备读到的事件总数
+        self.delivered_events = 0  # 合并后实际交付的事件数
+        self.published_frames = 0  # 发布给主线程的帧数
+        self.triggers_changed = False  # 最近一次 flush 中扳机轴的原始值是否变化
+        self._last_raw = [0] * _ANALOG_END
+        self._linear = [0.0] * _ANALOG_END  # 线性换算后、整形前的轴值
+        self._shaped = [0.0] * _ANALOG_END
+        self._pending_keys = 0
+
+    def bind(self, decoder):
+        """切换设备配置时改用新解码器的换算参数，计数保留"""
+        self.axis_scales = decoder.axis_scales
+        self.axis_offsets = decoder.axis_offsets
+
+    def add_keys(self, keys):
+        """按键类事件不合并，计入下一次 flush 交付的事件数"""
+        self._pending_keys += keys
+
+    def flush(self, raw_axes, values):
+        """把变化的轴写入工作帧，返回本次交付的事件数（含期间的按键事件）"""
+        delivered = self._pending_keys
+        self._pending_keys = 0
+        raw = raw_axes[:_ANALOG_END]
+        last = self._last_raw
+        triggers_changed = False
+        if raw != last:
+            # 比较、换算和整形前的拷贝都是整段的切片/map 操作，在 C 中完成，不逐轴进入 Python 循环
+            triggers_changed = raw[_TRIGGER_SLOTS] != last[_TRIGGER_SLOTS]
+            self._last_raw = raw
+            linear = self._linear
+            shaped = self._shaped
+            linear[:] = map(operator.mul, map(operator.sub, raw, self.axis_offsets), self.axis_scales)
+            shaped[:] = linear
+            self.response.apply(linear, shaped)
+            # 整形后仍不变的轴（如死区内的抖动）不计入交付
+            current = values[:_ANALOG_END]
+            if shaped != current:
+                delivered += sum(map(operator.ne, shaped, current))
+                values[:_ANALOG_END] = shaped
+        self.triggers_changed = triggers_changed
+        self.delivered_events += delivered
+        if delivered:
+            self.published_frames += 1
+        return delivered
+
+    @property
+    def coalesce_ratio(self):
+        """原始事件数 / 交付事件数"""
+        if not self.delivered_events:
+            return 0.0
+        return self.raw_events / self.delivered_events
+
+    def invalidate(self, slot):
+        """换算参数变化后，下次 flush 时重新换算该轴"""
+        self._last_raw[slot] = None
+
+
+# 摇杆漂移在线校准
+# 静止带覆盖磨损摇杆常见的漂移量（可以超出默认死区，正是这种漂移会漏到输出里）；
+# 离中心越远越可能是手指有意推着，因此偏离中心的位置要求更长时间完全不动
+CALIBRATION_REST_BAND = 0.15  # 距当前中心不超过量程的该比例时可能处于静止
+CALIBRATION_REST_JITTER = 0.01  # 静止期间原始值相对进入静止时的变化超过量程的该比例即重新计时
+CALIBRATION_REST_SECONDS = 0.5  # 在中心附近（抖动范围内）停留该时长后开始跟踪中心
+CALIBRATION_DRIFT_REST_SECONDS = 2.0  # 停在偏离中心处时，完全不动该时长后才当作漂移开始跟踪
+CALIBRATION_TIME_CONSTANT = 2.0  # 中心估计的指数平均时间常数（秒）
+CALIBRATION_STEP = 1e-3  # 中心估计偏离当前换算参数超过量程的该比例时才更新
+CALIBRATION_CAPTURE_SECONDS = 5.0  # 校准操作器采集摇杆极限位置的时长
+CALIBRATION_MIN_EXTENT = 0.5  # 采集到的幅度小于设备量程的该比例时视为没有推到底，保留原量程
+STICK_AXIS_SLOTS = ((AXIS_LEFT_X, AXIS_LEFT_Y), (AXIS_RIGHT_X, AXIS_RIGHT_Y))
+_SLOT_CODES = {slot: code for code, slot in AXIS_SLOTS.items()}
+
+
+class AxisCalibrator:
+    """
+    在读取线程中跟踪各摇杆轴的中心和量程（原始值单位），直接修正解码器的换算参数：
+    - 中心：摇杆在静止带内几乎不动地停留一段时间后，对原始值做指数平均。
+      读取超时也算一次静止观测（完全静止的摇杆不会产生事件），停在漂移位置不再发送事件的摇杆同样会被重新居中；
+      偏离中心的位置要停留更久（CALIBRATION_DRIFT_REST_SECONDS），手指推着的摇杆总有抖动，会重新计时
+    - 量程：原始值超出当前量程时扩大；calibrate 操作器采集期间按实际推到的极限重新设定
+    每个设备的结果保存在 profiles 中（按后端报告的设备名，同一型号配置的不同手柄互不影响），由主线程读写 JSON 文件。
+    """
+    __slots__ = ('enabled', 'profiles', 'device', 'centres', 'ranges', 'capturing', 'clock',
+                 '_decoder', '_coalescer', '_rest_since', '_rest_anchor', '_observed', '_low', '_high',
+                 '_captured')
+
+    def __init__(self, clock=time.perf_counter):
+        self.enabled = True
+        self.profiles = {}  # 设备名 -> {轴编码: [中心, 量程]}
+        self.device = None
+        self.centres = [0.0] * AXIS_COUNT
+        self.ranges = [1.0] * AXIS_COUNT
+        self.capturing = False
+        self.clock = clock
+        self._decoder = None
+        self._coalescer = None
+        self._rest_since = [None, None]  # 各摇杆进入静止带的时刻
+        self._rest_anchor = [0.0] * AXIS_COUNT  # 进入静止带时各轴的原始值
+        self._observed = [0.0, 0.0]  # 各摇杆上一次参与中心估计的时刻
+        self._low = [0.0] * AXIS_COUNT
+        self._high = [0.0] * AXIS_COUNT
+        self._captured = None  # 主线程算出、等待读取线程套用的量程
+
+    def bind(self, decoder, coalescer, device=None):
+        """设备打开后以设备配置为初值，再套用该设备（device 为后端报告的设备名）保存的校准结果"""
+        self._decoder = decoder
+        self._coalescer = coalescer
+        profile = decoder.profile
+        self.device = device or profile.name
+        saved = self.profiles.get(self.device, {})
+        for sticks in STICK_AXIS_SLOTS:
+            for slot in sticks:
+                code = _SLOT_CODES[slot]
+                centre, extent = saved.get(code, (profile.axis_offsets.get(code, 0), profile.axis_ranges[code]))
+                self.centres[slot] = float(centre)
+                self.ranges[slot] = float(extent)
+                self._apply(slot)
+        self._rest_since[0] = self._rest_since[1] = None
+
+    def _apply(self, slot):
+        self._decoder.axis_offsets[slot] = self.centres[slot]
+        self._decoder.axis_scales[slot] = 1.0 / self.ranges[slot]
+        self._coalescer.invalidate(slot)
+
+    def observe(self, raw_axes, now=None):
+        """每份完整报告及每次读取超时调用一次，返回换算参数是否变化"""
+        if self._decoder is None:
+            return False
+        if now is None:
+            now = self.clock()
+        centres = self.centres
+        ranges = self.ranges
+        offsets = self._decoder.axis_offsets
+        changed = False
+        captured = self._captured
+        if captured is not None:
+            self._captured = None
+            for slot, extent in captured.items():
+                ranges[slot] = extent
+                self._apply(slot)
+            changed = True
+
+        for stick, (x_slot, y_slot) in enumerate(STICK_AXIS_SLOTS):
+            x = raw_axes[x_slot]
+            y = raw_axes[y_slot]
+            for slot, value in ((x_slot, x), (y_slot, y)):
+                if self.capturing:
+                    if value < self._low[slot]:
+                        self._low[slot] = value
+                    elif value > self._high[slot]:
+                        self._high[slot] = value
+                extent = abs(value - centres[slot])
+                if extent > ranges[slot]:
+                    ranges[slot] = extent  # 超出量程：扩大
+                    self._apply(slot)
+                    changed = True
+
+            if not self.enabled:
+                continue
+            band = CALIBRATION_REST_BAND
+            if abs(x - centres[x_slot]) > band * ranges[x_slot] or abs(y - centres[y_slot]) > band * ranges[y_slot]:
+                self._rest_since[stick] = None
+                continue
+            # 静止要求原始值几乎不变：手指轻推的摇杆会抖动，重新计时
+            anchor = self._rest_anchor
+            jitter = CALIBRATION_REST_JITTER
+            since = self._rest_since[stick]
+            if (since is None or abs(x - anchor[x_slot]) > jitter * ranges[x_slot]
+                    or abs(y - anchor[y_slot]) > jitter * ranges[y_slot]):
+                self._rest_since[stick] = self._observed[stick] = now
+                anchor[x_slot] = x
+                anchor[y_slot] = y
+                continue
+            rest = CALIBRATION_REST_SECONDS
+            if abs(x - centres[x_slot]) > jitter * ranges[x_slot] or abs(y - centres[y_slot]) > jitter * ranges[y_slot]:
+                rest = CALIBRATION_DRIFT_REST_SECONDS
+            if now - since < rest:
+                self._observed[stick] = now
+                continue
+            alpha = 1.0 - math.exp(-(now - self._observed[stick]) / CALIBRATION_TIME_CONSTANT)
+            self._observed[stick] = now
+            for slot, value in ((x_slot, x), (y_slot, y)):
+                centre = centres[slot] + (value - centres[slot]) * alpha
+                centres[slot] = centre
+                if abs(centre - offsets[slot]) > CALIBRATION_STEP * ranges[slot]:
+                    self._apply(slot)
+                    changed = True
+        return changed
+
+    def calibrated_profile(self):
+        """套用当前校准结果的设备配置"""
+        profile = self._decoder.profile
+        ranges = dict(profile.axis_ranges)
+        offsets = dict(profile.axis_offsets)
+        for sticks in STICK_AXIS_SLOTS:
+            for slot in sticks:
+                code = _SLOT_CODES[slot]
+                ranges[code] = self.ranges[slot]
+                offsets[code] = self.centres[slot]
+        return DeviceProfile(self.device, ranges, offsets)
+
+    def begin_capture(self):
+        """开始采集摇杆极限位置（主线程调用）"""
+        self._low[:] = self.centres
+        self._high[:] = self.centres
+        self.capturing = True
+
+    def finish_capture(self):
+        """结束采集，返回重新设定了量程的轴数（主线程调用，由读取线程套用）"""
+        self.capturing = False
+        if self._decoder is None:
+            return 0
+        profile = self._decoder.profile
+        captured = {}
+        for sticks in STICK_AXIS_SLOTS:
+            for slot in sticks:
+                centre = self.centres[slot]
+                extent = max(self._high[slot] - centre, centre - self._low[slot])
+                if extent >= CALIBRATION_MIN_EXTENT * profile.axis_ranges[_SLOT_CODES[slot]]:
+                    captured[slot] = extent
+        self._captured = captured
+        self.remember(captured)
+        return len(captured)
+
+    def remember(self, ranges=None):
+        """把当前设备的校准结果记入 profiles"""
+        if self.device is None:
+            return
+        ranges = ranges or {}
+        self.profiles[self.device] = {
+            _SLOT_CODES[slot]: [round(self.centres[slot], 3), round(ranges.get(slot, self.ranges[slot]), 3)]
+            for sticks in STICK_AXIS_SLOTS for slot in sticks
+        }
+
+    def load(self, path):
+        try:
+            with open(path, encoding='utf-8') as f:
+                self.profiles = json.load(f)
+        except (OSError, ValueError):
+            self.profiles = {}
+
+    def save(self, path):
+        try:
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(self.profiles, f, ensure_ascii=False, indent=1)
+        except OSError as e:
+            print(f"无法保存摇杆校准: {e}")
+
+
+stick_calibration = AxisCalibrator()
+
+
+def update_stick_calibration(self, context):
+    stick_calibration.enabled = self.auto_calibrate and not runtime_status.recording
+
+
+def calibration_path():
+    """摇杆校准文件：Blender 用户配置目录下，与 .blend 文件无关"""
+    return os.path.join(bpy.utils.user_resource('CONFIG'), "gamepad_calibration.json")
+
+
+def _set_button(values, index, pressed):
+    """写入按键电平，返回电平是否变化（即是否产生了边沿）"""
+    level = BUTTON_LEVEL_BASE + index
+    if pressed:
+        if values[level]:
+            return False
+        values[level] = 1.0
+        return True
+    if not values[level]:
+        return False
+    values[level] = 0.0
+    return True
+
+
+def _update_trigger_buttons(values, edges, timestamp):
+    """按换算后的扳机行程更新虚拟扳机按键，边沿追加到 edges"""
+    for index, slot in TRIGGER_BUTTONS:
+        if values[BUTTON_LEVEL_BASE + index]:
+            pressed = values[slot] > TRIGGER_RELEASE_THRESHOLD
+        else:
+            pressed = values[slot] > TRIGGER_PRESS_THRESHOLD
+        if _set_button(values, index, pressed):
+            edges.push(index, pressed, timestamp)
+
+
+# 按键边沿环形队列
+BUTTON_EDGE_CAPACITY = 256  # 2 的幂
+
+
+class ButtonEdgeRing:
+    """
+    读取线程（唯一写入方）在解码时追加带时间戳的按下/松开边沿，主线程（唯一读取方）
+    每个计时器周期取空一次，两个周期之间的短按和连按都不会丢失或合并。
+    槽位预先分配在 array 中，追加和取出都不分配内存；写入方只改 _head，读取方只改 _tail，
+    GIL 下整数赋值是原子的，因此不需要锁。队列满时丢弃新的边沿并计入 overflow。
+    边沿编码：按下为 按键索引 + 1，松开为 -(按键索引 + 1)。
+    """
+    __slots__ = ('capacity', 'overflow', 'popped_time', '_mask', '_times', '_edges', '_head', '_tail')
+
+    def __init__(self, capacity=BUTTON_EDGE_CAPACITY):
+        self.capacity = capacity
+        self.overflow = 0  # 因队列满被丢弃的边沿数
+        self.popped_time = 0.0  # 最近一次 pop() 取出的边沿的时间戳
+        self._mask = capacity - 1
+        self._times = array('d', bytes(8 * capacity))
+        self._edges = array('h', bytes(2 * capacity))
+        self._head = 0
+        self._tail = 0
+
+    def __len__(self):
+        return self._head - self._tail
+
+    def push(self, index, pressed, timestamp):
+        """读取线程调用，返回是否成功入队"""
+        head = self._head
+        if head - self._tail >= self.capacity:
+            self.overflow += 1
+            return False
+        slot = head & self._mask
+        self._times[slot] = timestamp
+        self._edges[slot] = index + 1 if pressed else -index - 1
+        self._head = head + 1  # 数据写完后才对读取方可见
+        return True
+
+    def pop(self):
+        """主线程调用：取出最早的边沿编码，队列为空时返回 0"""
+        tail = self._tail
+        if tail == self._head:
+            return 0
+        slot = tail & self._mask
+        self.popped_time = self._times[slot]
+        edge = self._edges[slot]
+        self._tail = tail + 1
+        return edge
+
+    def clear(self):
+        """主线程调用：丢弃所有待处理的边沿"""
+        self._tail = self._head
+
+
+# 手柄状态类（一帧一致的输入快照）
+class GamepadState:
+    __slots__ = ('values', 'seq', 'coalesced')
+
+    def __init__(self):
+        self.values = [0.0] * FRAME_SIZE
+        self.seq = 0  # 该帧对应的发布序号
+        self.coalesced = 0  # 与上一次读取之间被合并掉的帧数
+
+    def buttons_active(self):
+        """是否有按键按住（两帧之间的短按由按键边沿队列报告）"""
+        values = self.values
+        for i in range(BUTTON_LEVEL_BASE, TIMING_BASE):
+            if values[i]:
+                return True
+        return False
+
+
+# 读取线程与模态操作器之间的双缓冲快照交接（无锁）
+class GamepadStateBuffer:
+    """
+    写入方（读取线程）只写后台缓冲，写完后切换前台索引并递增序号；
+    读取方（主线程）把前台缓冲整体拷贝进自己预分配的帧，拷贝前后序号一致才算成功，
+    因此不会读到新旧混杂的半帧。缓冲和读取方的帧都是定长 list，发布和读取都只是
+    一次原地切片拷贝，不分配新的对象；主线程按下标读取时也不需要把 double 装箱成 float。
+    """
+    __slots__ = ('_buffers', '_front', '_seq', 'edges')
+
+    def __init__(self):
+        self._buffers = ([0.0] * FRAME_SIZE, [0.0] * FRAME_SIZE)
+        self._front = 0
+        self._seq = 0
+        self.edges = ButtonEdgeRing()  # 与快照一起交接的按键边沿
+
+    @property
+    def seq(self):
+        return self._seq
+
+    def publish(self, values):
+        """读取线程调用：发布一帧完整状态"""
+        back = 1 - self._front
+        self._buffers[back][:] = values
+        self._front = back
+        self._seq += 1
+
+    def read_into(self, state):
+        """主线程调用：把最新一帧拷贝进 state，返回是否有新帧"""
+        while True:
+            seq = self._seq
+            state.values[:] = self._buffers[self._front]
+            if seq == self._seq:
+                break
+        if seq == state.seq:
+            state.coalesced = 0
+            return False
+        state.coalesced = seq - state.seq - 1
+        state.seq = seq
+        return True
+
+
+# evdev 事件类型与编码（Linux input-event-codes.h）
+EV_SYN = 0x00
+EV_KEY = 0x01
+EV_ABS = 0x03
+
+EV_TYPE_NAMES = {EV_SYN: 'Sync', EV_KEY: 'Key', EV_ABS: 'Absolute'}
+
+# (事件类型 << 16 | 编码) -> 编码名称，与 inputs 包使用的名称一致
+EVDEV_CODES = {
+    EV_SYN << 16 | 0x00: 'SYN_REPORT',
+    EV_ABS << 16 | 0x00: 'ABS_X',
+    EV_ABS << 16 | 0x01: 'ABS_Y',
+    EV_ABS << 16 | 0x02: 'ABS_Z',
+    EV_ABS << 16 | 0x03: 'ABS_RX',
+    EV_ABS << 16 | 0x04: 'ABS_RY',
+    EV_ABS << 16 | 0x05: 'ABS_RZ',
+    EV_ABS << 16 | 0x10: 'ABS_HAT0X',
+    EV_ABS << 16 | 0x11: 'ABS_HAT0Y',
+    EV_KEY << 16 | 0x130: 'BTN_SOUTH',
+    EV_KEY << 16 | 0x131: 'BTN_EAST',
+    EV_KEY << 16 | 0x133: 'BTN_NORTH',
+    EV_KEY << 16 | 0x134: 'BTN_WEST',
+    EV_KEY << 16 | 0x136: 'BTN_TL',
+    EV_KEY << 16 | 0x137: 'BTN_TR',
+    EV_KEY << 16 | 0x138: 'BTN_TL2',
+    EV_KEY << 16 | 0x139: 'BTN_TR2',
+    EV_KEY << 16 | 0x13a: 'BTN_SELECT',
+    EV_KEY << 16 | 0x13b: 'BTN_START',
+    EV_KEY << 16 | 0x13c: 'BTN_MODE',
+    EV_KEY << 16 | 0x13d: 'BTN_THUMBL',
+    EV_KEY << 16 | 0x13e: 'BTN_THUMBR',
+}
+EVDEV_CODE_NUMBERS = {name: key for key, name in EVDEV_CODES.items()}
+_EV_TYPE_BY_NAME = {name: ev_type for ev_type, name in EV_TYPE_NAMES.items()}
+
+
+# 后端产生的事件（与 inputs.InputEvent 的字段一致）
+class GamepadEvent:
+    __slots__ = ('ev_type', 'code', 'state', 'timestamp')
+
+    def __init__(self, ev_type, code, state, timestamp=0.0):
+        self.ev_type = ev_type
+        self.code = code
+        self.state = state
+        self.timestamp = timestamp
+
+
+# 输入后端接口
+class InputBackend:
+    """
+    读取线程通过后端获取事件：open() 打开设备，read(timeout) 返回一批事件，
+    超时或被 interrupt() 唤醒时返回空列表，设备断开抛出 OSError，回放结束抛出 EOFError。
+    close() 关闭设备（断开后还会重新 open()），shutdown() 在读取线程退出时释放全部资源。
+    """
+    name = 'base'
+    wall_clock = True  # 事件时间戳与 time.time() 同源，可用于计算延迟
+
+    def __init__(self):
+        self.device_name = ''
+        self.profile = DEFAULT_PROFILE
+        self._wake = threading.Event()
+
+    @property
+    def device_key(self):
+        """
+        读取线程注册表中的设备标识：同一标识同时只允许一个读取线程。
+        inputs 和 evdev 读取的都是系统中的手柄，切换后端后仍是同一个设备，因此实时输入共用一个标识
+        """
+        return 'gamepad'
+
+    def open(self):
+        pass
+
+    def read(self, timeout=None):
+        raise NotImplementedError
+
+    def wait_for_device(self, timeout):
+        """设备断开后等待其重新出现，最多 timeout 秒；返回是否收到了设备变化通知"""
+        self._wake.wait(timeout)
+        return False
+
+    def pause(self, seconds):
+        """读取线程在发布窗口内暂停读取，被 interrupt() 唤醒时提前返回"""
+        self._wake.wait(seconds)
+
+    def interrupt(self):
+        """从其他线程立即唤醒阻塞中的 read()/pause()/wait_for_device()，停止读取线程时调用"""
+        self._wake.set()
+
+    def close(self):
+        pass
+
+    def shutdown(self):
+        self.close()
+
+
+# 设备节点出现通知
+_IN_ATTRIB = 0x00000004  # 权限变化：udev 创建节点后才放开读权限
+_IN_CREATE = 0x00000100
+_IN_NONBLOCK = os.O_NONBLOCK
+_IN_CLOEXEC = 0o2000000
+
+
+class DeviceMonitor:
+    """
+    用 inotify 监视 /dev/input（及 by-id）中节点的创建和权限变化，手柄插回时立即唤醒读取线程，
+    不必等到下一次轮询。inotify 不可用（非 Linux）时 wait() 退化为定时轮询。
+    """
+    __slots__ = ('directories', '_fd')
+
+    def __init__(self, directories=('/dev/input', '/dev/input/by-id')):
+        self.directories = directories
+        self._fd = None
+
+    def open(self):
+        """开始监视，返回 inotify 是否可用"""
+        if self._fd is not None:
+            return True
+        if not sys.platform.startswith('linux'):
+            return False
+        try:
+            libc = ctypes.CDLL(None, use_errno=True)
+            fd = libc.inotify_init1(_IN_NONBLOCK | _IN_CLOEXEC)
+        except (OSError, AttributeError):
+            return False
+        if fd < 0:
+            return False
+        watched = 0
+        for directory in self.directories:
+            if libc.inotify_add_watch(fd, os.fsencode(directory), _IN_CREATE | _IN_ATTRIB) >= 0:
+                watched += 1
+        if not watched:
+            os.close(fd)
+            return False
+        self._fd = fd
+        return True
+
+    def wait(self, timeout, wake_fd=None):
+        """等待设备变化，返回是否有变化（超时或 wake_fd 可读时为 False）"""
+        if self._fd is None:
+            if self.open():
+                return True  # 刚开始监视：之前出现的设备收不到通知，让调用方先重试一次
+            if wake_fd is None:
+                time.sleep(timeout)
+            else:
+                select.select((wake_fd,), (), (), timeout)
+            return False
+        ready, _, _ = select.select((self._fd,) if wake_fd is None else (self._fd, wake_fd), (), (), timeout)
+        if self._fd not in ready:
+            return False
+        try:
+            while os.read(self._fd, 4096):  # 只关心“有变化”，清空事件队列
+                pass
+        except BlockingIOError:
+            pass
+        return True
+
+    def close(self):
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+
+
+# inputs 包的常驻读取线程
+class InputsPump(threading.Thread):
+    """
+    inputs 的 get_gamepad() 会一直阻塞到有事件，既无法中断，也不能在同一设备上并发调用。
+    整个进程只由这一个常驻线程调用它，事件批次经队列交给当前连接的读取线程；
+    读取线程等待的是队列，停止控制时可以被立即唤醒，不必等 get_gamepad() 返回。
+    没有读取线程连接时丢弃事件；get_gamepad() 出错后线程结束，下次打开时重新创建。
+    """
+
+    def __init__(self, get_gamepad):
+        super().__init__(name="GamepadInputsPump", daemon=True)
+        self.get_gamepad = get_gamepad
+        self.queue = queue.SimpleQueue()
+        self.attached = False
+        self.done = False
+
+    def run(self):
+        while True:
+            try:
+                batch = self.get_gamepad()
+            except Exception as e:
+                self.done = True  # 先标记，新的读取线程不会再连接到即将结束的线程
+                if self.attached:
+                    self.queue.put(e)
+                return
+            if self.attached:
+                self.queue.put(batch)
+
+    def attach(self):
+        """读取线程连接：丢弃积压的事件和上一次停止留下的唤醒标记"""
+        try:
+            while True:
+                self.queue.get_nowait()
+        except queue.Empty:
+            pass
+        self.attached = True
+
+    def detach(self):
+        self.attached = False
+
+
+_inputs_pump = None
+
+
+# inputs 包后端（跨平台，经 InputsPump 读取）
+class InputsBackend(InputBackend):
+    name = 'inputs'
+
+    def __init__(self):
+        super().__init__()
+        self._pump = None
+        self._unplugged = OSError
+        self._error = None  # 与事件一起取出、推迟到下次读取时抛出的错误
+
+    def open(self):
+        inputs = get_inputs_module()
+        if inputs is None:
+            raise ImportError("inputs")
+        global _inputs_pump
+        pump = _inputs_pump
+        if pump is None or pump.done:
+            # inputs 只在导入时枚举一次设备：拔出后缓存的设备已失效，每次重新连接都要重新枚举，
+            # 否则 get_gamepad() 会一直读已断开的设备。常驻线程仍在读取时设备是好的，不必重建
+            if hasattr(inputs, 'DeviceManager'):
+                inputs.devices = inputs.DeviceManager()
+            if not inputs.devices.gamepads:
+                raise OSError(errno.ENODEV, "No gamepad found")
+            pump = _inputs_pump = InputsPump(inputs.get_gamepad)
+        pads = inputs.devices.gamepads
+        if not pads:
+            raise OSError(errno.ENODEV, "No gamepad found")
+        pump.attach()
+        if pump.ident is None:
+            pump.start()  # 先连接再启动，第一批事件不会被丢弃
+        self._pump = pump
+        self._unplugged = getattr(inputs, 'UnpluggedError', OSError)
+        self.device_name = pads[0].name
+
+    def read(self, timeout=None):
+        error = self._error
+        if error is not None:
+            self._error = None
+            raise error
+        events = []
+        queue_get = self._pump.queue.get
+        try:
+            item = queue_get(timeout=timeout)
+            # 一次取出队列中积压的全部批次（inputs 在 Linux 上每次调用只返回一个事件），
+            # 读取线程按批次而不是按事件解码
+            while item is not None:
+                if isinstance(item, Exception):
+                    if isinstance(item, self._unplugged):
+                        item = OSError(errno.ENODEV, str(item))
+                    if events:
+                        self._error = item  # 先交付已读到的事件，下次读取时再报告错误
+                        break
+                    raise item
+                events += item
+                item = queue_get(block=False)
+        except queue.Empty:
+            pass
+        return events  # 遇到 interrupt() 的唤醒标记（None）时提前返回
+
+    def interrupt(self):
+        super().interrupt()
+        pump = self._pump
+        if pump is not None:
+            pump.queue.put(None)
+
+    def close(self):
+        if self._pump is not None:
+            self._pump.detach()
+            self._pump = None
+        self._error = None
+
+
+# Linux evdev 原始事件后端
+_INPUT_EVENT = struct.Struct('llHHi')  # struct input_event: timeval, type, code, value
+_ABS_INFO = struct.Struct('6i')  # struct input_absinfo: value, min, max, fuzz, flat, resolution
+_IOC_READ = 2
+
+
+def _eviocg(nr, size):
+    return (_IOC_READ << 30) | (size << 16) | (ord('E') << 8) | nr
+
+
+def find_evdev_gamepads():
+    """返回 /dev/input 下的手柄事件设备路径"""
+    paths = sorted(os.path.realpath(path) for path in glob.glob('/dev/input/by-id/*-event-joystick'))
+    if paths:
+        return paths
+    # 没有 by-id 链接时，按 sysfs 中的按键能力查找带 BTN_GAMEPAD (0x130) 的设备
+    found = []
+    for capabilities in sorted(glob.glob('/sys/class/input/event*/device/capabilities/key')):
+        try:
+            with open(capabilities) as f:
+                words = f.read().split()
+        except OSError:
+            continue
+        bits = int(''.join(word.zfill(16) for word in words), 16) if words else 0
+        if bits >> 0x130 & 1:
+            found.append('/dev/input/' + capabilities.split('/')[4])
+    return found
+
+
+class EvdevBackend(InputBackend):
+    """
+    直接读取 /dev/input/event*：select 等待可读，一次 os.readv 把所有待处理的
+    input_event 读进复用的缓冲区，再用 struct.iter_unpack 批量解包。
+    也可以传入已打开的 fd（例如管道），便于在没有手柄的机器上做基准测试。
+    """
+    name = 'evdev'
+
+    def __init__(self, path=None, fd=None, batch=64):
+        super().__init__()
+        self.path = path
+        self._requested = path  # None 表示每次打开时自动查找（重新插入后节点编号可能变化）
+        self._fd = fd
+        self._owns_fd = fd is None
+        self._buffer = bytearray(_INPUT_EVENT.size * batch)
+        self._view = memoryview(self._buffer)
+        self._monitor = None
+        # 自管道：interrupt() 写入一个字节，select 立即返回
+        self._wake_r, self._wake_w = os.pipe()
+        os.set_blocking(self._wake_r, False)
+        os.set_blocking(self._wake_w, False)
+
+    def open(self):
+        if self._fd is None:
+            path = self._requested
+            if path is None:
+                paths = find_evdev_gamepads()
+                if not paths:
+                    raise OSError(errno.ENODEV, "No gamepad found")
+                # 节点刚出现时 udev 可能还没放开权限，优先选可读的
+                path = next((p for p in paths if os.access(p, os.R_OK)), paths[0])
+            self._fd = os.open(path, os.O_RDONLY | os.O_NONBLOCK)
+            self.path = path
+        self.device_name = self._query_name() or self.path or 'evdev'
+        self.profile = self._query_profile()
+
+    def read(self, timeout=None):
+        ready, _, _ = select.select((self._fd, self._wake_r), (), (), timeout)
+        if self._fd not in ready:
+            return []  # 超时或被唤醒
+        try:
+            size = os.readv(self._fd, (self._buffer,))
+        except BlockingIOError:
+            return []
+        if size == 0:
+            raise OSError(errno.ENODEV, "Gamepad disconnected")
+        names = EVDEV_CODES
+        type_names = EV_TYPE_NAMES
+        events = []
+        for sec, usec, ev_type, code, value in _INPUT_EVENT.iter_unpack(
+                self._view[:size - size % _INPUT_EVENT.size]):
+            name = names.get(ev_type << 16 | code)
+            if name is not None:
+                events.append(GamepadEvent(type_names[ev_type], name, value, sec + usec * 1e-6))
+        return events
+
+    def wait_for_device(self, timeout):
+        if not self._owns_fd:
+            return super().wait_for_device(timeout)
+        if self._monitor is None:
+            self._monitor = DeviceMonitor()
+        return self._monitor.wait(timeout, self._wake_r)
+
+    def interrupt(self):
+        super().interrupt()
+        try:
+            os.write(self._wake_w, b'\0')
+        except OSError:
+            pass  # 管道已满（已经有待处理的唤醒）或已关闭
+
+    def close(self):
+        if self._fd is not None and self._owns_fd:
+            os.close(self._fd)
+            self._fd = None
+
+    def shutdown(self):
+        self.close()
+        if self._monitor is not None:
+            self._monitor.close()
+            self._monitor = None
+        if self._wake_r is not None:
+            os.close(self._wake_r)
+            os.close(self._wake_w)
+            self._wake_r = self._wake_w = None
+
+    def _query_name(self):
+        if fcntl is None:
+            return None
+        try:
+            buf = bytearray(256)
+            fcntl.ioctl(self._fd, _eviocg(0x06, len(buf)), buf)
+        except OSError:
+            return None
+        return buf.split(b'\0', 1)[0].decode('utf-8', 'replace')
+
+    def _query_profile(self):
+        """按设备上报的轴范围生成设备配置，查询失败时使用默认配置"""
+        if fcntl is None:
+            return DEFAULT_PROFILE
+        ranges = dict(DEFAULT_PROFILE.axis_ranges)
+        offsets = {}
+        for code in AXIS_SLOTS:
+            try:
+                buf = bytearray(_ABS_INFO.size)
+                fcntl.ioctl(self._fd, _eviocg(0x40 + (EVDEV_CODE_NUMBERS[code] & 0xffff), len(buf)), buf)
+            except OSError:
+                return DEFAULT_PROFILE
+            _, minimum, maximum, _, _, _ = _ABS_INFO.unpack(buf)
+            if maximum <= minimum:
+                continue
+            if code in ('ABS_Z', 'ABS_RZ'):
+                offsets[code] = minimum  # 扳机：最小值为松开
+                ranges[code] = float(maximum - minimum)
+            elif minimum < 0:
+                ranges[code] = float(max(-minimum, maximum))
+            else:
+                offsets[code] = (minimum + maximum) // 2  # 无符号摇杆：以中点为中心
+                ranges[code] = (maximum - minimum) / 2.0
+        return DeviceProfile(self.device_name, ranges, offsets)
+
+
+# 事件日志：8 字节文件头 + 定长记录，可直接 mmap 读取
+EVENT_LOG_MAGIC = b'GPADLOG1'
+EVENT_LOG_RECORD = struct.Struct('<dBBHi')  # 时间戳, 记录类型, 事件类型, 事件编码, 值
+LOG_RECORD_EVENT = 0
+LOG_RECORD_TICK = 1  # 模态计时器周期，值为当时的场景帧号
+LOG_RECORD_AXIS_RANGE = 2  # 设备配置：轴满量程 ×2，编码为 evdev 轴编码
+LOG_RECORD_AXIS_OFFSET = 3  # 设备配置：轴中心偏移 ×2
+
+
+def write_event_log(path, events):
+    """把事件序列写成事件日志（编码名称转换为 evdev 数值）"""
+    pack = EVENT_LOG_RECORD.pack
+    with open(path, 'wb') as f:
+        f.write(EVENT_LOG_MAGIC)
+        for event in events:
+            key = EVDEV_CODE_NUMBERS.get(event.code)
+            if key is not None:
+                f.write(pack(event.timestamp, LOG_RECORD_EVENT, key >> 16, key & 0xffff, event.state))
+
+
+# 事件日志回放后端
+class ReplayBackend(InputBackend):
+    """
+    按记录的时间戳回放事件日志，每次返回一份完整报告（到 SYN_REPORT 为止）。
+    speed 为回放倍速，0 表示不等待、尽可能快地回放。
+    """
+    name = 'replay'
+    wall_clock = False  # 日志中的时间戳属于录制时
+
+    def __init__(self, path, speed=1.0):
+        super().__init__()
+        self.path = path
+        self.speed = speed
+        self.count = 0  # 日志中的记录数
+        self._file = None
+        self._map = None
+        self._index = 0
+        self._origin = None  # (日志起始时间戳, 回放起始时刻)
+
+    @property
+    def device_key(self):
+        return 'replay:' + self.path
+
+    def open(self):
+        self._file = open(self.path, 'rb')
+        size = os.fstat(self._file.fileno()).st_size
+        if size < len(EVENT_LOG_MAGIC):
+            raise OSError(errno.EINVAL, "Empty event log")
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._map[:len(EVENT_LOG_MAGIC)] != EVENT_LOG_MAGIC:
+            raise OSError(errno.EINVAL, "Not a gamepad event log")
+        self.count = (size - len(EVENT_LOG_MAGIC)) // EVENT_LOG_RECORD.size
+        self._index = 0
+        self._origin = None
+        self.device_name = os.path.basename(self.path)
+        self.profile = self._read_profile()
+
+    def record(self, index):
+        """第 index 条记录：(时间戳, 记录类型, 事件类型, 事件编码, 值)"""
+        return EVENT_LOG_RECORD.unpack_from(self._map, len(EVENT_LOG_MAGIC) + index * EVENT_LOG_RECORD.size)
+
+    def _read_profile(self):
+        """会话日志开头记录了录制设备的轴范围，按它还原设备配置"""
+        ranges = dict(DEFAULT_PROFILE.axis_ranges)
+        offsets = {}
+        found = False
+        for index in range(self.count):
+            _, kind, ev_type, code, value = self.record(index)
+            name = EVDEV_CODES.get(ev_type << 16 | code)
+            if kind == LOG_RECORD_EVENT:
+                break  # 设备配置总是在第一个事件之前写入
+            if kind == LOG_RECORD_AXIS_RANGE and name in ranges:
+                ranges[name] = value / 2.0
+                found = True
+            elif kind == LOG_RECORD_AXIS_OFFSET and name in ranges:
+                offsets[name] = value / 2.0
+        if not found:
+            return DEFAULT_PROFILE
+        return DeviceProfile(self.device_name, ranges, offsets)
+
+    def read(self, timeout=None):
+        if self._index >= self.count:
+            raise EOFError
+        if self.speed > 0:
+            timestamp = self.record(self._index)[0]
+            if self._origin is None:
+                self._origin = (timestamp, time.perf_counter())
+            delay = (timestamp - self._origin[0]) / self.speed - (time.perf_counter() - self._origin[1])
+            if delay > 0:
+                if timeout is not None and delay > timeout:
+                    self._wake.wait(timeout)
+                    return []
+                if self._wake.wait(delay):
+                    return []  # 被 interrupt() 唤醒
+
+        names = EVDEV_CODES
+        events = []
+        while self._index < self.count:
+            timestamp, kind, ev_type, code, value = self.record(self._index)
+            self._index += 1
+            if kind != LOG_RECORD_EVENT:
+                continue
+            name = names.get(ev_type << 16 | code)
+            if name is not None:
+                events.append(GamepadEvent(EV_TYPE_NAMES[ev_type], name, value, timestamp))
+            if ev_type == EV_SYN:
+                break
+        return events
+
+    def close(self):
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+def create_backend(kind='AUTO'):
+    """按设置创建输入后端：AUTO 在 Linux 上有可读的手柄设备时使用 evdev"""
+    if kind == 'EVDEV':
+        return EvdevBackend()
+    if kind == 'AUTO' and sys.platform.startswith('linux'):
+        if any(os.access(path, os.R_OK) for path in find_evdev_gamepads()):
+            return EvdevBackend()  # 不固定节点路径，重新插入后自动查找
+    return InputsBackend()
+
+
+def backend_needs_inputs(kind):
+    """该后端设置是否依赖 inputs 包"""
+    return kind == 'INPUTS' or (kind == 'AUTO' and not sys.platform.startswith('linux'))
+
+
+# 读取线程每次等待事件的最长时间，超时后检查是否需要退出
+READ_TIMEOUT = 0.25
+# 读取线程两次发布之间的最短间隔：发布后暂停读取，窗口结束时一次取出积压的报告解码、合并成一帧发布，
+# 唤醒、换算和发布的次数不再随手柄回报率增长。取 60Hz 主循环周期的一半，主线程每个周期最多错过一帧
+PUBLISH_INTERVAL = 0.008
+# 超过该值的事件时间戳视为与本机时钟不同源
+MAX_EVENT_AGE = 10.0
+
+
+def event_age(backend, event):
+    """事件从产生（内核时间戳）到被读取线程收到经过的秒数，无法得知时返回 NaN"""
+    if not backend.wall_clock or event.timestamp <= 0:
+        return math.nan
+    age = time.time() - event.timestamp
+    if not 0.0 <= age < MAX_EVENT_AGE:
+        return math.nan
+    return age
+
+
+# 读取线程的连接状态
+LINK_CONNECTING = 0  # 首次打开设备
+LINK_CONNECTED = 1
+LINK_WAITING = 2  # 未找到设备或设备断开，等待重新连接
+LINK_FINISHED = 3  # 有限输入源（回放）已读完，线程退出
+LINK_FAILED = 4  # 无法恢复的错误（如缺少 inputs 包），线程退出
+# 重新连接的退避：从最短间隔开始每次翻倍；收到设备出现通知时立即重试
+RECONNECT_MIN_DELAY = 0.02
+RECONNECT_MAX_DELAY = 1.0
+
+
+def describe_link_error(error):
+    """把打开/读取设备时的异常转换为面板提示"""
+    if isinstance(error, OSError) and error.errno in (errno.ENODEV, errno.ENOENT):
+        return "未检测到手柄。请确保手柄已连接。"
+    if isinstance(error, OSError) and error.errno == errno.EACCES:
+        return "没有读取手柄设备的权限。"
+    return f"手柄错误: {error}"
+
+
+# 手柄输入监听线程
+class GamepadThread(threading.Thread):
+    """
+    连接状态机：CONNECTING/WAITING 时打开设备，失败则按指数退避等待设备出现
+    （evdev 后端用 inotify 在手柄插回时立即唤醒）；CONNECTED 时读取事件，
+    读取出错即视为断开，松开所有输入后回到 WAITING。只有 FINISHED/FAILED 会结束线程。
+    """
+
+    def __init__(self, state_buffer, backend=None):
+        super().__init__()
+        self.daemon = True
+        self.running = True
+        self.status = LINK_CONNECTING
+        self.error_message = None  # 最近一次连接错误的提示
+        self.reconnects = 0  # 断开后重新连接成功的次数
+        self.state_buffer = state_buffer
+        self.backend = backend or InputsBackend()
+        self.recorder = None  # 会话录制器，录制时写入收到的原始事件
+        self.calibrator = None  # 摇杆漂移校准，仅实时输入使用
+        self._values = [0.0] * FRAME_SIZE  # 线程私有的工作帧
+        self._raw_axes = [0] * AXIS_COUNT  # 本批各轴最后的原始值
+        self.decoder = EventDecoder(self.backend.profile)
+        self.coalescer = EventCoalescer(self.decoder, stick_response)
+        self.publish_interval = PUBLISH_INTERVAL
+        self._deferred = False  # 是否有已结束但尚未换算发布的报告
+        self._next_publish = -math.inf  # 发布窗口结束的时刻（perf_counter）
+        self._sync_time = 0.0  # 最后一份结束的报告的事件时间戳
+        self._connected_once = False
+        self.superseded = False  # 同一设备上启动了新的读取线程，本线程被注册表停止
+
+    @property
+    def finished(self):
+        """回放等有限输入源已读完"""
+        return self.status == LINK_FINISHED
+
+    def set_profile(self, profile):
+        """设备打开后按其实际轴范围重建解码表"""
+        if profile is not self.decoder.profile:
+            self.decoder = EventDecoder(profile)
+            self.coalescer.bind(self.decoder)
+        if self.calibrator is not None:
+            self.calibrator.bind(self.decoder, self.coalescer, self.backend.device_name)
+        # 尚未收到事件的轴视为居中，校准不会把初始的 0 当成无符号摇杆的极限位置
+        self._centre_axes()
+
+    def _centre_axes(self):
+        for slot in _ANALOG_SLOTS:
+            self._raw_axes[slot] = self.decoder.axis_offsets[slot]
+
+    def _set_status(self, status, message=None):
+        self.error_message = message  # 先写提示，主线程看到新状态时提示已就绪
+        self.status = status
+
+    def run(self):
+        backend = self.backend
+        values = self._values
+        pending = False  # 工作帧中是否有尚未发布的事件
+        opened = False
+        delay = RECONNECT_MIN_DELAY
+        try:
+            while self.running:
+                if not opened:
+                    try:
+                        backend.open()
+                    except ImportError:
+                        self._set_status(LINK_FAILED, "未安装 'inputs' 包。请安装后重试。")
+                        break
+                    except OSError as e:
+                        self._set_status(LINK_WAITING, describe_link_error(e))
+                        delay = self._back_off(delay)
+                        continue
+                    opened = True
+                    self.set_profile(backend.profile)
+                    if self.recorder is not None:
+                        # 录制校准后的配置，回放时不需要本机的校准文件
+                        calibrator = self.calibrator
+                        self.recorder.write_profile(
+                            backend.profile if calibrator is None else calibrator.calibrated_profile())
+
+                remaining = self._next_publish - time.perf_counter()
+                if remaining > 0.0:
+                    # 刚发布过一帧：窗口内不读取，窗口结束时一次读出积压的事件，
+                    # 唤醒、解码调用和换算都按窗口而不是按报告计。按键边沿最多延迟一个窗口
+                    backend.pause(remaining)
+                    continue  # 回到循环检查 running
+                try:
+                    events = backend.read(0.0 if self._deferred else READ_TIMEOUT)
+                except EOFError:
+                    self._set_status(LINK_FINISHED)
+                    break
+                except Exception as e:
+                    # 设备断开：关闭后重新连接，期间视角和物体不能停在最后的推杆状态继续运动。
+                    # 打开成功但立即读取失败（设备列表过期等）时同样退避，不会空转
+                    backend.close()
+                    opened = False
+                    self.release_inputs()
+                    pending = False
+                    self._set_status(LINK_WAITING, describe_link_error(e))
+                    delay = self._back_off(delay)
+                    continue
+
+                if self.status != LINK_CONNECTED:
+                    # 打开后第一次读取成功（有事件或正常超时）才算连接上
+                    delay = RECONNECT_MIN_DELAY
+                    if self._connected_once:
+                        self.reconnects += 1
+                    self._connected_once = True
+                    self._set_status(LINK_CONNECTED)
+
+                if not events:
+                    if self._deferred:
+                        if self.flush_pending(time.perf_counter()):
+                            values[FRAME_PUBLISH_TIME] = time.perf_counter()
+                            self.state_buffer.publish(values)
+                        pending = False
+                    elif not pending and self.calibrator is not None:
+                        # 超时：摇杆没有动，作为一次静止观测交给校准
+                        self.publish_calibration()
+                    continue  # 回到循环检查 running
+                if self.recorder is not None:
+                    self.recorder.write_events(events)
+
+                # 记录该帧最早的事件：它的延迟就是这一帧的最坏延迟
+                if not pending:
+                    pending = True
+                    values[FRAME_RECEIVE_TIME] = time.perf_counter()
+                    values[FRAME_EVENT_AGE] = event_age(backend, events[0])
+
+                # 一份完整报告处理完后整体发布，主线程总能读到一致的一帧；
+                # 报告未结束、在发布窗口内被推迟或合并后没有变化时不发布
+                if self.running and self.process_events(events):  # 检查是否仍在运行
+                    values[FRAME_PUBLISH_TIME] = time.perf_counter()
+                    self.state_buffer.publish(values)
+                    pending = False
+                elif events[-1].ev_type == 'Sync' and not self._deferred:
+                    pending = False  # 报告已结束但没有变化，丢弃这次计时
+        finally:
+            backend.shutdown()
+
+    def _back_off(self, delay):
+        """等待设备出现，最多 delay 秒，返回下一次的等待时长"""
+        if self.backend.wait_for_device(delay):
+            return RECONNECT_MIN_DELAY  # 有设备出现，立即重试
+        return min(delay * 2.0, RECONNECT_MAX_DELAY)
+
+    def stop(self):
+        """请求线程退出，并立即唤醒阻塞中的读取或重连等待"""
+        self.running = False
+        self.backend.interrupt()
+
+    def release_inputs(self):
+        """所有轴回中、按键松开，并发布这一帧"""
+        values = self._values
+        self._deferred = False
+        self._centre_axes()
+        released = time.time()
+        for index in range(BUTTON_COUNT):
+            if _set_button(values, index, False):
+                self.state_buffer.edges.push(index, False, released)
+        values[AXIS_HAT_X] = values[AXIS_HAT_Y] = 0.0
+        self.coalescer.flush(self._raw_axes, values)
+        now = time.perf_counter()
+        values[FRAME_EVENT_AGE] = math.nan
+        values[FRAME_RECEIVE_TIME] = now
+        values[FRAME_PUBLISH_TIME] = now
+        self.state_buffer.publish(values)
+
+    def process_event(self, event):
+        """处理单个手柄事件"""
+        return self.process_events((event,))
+
+    def process_events(self, events, now=None):
+        """
+        批量处理后端返回的事件，返回是否有需要发布的变化。
+        距上次发布不足 publish_interval 时，报告只解码、不换算，留给之后的报告或 flush_pending()
+        一起发布。now 为 perf_counter 时刻，基准测试可传入模拟时间。
+        """
+        keys, synced = self.decoder.decode_batch(events, self._raw_axes, self._values, self.state_buffer.edges)
+        coalescer = self.coalescer
+        coalescer.raw_events += len(events)
+        if keys:
+            coalescer.add_keys(keys)
+        if not synced:
+            return False  # 报告尚未结束，继续累积
+        self._sync_time = events[-1].timestamp
+        if now is None:
+            now = time.perf_counter()
+        if now < self._next_publish:
+            self._deferred = True
+            return False
+        return self.flush_pending(now)
+
+    def flush_pending(self, now):
+        """换算已结束但推迟的报告，返回是否有需要发布的变化"""
+        self._deferred = False
+        coalescer = self.coalescer
+        if self.calibrator is not None:
+            self.calibrator.observe(self._raw_axes)
+        if not coalescer.flush(self._raw_axes, self._values):
+            return False
+        if coalescer.triggers_changed:
+            # 扳机行程在换算之后才确定，虚拟扳机按键在这里而不是解码时更新
+            _update_trigger_buttons(self._values, self.state_buffer.edges, self._sync_time)
+        self._next_publish = now + self.publish_interval
+        return True
+
+    def publish_calibration(self):
+        """校准修正了静止摇杆的中心时，按新参数重新换算并发布一帧"""
+        values = self._values
+        if self.calibrator.observe(self._raw_axes) and self.coalescer.flush(self._raw_axes, values):
+            now = time.perf_counter()
+            values[FRAME_EVENT_AGE] = math.nan
+            values[FRAME_RECEIVE_TIME] = now
+            values[FRAME_PUBLISH_TIME] = now
+            self.state_buffer.publish(values)
+
+
+# 读取线程注册表
+READER_STOP_TIMEOUT = 1.0
+
+
+class ReaderRegistry:
+    """
+    保证每个设备（InputBackend.device_key）同时只有一个读取线程：
+    启动新线程前先停止并等待同一设备上的旧线程退出，反复开关控制也不会堆积互相争抢的读取线程。
+    旧线程没能及时退出时不启动新线程。
+    """
+
+    def __init__(self):
+        self._readers = {}
+        self._lock = threading.Lock()
+
+    def start(self, thread):
+        """启动读取线程，返回是否已启动；同一设备上的旧线程在 READER_STOP_TIMEOUT 内没有退出时返回 False"""
+        key = thread.backend.device_key
+        with self._lock:
+            previous = self._readers.get(key)
+            if previous is not None and previous is not thread:
+                previous.superseded = True  # 旧线程的操作器据此安静退出，不关闭新会话的开关
+                previous.stop()
+                previous.join(READER_STOP_TIMEOUT)
+                if previous.is_alive():
+                    return False
+            self._readers[key] = thread
+        thread.start()
+        return True
+
+    def stop(self, thread, timeout=READER_STOP_TIMEOUT):
+        """停止并等待线程退出，返回是否已退出"""
+        thread.stop()
+        if thread.ident is not None:
+            thread.join(timeout)
+        with self._lock:
+            key = thread.backend.device_key
+            if self._readers.get(key) is thread:
+                del self._readers[key]
+        return not thread.is_alive()
+
+    def stop_all(self):
+        with self._lock:
+            readers = list(self._readers.values())
+        for thread in readers:
+            self.stop(thread)
+
+    def alive(self):
+        """仍在运行的读取线程数"""
+        with self._lock:
+            return sum(thread.is_alive() for thread in self._readers.values())
+
+
+reader_registry = ReaderRegistry()
+
+
+# 会话录制：读取线程收到的原始事件 + 模态计时器周期，写入同一个事件日志
+class SessionRecorder:
+    """
+    两类记录都使用录制器自己的时钟（自开始录制起的秒数），回放时据此还原事件与周期的先后顺序
+    和每个周期的真实间隔。读取线程与主线程都会写入，记录先在内存中攒批，再整块写入文件。
+    """
+    __slots__ = ('path', 'events', 'ticks', 'last_tick', '_file', '_buffer', '_lock', '_origin', '_flush_size')
+
+    def __init__(self, path, flush_size=64 * 1024):
+        self.path = path
+        self.events = 0  # 已录制的事件数
+        self.ticks = 0  # 已录制的周期数
+        self.last_tick = 0.0  # 最近一个周期的录制时间
+        self._file = None
+        self._buffer = bytearray()
+        self._lock = threading.Lock()
+        self._origin = 0.0
+        self._flush_size = flush_size
+
+    def open(self):
+        self._file = open(self.path, 'wb')
+        self._file.write(EVENT_LOG_MAGIC)
+        self._origin = time.perf_counter()
+
+    def write_profile(self, profile):
+        """读取线程打开设备后调用：记录设备的轴范围，回放时按相同的量程归一化"""
+        pack = EVENT_LOG_RECORD.pack
+        with self._lock:
+            for code, value in profile.axis_ranges.items():
+                key = EVDEV_CODE_NUMBERS[code]
+                self._buffer += pack(0.0, LOG_RECORD_AXIS_RANGE, key >> 16, key & 0xffff, round(value * 2))
+            for code, value in profile.axis_offsets.items():
+                key = EVDEV_CODE_NUMBERS[code]
+                self._buffer += pack(0.0, LOG_RECORD_AXIS_OFFSET, key >> 16, key & 0xffff, round(value * 2))
+
+    def write_events(self, events):
+        """读取线程调用：记录一批原始事件"""
+        now = time.perf_counter() - self._origin
+        pack = EVENT_LOG_RECORD.pack
+        codes = EVDEV_CODE_NUMBERS
+        with self._lock:
+            buffer = self._buffer
+            for event in events:
+                key = codes.get(event.code)
+                if key is not None:
+                    buffer += pack(now, LOG_RECORD_EVENT, key >> 16, key & 0xffff, event.state)
+                    self.events += 1
+            if len(buffer) >= self._flush_size:
+                self._flush()
+
+    def write_tick(self, frame):
+        """主线程调用：记录一个计时器周期"""
+        with self._lock:
+            self.last_tick = time.perf_counter() - self._origin
+            self._buffer += EVENT_LOG_RECORD.pack(self.last_tick, LOG_RECORD_TICK, 0, 0, frame)
+            self.ticks += 1
+
+    def clock(self):
+        """录制期间作为运动积分的时钟，使录制与回放的周期间隔完全相同"""
+        return self.last_tick
+
+    def _flush(self):
+        if self._file is not None and self._buffer:
+            self._file.write(self._buffer)
+            self._buffer.clear()
+
+    def close(self):
+        with self._lock:
+            self._flush()
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+
+# 会话回放：按录制的周期重放，事件经与实时控制相同的解码/合并/发布路径送入快照缓冲
+class SessionReplay:
+    """
+    不启动读取线程：回放在主线程中按日志顺序把事件逐个交给 process_event()，
+    遇到周期记录时由调用方执行一次模态周期，运动积分使用录制时的周期时间戳，
+    因此无论回放倍速和机器快慢，每个周期看到的快照和 dt 都与录制时相同。
+    speed 为回放倍速，0 表示不等待、一次回放完。
+    """
+    __slots__ = ('log', 'speed', 'now', 'first_frame', 'finished', '_decoder', '_buffer',
+                 '_index', '_origin')
+
+    def __init__(self, path, state_buffer, speed=1.0):
+        self.log = ReplayBackend(path, speed=0)
+        self.speed = speed
+        self.now = 0.0  # 当前回放到的录制时间，作为运动积分的时钟
+        self.first_frame = None  # 录制开始时的场景帧号
+        self.finished = False
+        self._buffer = state_buffer
+        self._decoder = None
+        self._index = 0
+        self._origin = None  # (录制时间, 回放开始时刻)
+
+    def open(self):
+        log = self.log
+        log.open()
+        self._decoder = GamepadThread(self._buffer, log)  # 只借用其解码路径，不启动线程
+        self._decoder.publish_interval = 0.0  # 每份报告都发布，周期看到的快照不取决于回放速度
+        self._decoder.set_profile(log.profile)
+        for index in range(log.count):
+            _, kind, _, _, value = log.record(index)
+            if kind == LOG_RECORD_TICK:
+                self.first_frame = value
+                break
+
+    def clock(self):
+        return self.now
+
+    def due_ticks(self, wall_time):
+        """送入到 wall_time 为止应回放的事件，逐个产出到期周期录制时的帧号"""
+        log = self.log
+        decoder = self._decoder
+        if self._origin is None:
+            self._origin = (self.now, wall_time)
+        target = self._origin[0] + (wall_time - self._origin[1]) * self.speed if self.speed > 0 else math.inf
+        while self._index < log.count:
+            timestamp, kind, ev_type, code, value = log.record(self._index)
+            if timestamp > target:
+                return
+            self._index += 1
+            if kind == LOG_RECORD_EVENT:
+                name = EVDEV_CODES.get(ev_type << 16 | code)
+                if name is not None and decoder.process_event(
+                        GamepadEvent(EV_TYPE_NAMES[ev_type], name, value, timestamp)):
+                    self._buffer.publish(decoder._values)
+            elif kind == LOG_RECORD_TICK:
+                self.now = timestamp
+                yield value
+        self.finished = True
+
+    def close(self):
+        self.log.close()
+
+
+# 设置中的速度沿用 1.1 版本“每个 60Hz 计时器周期”的单位，积分时换算成每秒
+REFERENCE_TICK_RATE = 60.0
+MAX_TICK_DT = 0.25  # Blender 卡顿时单个周期最多按该时长积分，避免一次跳得太远
+MAX_ACCELERATION_BOOST = 3.0  # 持续推杆时速度最多提升到的倍数
+# 死区已在读取线程中按摇杆径向处理，这里只截掉输入平滑衰减的尾巴
+STICK_THRESHOLD = 1e-3
+
+
+# 与帧率无关的运动积分器
+class MotionIntegrator:
+    """
+    每个计时器周期测量与上一周期的真实间隔 dt，速度按 单位/秒 积分，
+    计时器从 60Hz 掉到 20Hz 时导航速度保持不变。可选：
+    - smoothing: 摇杆输入的指数平滑时间常数（秒），0 为不平滑
+    - acceleration: 持续推杆时每秒增加的速度倍数，0 为不加速
+    上一周期没有任何输入时（resting，由调用方设置）本周期最多按一个参考周期积分：
+    空闲降频后第一次推杆不会把整个空闲间隔一次性积分成一大步跳跃。
+    clock 可替换为模拟时钟，便于离线验证。
+    """
+    __slots__ = ('clock', 'dt', 'resting', 'left_x', 'left_y', 'right_x', 'right_y',
+                 'left_gain', 'right_gain', 'button_gain', '_last', '_held')
+
+    def __init__(self, clock=time.perf_counter):
+        self.clock = clock
+        self._held = [0.0, 0.0]  # 左/右摇杆持续推动的时长
+        self.reset()
+
+    def reset(self):
+        self._last = None
+        self.dt = 0.0
+        self.resting = False
+        self.left_x = self.left_y = self.right_x = self.right_y = 0.0
+        self.left_gain = self.right_gain = self.button_gain = 0.0
+        self._held[0] = self._held[1] = 0.0
+
+    def tick(self):
+        """返回距上一周期的秒数（首个周期按参考帧率计算）"""
+        now = self.clock()
+        if self._last is None:
+            dt = 1.0 / REFERENCE_TICK_RATE
+        else:
+            dt = min(max(now - self._last, 0.0), 1.0 / REFERENCE_TICK_RATE if self.resting else MAX_TICK_DT)
+        self._last = now
+        self.dt = dt
+        return dt
+
+    def update(self, state, smoothing=0.0, acceleration=0.0):
+        """根据新快照更新平滑后的摇杆值和本周期的位移增益"""
+        dt = self.tick()
+        values = state.values
+        alpha = 1.0 - math.exp(-dt / smoothing) if smoothing > 0.0 else 1.0
+
+        self.left_x = _smooth(self.left_x, values[AXIS_LEFT_X], alpha)
+        self.left_y = _smooth(self.left_y, values[AXIS_LEFT_Y], alpha)
+        self.right_x = _smooth(self.right_x, values[AXIS_RIGHT_X], alpha)
+        self.right_y = _smooth(self.right_y, values[AXIS_RIGHT_Y], alpha)
+
+        scale = REFERENCE_TICK_RATE * dt
+        self.button_gain = scale
+        self.left_gain = scale * self._boost(0, self.left_active, dt, acceleration)
+        self.right_gain = scale * self._boost(1, self.right_active, dt, acceleration)
+        return dt
+
+    @property
+    def left_active(self):
+        return math.hypot(self.left_x, self.left_y) > STICK_THRESHOLD
+
+    @property
+    def right_active(self):
+        return math.hypot(self.right_x, self.right_y) > STICK_THRESHOLD
+
+    def _boost(self, stick, active, dt, acceleration):
+        held = self._held
+        held[stick] = held[stick] + dt if active else 0.0
+        if acceleration <= 0.0:
+            return 1.0
+        return min(1.0 + acceleration * held[stick], MAX_ACCELERATION_BOOST)
+
+
+def _smooth(current, target, alpha):
+    value = current + (target - current) * alpha
+    return value if abs(value) > 1e-4 else 0.0
+
+
+# 自适应计时器调度
+class AdaptiveTickScheduler:
+    """
+    摇杆都在死区内且没有按键时，计时器在 idle_after 秒后降到空闲频率；
+    一旦检测到输入立即恢复全速。Blender 不允许从读取线程唤醒主线程，
+    因此空闲频率决定了从静止到开始响应的最大额外延迟。
+    """
+    __slots__ = ('clock', 'active_interval', 'idle_interval', 'idle_after',
+                 'interval', '_last_active')
+
+    def __init__(self, active_interval=1 / 60, idle_interval=0.1, idle_after=0.5,
+                 clock=time.perf_counter):
+        self.clock = clock
+        self.active_interval = active_interval
+        self.idle_interval = idle_interval
+        self.idle_after = idle_after
+        self.interval = active_interval
+        self._last_active = clock()
+
+    @property
+    def rate(self):
+        """当前计时器频率（Hz）"""
+        return 1.0 / self.interval
+
+    @property
+    def idle(self):
+        return self.interval != self.active_interval
+
+    def observe(self, active):
+        """根据本周期是否有输入决定下一周期的间隔，返回间隔是否改变"""
+        now = self.clock()
+        if active:
+            self._last_active = now
+            target = self.active_interval
+        elif now - self._last_active >= self.idle_after:
+            target = self.idle_interval
+        else:
+            target = self.active_interval
+        if target == self.interval:
+            return False
+        self.interval = target
+        return True
+
+
+# 单个属性（如 location）的关键帧录制缓冲
+class KeyframeTrack:
+    """帧号与各分量的值存放在预分配的 array 中，录制过程中不经过 RNA 写关键帧"""
+    __slots__ = ('data_path', 'group', 'size', 'count', 'frames', 'values')
+
+    def __init__(self, data_path, group, size, capacity):
+        self.data_path = data_path
+        self.group = group
+        self.size = size
+        self.count = 0
+        self.frames = array('f', bytes(4 * capacity))
+        self.values = array('f', bytes(4 * capacity * size))
+
+    def add(self, frame, value):
+        count = self.count
+        if count and self.frames[count - 1] == frame:
+            count -= 1  # 同一帧重复采样时覆盖，与 keyframe_insert 的行为一致
+        elif count == len(self.frames):
+            # 缓冲用完时容量翻倍（内容随后会被覆盖）
+            self.frames.extend(self.frames)
+            self.values.extend(self.values)
+        self.frames[count] = frame
+        values = self.values
+        base = count * self.size
+        for i in range(self.size):
+            values[base + i] = value[i]
+        self.count = count + 1
+
+
+# 关键帧批量录制
+class KeyframeRecorder:
+    """
+    运动过程中把每个周期的变换采样写入各物体的 KeyframeTrack，
+    运动停止或结束控制时一次性提交：每条 F 曲线只调用一次
+    keyframe_points.add + foreach_set，而不是每个周期为每个属性调用 keyframe_insert。
+    批量变换选中物体时同时录制多个物体，轨道初始容量较小，用完再翻倍。
+    """
+    __slots__ = ('capacity', '_objects')
+
+    def __init__(self, capacity=256):
+        self.capacity = capacity
+        self._objects = {}  # 物体 -> {data_path: KeyframeTrack}
+
+    @property
+    def pending(self):
+        return bool(self._objects)
+
+    def record(self, obj, data_path, group, frame):
+        """采样 obj 的 data_path 属性当前值"""
+        value = getattr(obj, data_path)[:]
+        self._track(obj, data_path, group, len(value)).add(frame, value)
+
+    def record_values(self, objects, data_path, group, frame, values):
+        """批量变换后采样多个物体：values 为按物体排列的 (n, 3) 数组，不再逐个读取属性"""
+        for obj, value in zip(objects, values.tolist()):
+            self._track(obj, data_path, group, 3).add(frame, value)
+
+    def _track(self, obj, data_path, group, size):
+        tracks = self._objects.get(obj)
+        if tracks is None:
+            tracks = self._objects[obj] = {}
+        track = tracks.get(data_path)
+        if track is None:
+            track = tracks[data_path] = KeyframeTrack(data_path, group, size, self.capacity)
+        return track
+
+    def commit(self, tolerance=0.0):
+        """把缓冲中的采样写入 F 曲线，返回 (精简前关键帧数, 写入的关键帧数)"""
+        sampled = written = 0
+        for obj, tracks in self._objects.items():
+            try:
+                for track in tracks.values():
+                    if track.count:
+                        sampled += track.count * track.size
+                        written += _write_track(obj, track, tolerance)
+            except ReferenceError:
+                pass  # 录制过程中物体已被删除
+        self._objects.clear()
+        return sampled, written
+
+    def discard(self):
+        """丢弃尚未提交的采样（撤销/重做之后其中的物体引用可能已被释放）"""
+        self._objects.clear()
+
+
+def _write_track(obj, track, tolerance):
+    anim = obj.animation_data or obj.animation_data_create()
+    if anim.action is None:
+        anim.action = bpy.data.actions.new(name=f"{obj.name}Action")
+    fcurves = anim.action.fcurves
+
+    count, size = track.count, track.size
+    frames = track.frames[:count]
+    first, last = frames[0], frames[count - 1]
+    written = 0
+    for index in range(size):
+        values = track.values[index:count * size:size]
+        keep = reduce_keys(frames, values, tolerance)
+
+        fcurve = fcurves.find(track.data_path, index=index)
+        if fcurve is None:
+            fcurve = fcurves.new(track.data_path, index=index, action_group=track.group)
+        points = fcurve.keyframe_points
+
+        # 录制区间内已有的关键帧被新录制覆盖
+        co = array('f', bytes(8 * len(points)))
+        points.foreach_get('co', co)
+        for i in range(len(points) - 1, -1, -1):
+            if first <= co[2 * i] <= last:
+                points.remove(points[i], fast=True)
+        if len(co) != 2 * len(points):
+            co = array('f', bytes(8 * len(points)))
+            points.foreach_get('co', co)
+
+        for i in keep:
+            co.append(frames[i])
+            co.append(values[i])
+        points.add(len(keep))
+        points.foreach_set('co', co)
+        fcurve.update()
+        written += len(keep)
+    return written
+
+
+def reduce_keys(frames, values, tolerance):
+    """返回需要保留的采样下标，误差超过 tolerance 的点才会被保留"""
+    count = len(frames)
+    if tolerance <= 0.0 or count < 3:
+        return range(count)
+    if np is not None:
+        return np.flatnonzero(simplify_keys(frames, values, tolerance)).tolist()
+    # 无 numpy 时逐段做 Ramer-Douglas-Peucker，保证每个省略的点误差都不超过 tolerance
+    keep = [False] * count
+    keep[0] = keep[-1] = True
+    segments = [(0, count - 1)]
+    while segments:
+        first, last = segments.pop()
+        f0, v0 = frames[first], values[first]
+        slope = (values[last] - v0) / (frames[last] - f0)
+        worst, split = tolerance, 0
+        for i in range(first + 1, last):
+            error = abs(v0 + slope * (frames[i] - f0) - values[i])
+            if error > worst:
+                worst, split = error, i
+        if split:
+            keep[split] = True
+            segments.append((first, split))
+            segments.append((split, last))
+    return [i for i in range(count) if keep[i]]
+
+
+def simplify_keys(frames, values, tolerance):
+    """
+    向量化的 Ramer-Douglas-Peucker 曲线简化，误差按 F 曲线的值（纵向）计算。
+    每一轮同时处理所有线段：为每个未保留的点找到所在线段的两个端点，
+    算出线性插值误差，每段误差最大且超过 tolerance 的点加入保留集合，直到没有这样的点。
+    frames 需严格递增。返回保留点的布尔掩码。
+    """
+    frames = np.asarray(frames, dtype=np.float64)
+    values = np.asarray(values, dtype=np.float64)
+    count = len(frames)
+    keep = np.zeros(count, dtype=bool)
+    if count < 3 or tolerance <= 0.0:
+        keep[:] = True
+        return keep
+    keep[0] = keep[-1] = True
+    while True:
+        anchors, segment = _keyframe_segments(keep)
+        left = anchors[segment]
+        right = anchors[segment + 1]
+        t = (frames - frames[left]) / (frames[right] - frames[left])
+        error = np.abs(values[left] + (values[right] - values[left]) * t - values)
+        error[keep] = 0.0
+        if not _keep_worst(keep, segment, error, tolerance):
+            return keep
+
+
+def _keyframe_segments(keep):
+    """保留点的下标，以及每个点所在线段（相邻两个保留点之间）的编号"""
+    anchors = np.flatnonzero(keep)
+    segment = np.searchsorted(anchors, np.arange(len(keep)), side='right') - 1
+    return anchors, np.minimum(segment, len(anchors) - 2)
+
+
+def _keep_worst(keep, segment, error, tolerance):
+    """每段误差最大且超过 tolerance 的点加入 keep（已保留点的误差须为 0），返回是否加入了新的点"""
+    over = error > tolerance
+    if not over.any():
+        return False
+    worst = np.zeros(segment[-1] + 1)
+    np.maximum.at(worst, segment, error)
+    candidates = np.flatnonzero(over & (error == worst[segment]))
+    # 同一段内并列最大的点只取第一个
+    _, first = np.unique(segment[candidates], return_index=True)
+    keep[candidates[first]] = True
+    return True
+
+
+# 手柄录制会写入的变换属性
+RECORDED_DATA_PATHS = ('location', 'rotation_euler', 'scale', 'delta_location')
+
+# 精简时需要随关键帧一起移动的全部可写属性：(属性名, 每个关键帧的分量数, numpy 类型)
+_KEYFRAME_ATTRIBUTES = (
+    ('co', 2, 'f4'),
+    ('handle_left', 2, 'f4'),
+    ('handle_right', 2, 'f4'),
+    ('interpolation', 1, 'i4'),
+    ('handle_left_type', 1, 'i4'),
+    ('handle_right_type', 1, 'i4'),
+    ('easing', 1, 'i4'),
+    ('type', 1, 'i4'),
+    ('back', 1, 'f4'),
+    ('amplitude', 1, 'f4'),
+    ('period', 1, 'f4'),
+    ('select_control_point', 1, '?'),
+    ('select_left_handle', 1, '?'),
+    ('select_right_handle', 1, '?'),
+)
+
+
+def simplify_fcurve(fcurve, tolerance):
+    """
+    就地精简一条 F 曲线，返回 (精简前关键帧数, 精简后关键帧数)。
+    simplify_keys 按线性插值挑选关键帧，但保留下来的关键帧沿用各自的插值方式（通常是自动钳制手柄的 Bezier），
+    写回后用 fcurve.evaluate() 在被删除的帧上检查实际曲线的误差，与 simplify_keys 一样每段放回误差最大的一帧
+    后重新写入，直到全部满足（最坏情况下放回全部关键帧，即原曲线）。
+    """
+    points = fcurve.keyframe_points
+    count = len(points)
+    columns = {}
+    for name, size, dtype in _KEYFRAME_ATTRIBUTES:
+        data = np.empty(size * count, dtype=dtype)
+        points.foreach_get(name, data)
+        columns[name] = data.reshape(count, size)
+    frames = columns['co'][:, 0].astype(np.float64)
+    values = columns['co'][:, 1].astype(np.float64)
+    keep = simplify_keys(frames, values, tolerance)
+    if keep.all():
+        return count, count
+
+    evaluate = fcurve.evaluate
+    error = np.zeros(count)
+    while True:
+        _write_keyframes(points, columns, keep)
+        fcurve.update()  # 按保留下来的相邻关键帧重新计算自动手柄
+        dropped = np.flatnonzero(~keep)
+        actual = np.fromiter(map(evaluate, frames[dropped].tolist()), dtype=np.float64, count=len(dropped))
+        error[keep] = 0.0
+        error[dropped] = np.abs(actual - values[dropped])
+        if not _keep_worst(keep, _keyframe_segments(keep)[1], error, tolerance):
+            return count, int(keep.sum())
+
+
+def _write_keyframes(points, columns, keep):
+    """把 keep 选中的关键帧的全部属性依次写入 points，关键帧数不足时先追加，多余的从末尾删除"""
+    kept = int(keep.sum())
+    current = len(points)
+    if kept > current:
+        points.add(kept - current)
+        current = kept
+    for name, data in columns.items():
+        rows = data[keep]
+        if current > kept:
+            rows = np.concatenate((rows, np.zeros((current - kept, data.shape[1]), dtype=data.dtype)))
+        points.foreach_set(name, rows.ravel())
+    for _ in range(current - kept):
+        points.remove(points[-1], fast=True)
+
+
+def _euler_xyz_matrices(euler):
+    """(n, 3) 的 XYZ 欧拉角 -> (n, 3, 3) 旋转矩阵（R = Rz · Ry · Rx）"""
+    cx, cy, cz = np.cos(euler).T
+    sx, sy, sz = np.sin(euler).T
+    m = np.empty((len(euler), 3, 3))
+    m[:, 0, 0] = cy * cz
+    m[:, 0, 1] = sx * sy * cz - cx * sz
+    m[:, 0, 2] = cx * sy * cz + sx * sz
+    m[:, 1, 0] = cy * sz
+    m[:, 1, 1] = sx * sy * sz + cx * cz
+    m[:, 1, 2] = cx * sy * sz - sx * cz
+    m[:, 2, 0] = -sy
+    m[:, 2, 1] = sx * cy
+    m[:, 2, 2] = cx * cy
+    return m
+
+
+def _compatible_euler_xyz(m, old):
+    """
+    旋转矩阵 -> 与 old 最接近的 XYZ 欧拉角（与 Euler.rotate 一样保持连续，不在 ±π 处跳变）。
+    矩阵对应两组欧拉角解，各自按 2π 周期靠近 old 后取差值较小的一组。
+    """
+    cy = np.hypot(m[:, 0, 0], m[:, 1, 0])
+    first = np.stack((np.arctan2(m[:, 2, 1], m[:, 2, 2]),
+                      np.arctan2(-m[:, 2, 0], cy),
+                      np.arctan2(m[:, 1, 0], m[:, 0, 0])), axis=1)
+    second = np.stack((np.arctan2(-m[:, 2, 1], -m[:, 2, 2]),
+                       np.arctan2(-m[:, 2, 0], -cy),
+                       np.arctan2(-m[:, 1, 0], -m[:, 0, 0])), axis=1)
+    gimbal = cy < 1e-6  # 万向节锁：Z 取 0，全部转到 X 上
+    if gimbal.any():
+        first[gimbal, 0] = second[gimbal, 0] = np.arctan2(-m[gimbal, 1, 2], m[gimbal, 1, 1])
+        first[gimbal, 2] = second[gimbal, 2] = 0.0
+    tau = 2.0 * math.pi
+    first += tau * np.round((old - first) / tau)
+    second += tau * np.round((old - second) / tau)
+    use_second = np.abs(second - old).sum(axis=1) < np.abs(first - old).sum(axis=1)
+    first[use_second] = second[use_second]
+    return first
+
+
+# 多物体批量变换
+# 选中物体占全部物体的比例不低于该值时整体 foreach 读写（C 中循环），否则只逐个读写选中的物体
+SELECTION_FOREACH_FRACTION = 0.25
+
+
+class SelectionBatch:
+    """
+    手势开始时（从静止到推杆/按键）按当前选择重建选中物体的列表；之后每个周期把选中物体的变换
+    读成 NumPy 数组做向量化运算再写回，不再逐个物体做 Vector 运算和 .copy() 赋值。
+    读写只涉及选中的物体：选中物体占全部物体的比例不低于 SELECTION_FOREACH_FRACTION 时，
+    用 bpy.data.objects 的 foreach_get/foreach_set 一次读写（未选中的行原样写回）；
+    否则逐个读写选中物体的属性，代价不随场景中的物体总数增长。
+    写回的数组在本周期内按属性保留，录制关键帧时直接取用，不再逐个物体读取属性。
+    欧拉顺序不是 XYZ 的物体无法参与向量化旋转，旋转时退回逐个处理。
+    """
+    __slots__ = ('objects', 'euler_index', 'other_rotation', 'stale', 'written', '_rows', '_size', '_buffer')
+
+    def __init__(self):
+        self.objects = []  # 选中的物体
+        self.euler_index = None  # 其中欧拉顺序为 XYZ 的物体在 objects 中的下标
+        self.other_rotation = []  # 欧拉顺序不是 XYZ 的物体在 objects 中的下标
+        self.stale = True
+        self.written = {}  # 本周期写回的属性 -> 选中物体的值，形状 (n, 3)
+        self._rows = None  # 整体读写时选中物体在 bpy.data.objects 中的行号，逐个读写时为 None
+        self._size = 0
+        self._buffer = None  # foreach_get/foreach_set 共用的 float32 缓冲
+
+    @property
+    def count(self):
+        return len(self.objects)
+
+    def rebuild(self, context):
+        collection = bpy.data.objects
+        selected = set(context.selected_objects)
+        objects = []
+        rows = []
+        euler_index = []
+        other = []
+        for row, obj in enumerate(collection):
+            if obj in selected:
+                if obj.rotation_euler.order == 'XYZ':
+                    euler_index.append(len(objects))
+                else:
+                    other.append(len(objects))
+                objects.append(obj)
+                rows.append(row)
+        self.objects = objects
+        self.euler_index = np.array(euler_index, dtype=np.intp)
+        self.other_rotation = other
+        self._size = len(collection)
+        if len(objects) >= SELECTION_FOREACH_FRACTION * self._size:
+            self._rows = np.array(rows, dtype=np.intp)
+            self._buffer = np.empty(self._size * 3, dtype=np.float32)
+        else:
+            self._rows = self._buffer = None
+        self.written.clear()
+        self.stale = False
+
+    def valid(self):
+        """选择重建之后物体被增删时需要重建"""
+        return not self.stale and len(bpy.data.objects) == self._size
+
+    def read(self, attribute):
+        """选中物体的 attribute，形状 (n, 3)，float64 便于累加"""
+        rows = self._rows
+        if rows is None:
+            return np.array([getattr(obj, attribute)[:] for obj in self.objects], dtype=np.float64)
+        bpy.data.objects.foreach_get(attribute, self._buffer)
+        return self._buffer.reshape(-1, 3)[rows].astype(np.float64)
+
+    def write(self, attribute, values):
+        """写回选中物体的 attribute；整体写回时缓冲中是刚才 read() 读出的同一属性"""
+        rows = self._rows
+        if rows is None:
+            for obj, value in zip(self.objects, values.tolist()):
+                setattr(obj, attribute, value)
+        else:
+            self._buffer.reshape(-1, 3)[rows] = values
+            bpy.data.objects.foreach_set(attribute, self._buffer)
+        self.written[attribute] = values
+
+    def values(self, attribute):
+        """本周期写回的 attribute，没有写过时读取"""
+        values = self.written.get(attribute)
+        return self.read(attribute) if values is None else values
+
+    def translate(self, delta):
+        """所有选中物体平移同一个世界空间向量"""
+        location = self.read('location')
+        location += tuple(delta)
+        self.write('location', location)
+
+    def translate_heading(self, dx, dy):
+        """每个物体沿自身 Z 朝向平移：dy 为前后，dx 为左右"""
+        heading = self.read('rotation_euler')[:, 2]
+        sin, cos = np.sin(heading), np.cos(heading)
+        location = self.read('location')
+        location[:, 0] += dx * cos - dy * sin
+        location[:, 1] += dx * sin + dy * cos
+        self.write('location', location)
+
+    def rotate(self, delta_euler):
+        """在各物体当前旋转之后再施加同一个 XYZ 欧拉旋转（与 Euler.rotate 相同）"""
+        index = self.euler_index
+        rotation = None
+        if len(index):
+            rotation = self.read('rotation_euler')
+            old = rotation[index]
+            delta = _euler_xyz_matrices(np.array([delta_euler], dtype=np.float64))[0]
+            rotation[index] = _compatible_euler_xyz(delta @ _euler_xyz_matrices(old), old)
+            self.write('rotation_euler', rotation)
+        for i in self.other_rotation:
+            obj = self.objects[i]
+            obj.rotation_euler.rotate(mathutils.Euler(delta_euler, 'XYZ'))
+            if rotation is not None:
+                rotation[i] = obj.rotation_euler[:]  # 录制关键帧时取用的值与物体一致
+
+    def scale(self, factor):
+        scale = self.read('scale')
+        scale *= factor
+        self.write('scale', scale)
+
+    def update_tag(self):
+        """整体写回（foreach_set）不会标记物体需要更新；逐个赋值时 RNA 已经标记过"""
+        if self._rows is not None:
+            for obj in self.objects:
+                obj.update_tag()
+
+
+# 物体移动模型
+class MovementModel:
+    """
+    决定物体模式下左摇杆如何移动物体、右摇杆绕哪些轴旋转物体。
+    每种模型只实现自己的运算，操作器在设置切换时换用对应的实例，周期内不再判断模式。
+    """
+    __slots__ = ()
+    name = ''
+    label = ''
+    description = ''
+    number = 0  # 枚举项的固定编号，注册顺序变化时场景中保存的选择不变
+    key_path = 'location'  # 移动后写入关键帧的属性
+
+    def move_object(self, obj, view3d, dx, dy):
+        """移动物体，新位置整体赋值给 obj.location（一次 RNA 写入，同时触发属性更新）"""
+        raise NotImplementedError
+
+    def move_selection(self, batch, view3d, dx, dy):
+        raise NotImplementedError
+
+    def rotation(self, delta_rot_x, delta_rot_z):
+        """本周期要施加的 XYZ 欧拉旋转"""
+        return (delta_rot_x, 0.0, delta_rot_z)
+
+
+# 沿视角方向移动（默认）
+class ViewRelativeMovement(MovementModel):
+    __slots__ = ()
+    name = 'VIEW'
+    label = "视角方向"
+    description = "左摇杆沿当前视角的方向移动物体，右摇杆绕 X/Z 轴旋转"
+    number = 0
+
+    def move_object(self, obj, view3d, dx, dy):
+        move_vector = mathutils.Vector((dx, dy, 0.0))
+        move_vector = view3d.view_rotation @ move_vector
+        obj.location = obj.location + move_vector
+
+    def move_selection(self, batch, view3d, dx, dy):
+        batch.translate(view3d.view_rotation @ mathutils.Vector((dx, dy, 0.0)))
+
+
+# 沿物体自身朝向移动（漫游：配合 VR 在场景中行走）
+class HeadingRelativeMovement(MovementModel):
+    """
+    朝向的 2D 旋转矩阵（cos, sin）按朝向角缓存：只有右摇杆转向（或撤销等操作）改变了
+    rotation_euler.z 时才重新计算三角函数，只推左摇杆时每周期只比较一次角度。
+    """
+    __slots__ = ('_heading', '_cos', '_sin')
+    name = 'WALK'
+    label = "物体朝向（漫游）"
+    description = "左摇杆沿物体自身的 Z 朝向前后左右移动，右摇杆只绕 Z 轴转向，适合控制摄像机在场景中行走"
+    number = 1
+    key_path = 'delta_location'
+
+    def __init__(self):
+        self._heading = None
+        self._cos = 1.0
+        self._sin = 0.0
+
+    def basis(self, heading):
+        """朝向角对应的 (cos, sin)，角度不变时直接复用"""
+        if heading != self._heading:
+            self._heading = heading
+            self._cos = math.cos(heading)
+            self._sin = math.sin(heading)
+        return self._cos, self._sin
+
+    def move_object(self, obj, view3d, dx, dy):
+        # 20250426 casdfxx : use local euler view
+        # dy 沿朝向前后移动，dx 左右平移；一次读出位置、一次写回
+        cos, sin = self.basis(obj.rotation_euler[2])
+        x, y, z = obj.location
+        obj.location = (x + dx * cos - dy * sin, y + dx * sin + dy * cos, z)
+
+    def move_selection(self, batch, view3d, dx, dy):
+        batch.translate_heading(dx, dy)
+
+    def rotation(self, delta_rot_x, delta_rot_z):
+        # 20250426 casdfxx : only rotate z aixs
+        return (0.0, 0.0, delta_rot_z)
+
+
+# 移动模型注册表：名称 -> 实例
+MOVEMENT_MODELS = {}
+_movement_model_items = []  # EnumProperty 的选项，需保持引用（Blender 不复制动态枚举的字符串）
+
+
+def register_movement_model(model):
+    """注册移动模型，之后即可在设置中选择"""
+    MOVEMENT_MODELS[model.name] = model
+    _movement_model_items[:] = [(m.name, m.label, m.description, m.number)
+                                for m in sorted(MOVEMENT_MODELS.values(), key=lambda m: m.number)]
+
+
+def movement_model_items(self, context):
+    return _movement_model_items
+
+
+def get_movement_model(name):
+    """按名称取移动模型，未知名称（如卸载了提供该模型的扩展）退回视角方向"""
+    return MOVEMENT_MODELS.get(name) or MOVEMENT_MODELS['VIEW']
+
+
+register_movement_model(ViewRelativeMovement())
+register_movement_model(HeadingRelativeMovement())
+
+
+# 视角环绕：右摇杆的旋转直接以四元数增量乘到 view_rotation 上，不经过欧拉角
+def selection_centroid(context):
+    """选中物体的世界空间包围盒的中心，没有选中物体时返回 None"""
+    lo = [math.inf] * 3
+    hi = [-math.inf] * 3
+    for obj in context.selected_objects:
+        matrix = obj.matrix_world
+        for corner in obj.bound_box:
+            point = matrix @ mathutils.Vector(corner)
+            for i in range(3):
+                if point[i] < lo[i]:
+                    lo[i] = point[i]
+                if point[i] > hi[i]:
+                    hi[i] = point[i]
+    if lo[0] > hi[0]:
+        return None
+    return ((lo[0] + hi[0]) * 0.5, (lo[1] + hi[1]) * 0.5, (lo[2] + hi[2]) * 0.5)
+
+
+def view_raycast(context, view3d):
+    """从视点沿视线方向穿过视图中心投射射线，返回命中点，未命中返回 None"""
+    direction = view3d.view_rotation @ mathutils.Vector((0.0, 0.0, -1.0))
+    origin = view3d.view_location - direction * view3d.view_distance
+    hit, location, _, _, _, _ = context.scene.ray_cast(context.evaluated_depsgraph_get(), origin, direction)
+    return tuple(location) if hit else None
+
+
+class ViewOrbit:
+    """
+    视角模式下右摇杆的环绕，两种方式：
+    - TURNTABLE: 左右绕世界 Z 轴、上下绕视角自身的 X 轴，与 1.1 版本改欧拉角 z/x 的效果相同，
+      但不再经过 to_euler()/to_quaternion()，越过两极时不会因欧拉分解跳变
+    - TRACKBALL: 左右、上下都绕视角自身的轴，可以自由翻转
+    环绕中心不是视图中心时 view_location 随同一增量绕中心旋转，中心在屏幕上保持不动。
+    中心在每次手势开始时求一次并缓存，手势期间不再计算包围盒或投射射线。
+    四元数运算全部用浮点数完成，结果写入预先分配的 Quaternion/Vector 后整体赋值，周期内不创建 mathutils 对象。
+    """
+    __slots__ = ('pivot', 'last_hit', 'stale', '_rotation', '_location')
+
+    def __init__(self):
+        self.pivot = None  # 本次手势的环绕中心 (x, y, z)，None 为视图中心
+        self.last_hit = None  # 最近一次射线命中点，未命中时沿用
+        self.stale = True  # 下一次环绕前需要重新求中心
+        self._rotation = mathutils.Quaternion()
+        self._location = mathutils.Vector()
+
+    def resolve_pivot(self, context, view3d, pivot):
+        """手势开始时按设置求环绕中心，无法确定时退回视图中心"""
+        self.stale = False
+        if pivot == 'SELECTION':
+            self.pivot = selection_centroid(context)
+        elif pivot == 'CURSOR':
+            self.pivot = tuple(context.scene.cursor.location)
+        elif pivot == 'RAYCAST':
+            hit = view_raycast(context, view3d)
+            if hit is not None:
+                self.last_hit = hit
+            self.pivot = self.last_hit
+        else:
+            self.pivot = None
+
+    def orbit(self, view3d, mode, yaw, pitch):
+        """左右旋转 yaw、上下旋转 pitch（弧度）"""
+        qw, qx, qy, qz = view3d.view_rotation
+        c = math.cos(0.5 * yaw)
+        s = math.sin(0.5 * yaw)
+        if mode == 'TRACKBALL':
+            # q · 绕自身 Y 轴
+            w, x, y, z = qw * c - qy * s, qx * c - qz * s, qy * c + qw * s, qz * c + qx * s
+        else:
+            # 绕世界 Z 轴 · q
+            w, x, y, z = qw * c - qz * s, qx * c - qy * s, qy * c + qx * s, qz * c + qw * s
+        # · 绕自身 X 轴
+        c = math.cos(0.5 * pitch)
+        s = math.sin(0.5 * pitch)
+        w, x, y, z = w * c - x * s, x * c + w * s, y * c + z * s, z * c - y * s
+        # 逐周期累乘会累积舍入误差，保持单位长度
+        n = 1.0 / math.sqrt(w * w + x * x + y * y + z * z)
+        w *= n
+        x *= n
+        y *= n
+        z *= n
+
+        pivot = self.pivot
+        if pivot is not None:
+            # 本周期的世界空间增量 d = 新旋转 · 旧旋转的共轭，视图中心绕环绕中心旋转同样的增量
+            dw = w * qw + x * qx + y * qy + z * qz
+            dx = x * qw - w * qx - y * qz + z * qy
+            dy = y * qw - w * qy - z * qx + x * qz
+            dz = z * qw - w * qz - x * qy + y * qx
+            px, py, pz = pivot
+            vx, vy, vz = view3d.view_location
+            vx -= px
+            vy -= py
+            vz -= pz
+            tx = 2.0 * (dy * vz - dz * vy)
+            ty = 2.0 * (dz * vx - dx * vz)
+            tz = 2.0 * (dx * vy - dy * vx)
+            location = self._location
+            location.x = px + vx + dw * tx + dy * tz - dz * ty
+            location.y = py + vy + dw * ty + dz * tx - dx * tz
+            location.z = pz + vz + dw * tz + dx * ty - dy * tx
+            view3d.view_location = location
+
+        rotation = self._rotation
+        rotation.w = w
+        rotation.x = x
+        rotation.y = y
+        rotation.z = z
+        view3d.view_rotation = rotation
+
+
+# 运行时状态（供面板显示）
+class GamepadRuntimeStatus:
+    __slots__ = ('running', 'replaying', 'recording', 'link_status', 'dropped_edges', 'tick_rate', 'idle', 'coalesced_frames', 'ticks', 'skipped_ticks',
+                 'raw_events', 'delivered_events', 'published_frames', 'coalesce_ratio', 'keyframes_sampled', 'keyframes_written', 'session_events', 'session_ticks')
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.running = False
+        self.replaying = False  # 正在回放会话日志
+        self.recording = False  # 正在录制会话日志
+        self.link_status = LINK_CONNECTING  # 读取线程的连接状态（LINK_*）
+        self.dropped_edges = 0  # 按键边沿队列满时丢弃的边沿数
+        self.tick_rate = 0.0
+        self.idle = False
+        self.coalesced_frames = 0  # 累计被合并掉的帧数
+        self.ticks = 0  # 处理过的计时器周期数
+        self.skipped_ticks = 0  # 没有任何变化、跳过更新和重绘的周期数
+        self.raw_events = 0  # 读取线程从设备读到的事件数
+        self.delivered_events = 0  # 合并后实际交付的事件数
+        self.published_frames = 0  # 读取线程发布的帧数
+        self.coalesce_ratio = 0.0  # 读到的事件数 / 交付的事件数
+        self.keyframes_sampled = 0  # 批量录制模式下缓冲的采样数（精简前）
+        self.keyframes_written = 0  # 批量录制模式下提交的关键帧数（精简后）
+        self.session_events = 0  # 上一次会话录制的事件数
+        self.session_ticks = 0  # 上一次会话录制的周期数
+
+
+runtime_status = GamepadRuntimeStatus()
+
+
+# 输入到视口的延迟分段：(名称, 面板显示名)
+LATENCY_STAGES = (
+    ('event_to_receive', "事件→接收"),
+    ('receive_to_publish', "接收→发布"),
+    ('publish_to_consume', "发布→读取"),
+    ('consume_to_redraw', "读取→重绘"),
+    ('event_to_redraw', "事件→重绘"),
+)
+LATENCY_CAPACITY = 2048  # 环形缓冲保留的最近样本数
+LATENCY_MIN = 1e-5  # 直方图最小桶的下界（秒）
+LATENCY_BUCKETS_PER_OCTAVE = 8  # 每翻一倍分 8 个桶，分位数相对误差约 ±4%
+LATENCY_BUCKETS = 17 * LATENCY_BUCKETS_PER_OCTAVE  # 覆盖 10µs ~ 1.3s
+
+
+def _latency_bucket(seconds):
+    if seconds <= LATENCY_MIN:
+        return 0
+    bucket = int(math.log2(seconds / LATENCY_MIN) * LATENCY_BUCKETS_PER_OCTAVE)
+    return min(bucket, LATENCY_BUCKETS - 1)
+
+
+# 延迟记录：环形缓冲 + 对数分桶直方图
+class LatencyTrace:
+    """
+    每个样本是一组分段延迟（秒），按列存放在定长 array('d') 中，写满后覆盖最旧的样本；
+    每段另有一个只统计缓冲内样本的直方图，覆盖时减去旧样本，因此分位数只需扫描桶，
+    面板每次重绘都可以直接查询。未知的分段记为 NaN，不计入直方图。
+    """
+    __slots__ = ('capacity', 'count', '_index', '_columns', '_histograms')
+
+    def __init__(self, capacity=LATENCY_CAPACITY):
+        self.capacity = capacity
+        self.reset()
+
+    def reset(self):
+        self.count = 0  # 缓冲内的样本数
+        self._index = 0  # 下一个样本写入的位置
+        self._columns = tuple(array('d', [math.nan]) * self.capacity for _ in LATENCY_STAGES)
+        self._histograms = tuple(array('l', [0]) * LATENCY_BUCKETS for _ in LATENCY_STAGES)
+
+    def record(self, *stages):
+        """按 LATENCY_STAGES 的顺序记录一组分段延迟"""
+        index = self._index
+        for column, histogram, value in zip(self._columns, self._histograms, stages):
+            old = column[index]
+            if old == old:  # 非 NaN：被覆盖的旧样本移出直方图
+                histogram[_latency_bucket(old)] -= 1
+            column[index] = value
+            if value == value:
+                histogram[_latency_bucket(value)] += 1
+        self._index = (index + 1) % self.capacity
+        if self.count < self.capacity:
+            self.count += 1
+
+    def percentiles(self, stage, quantiles=(0.5, 0.95, 0.99)):
+        """某分段的分位数（秒，取桶的几何中点），没有样本时返回 None"""
+        histogram = self._histograms[stage]
+        total = sum(histogram)
+        if not total:
+            return None
+        result = []
+        targets = iter(quantiles)
+        target = next(targets)
+        seen = 0
+        for bucket, count in enumerate(histogram):
+            seen += count
+            while seen >= target * total:
+                result.append(LATENCY_MIN * 2 ** ((bucket + 0.5) / LATENCY_BUCKETS_PER_OCTAVE))
+                target = next(targets, None)
+                if target is None:
+                    return tuple(result)
+        return tuple(result)
+
+    def rows(self):
+        """按时间顺序返回缓冲内的样本"""
+        start = (self._index - self.count) % self.capacity
+        columns = self._columns
+        for i in range(self.count):
+            index = (start + i) % self.capacity
+            yield tuple(column[index] for column in columns)
+
+    def write_csv(self, path):
+        """导出为 CSV（毫秒），返回写入的行数"""
+        with open(path, 'w', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(['sample'] + [f'{name}_ms' for name, _ in LATENCY_STAGES])
+            count = 0
+            for count, row in enumerate(self.rows(), 1):
+                writer.writerow([count] + ['' if v != v else f'{v * 1000.0:.3f}' for v in row])
+        return count
+
+
+latency_trace = LatencyTrace()
+
+
+# 按键绑定：输入（按键、十字键、虚拟扳机按键）-> 动作，按住修饰键时切换到另一层
+BINDING_MODE_VIEW = 0
+BINDING_MODE_OBJECT = 1
+BINDING_MODES = (BINDING_MODE_VIEW, BINDING_MODE_OBJECT)
+
+
+class BindingAction:
+    """
+    可绑定的动作，由操作器的 action_<小写名称>(context, amount) 方法执行。
+    hold 动作在按住期间每个周期执行一次，amount 为按压量（扳机行程，按键为 1）× 本周期的时间增益；
+    其余动作在每次按下时执行一次。modes 为动作生效的模式（视角 / 物体）。
+    """
+    __slots__ = ('name', 'label', 'description', 'number', 'hold', 'modes')
+
+    def __init__(self, name, label, description, number, hold=False, modes=BINDING_MODES):
+        self.name = name
+        self.label = label
+        self.description = description
+        self.number = number  # 枚举项的固定编号，增删动作时场景中保存的绑定不变
+        self.hold = hold
+        self.modes = modes
+
+
+BINDING_ACTIONS = {action.name: action for action in (
+    BindingAction('ZOOM_OUT', "拉远 / 缩小", "视角模式拉远视角，物体模式缩小物体", 0, hold=True),
+    BindingAction('ZOOM_IN', "拉近 / 放大", "视角模式拉近视角，物体模式放大物体", 1, hold=True),
+    BindingAction('MOVE_UP', "上升", "视角或物体沿世界 Z 轴向上移动", 2, hold=True),
+    BindingAction('MOVE_DOWN', "下降", "视角或物体沿世界 Z 轴向下移动", 3, hold=True),
+    BindingAction('UNDO', "撤销", "撤销上一步操作", 4),
+    BindingAction('REDO', "重做", "重做撤销的操作", 5),
+    BindingAction('VIEW_TOP', "顶视图", "切换到顶视图（仅视角模式）", 6, modes=(BINDING_MODE_VIEW,)),
+    BindingAction('VIEW_BOTTOM', "底视图", "切换到底视图（仅视角模式）", 7, modes=(BINDING_MODE_VIEW,)),
+    BindingAction('VIEW_FRONT', "前视图", "切换到前视图（仅视角模式）", 8, modes=(BINDING_MODE_VIEW,)),
+    BindingAction('VIEW_BACK', "后视图", "切换到后视图（仅视角模式）", 9, modes=(BINDING_MODE_VIEW,)),
+    BindingAction('VIEW_LEFT', "左视图", "切换到左视图（仅视角模式）", 10, modes=(BINDING_MODE_VIEW,)),
+    BindingAction('VIEW_RIGHT', "右视图", "切换到右视图（仅视角模式）", 11, modes=(BINDING_MODE_VIEW,)),
+    BindingAction('VIEW_CAMERA', "摄像机视图", "切换摄像机视图", 12),
+    BindingAction('VIEW_SELECTED', "框显选中", "视角对准选中的物体", 13),
+    BindingAction('PERSP_ORTHO', "透视 / 正交", "切换透视与正交投影", 14),
+    BindingAction('FRAME_PREV', "上一帧", "时间线后退一帧", 15),
+    BindingAction('FRAME_NEXT', "下一帧", "时间线前进一帧", 16),
+    BindingAction('PLAY', "播放 / 暂停", "播放或暂停动画", 17),
+)}
+_binding_action_items = [(a.name, a.label, a.description, a.number)
+                         for a in sorted(BINDING_ACTIONS.values(), key=lambda a: a.number)]
+
+# 可绑定的输入，按 BUTTON_CODES 的顺序编号
+BINDING_INPUT_LABELS = {
+    'BTN_SOUTH': "A", 'BTN_EAST': "B", 'BTN_WEST': "X", 'BTN_NORTH': "Y",
+    'BTN_TL': "LB", 'BTN_TR': "RB", 'BTN_SELECT': "Back", 'BTN_START': "Start", 'BTN_MODE': "Guide",
+    'BTN_THUMBL': "左摇杆按下", 'BTN_THUMBR': "右摇杆按下",
+    'DPAD_UP': "十字键上", 'DPAD_DOWN': "十字键下", 'DPAD_LEFT': "十字键左", 'DPAD_RIGHT': "十字键右",
+    'TRIGGER_LEFT': "LT", 'TRIGGER_RIGHT': "RT",
+}
+_binding_input_items = [(code, BINDING_INPUT_LABELS[code], code, index) for index, code in enumerate(BUTTON_CODES)]
+_binding_modifier_items = [('NONE', "无", "不需要修饰键", BUTTON_COUNT)] + _binding_input_items
+
+# 默认绑定：(修饰键, 输入, 动作)，基础层与 1.1 版本的固定映射一致，另加扳机升降和 LB 层
+DEFAULT_BINDINGS = (
+    ('NONE', 'BTN_SOUTH', 'ZOOM_OUT'),
+    ('NONE', 'BTN_EAST', 'ZOOM_IN'),
+    ('NONE', 'BTN_WEST', 'UNDO'),
+    ('NONE', 'BTN_NORTH', 'REDO'),
+    ('NONE', 'DPAD_UP', 'VIEW_TOP'),
+    ('NONE', 'DPAD_DOWN', 'VIEW_FRONT'),
+    ('NONE', 'DPAD_LEFT', 'VIEW_LEFT'),
+    ('NONE', 'DPAD_RIGHT', 'VIEW_RIGHT'),
+    ('NONE', 'TRIGGER_LEFT', 'MOVE_DOWN'),
+    ('NONE', 'TRIGGER_RIGHT', 'MOVE_UP'),
+    ('NONE', 'BTN_TR', 'VIEW_SELECTED'),
+    ('BTN_TL', 'DPAD_UP', 'VIEW_BOTTOM'),
+    ('BTN_TL', 'DPAD_DOWN', 'VIEW_BACK'),
+    ('BTN_TL', 'DPAD_LEFT', 'FRAME_PREV'),
+    ('BTN_TL', 'DPAD_RIGHT', 'FRAME_NEXT'),
+    ('BTN_TL', 'BTN_SOUTH', 'PLAY'),
+    ('BTN_TL', 'BTN_WEST', 'PERSP_ORTHO'),
+    ('BTN_TL', 'BTN_NORTH', 'VIEW_CAMERA'),
+)
+
+
+# 编译后的绑定分派表
+class BindingTable:
+    """
+    绑定变化时把 (修饰键, 输入, 动作) 列表编译成扁平的分派表：
+    press/hold[模式][层 * BUTTON_COUNT + 按键索引] -> 动作方法的元组。
+    第 0 层为基础层；第 i 层在按住 modifiers[i - 1] 时生效，层内没有绑定的输入沿用基础层。
+    修饰键在基础层不触发动作。同时按住多个修饰键时取列表中靠前的一个。
+    每个周期只按按键数查表，开销与绑定的数量无关。
+    """
+    __slots__ = ('modifiers', 'press', 'hold', 'count')
+
+    def __init__(self):
+        self.compile(())
+
+    def compile(self, bindings):
+        """编译绑定，忽略未知的输入和动作（如旧版本场景中保存的绑定），返回生效的绑定数"""
+        entries = []
+        modifiers = []
+        for modifier, code, name in bindings:
+            action = BINDING_ACTIONS.get(name)
+            index = BUTTON_INDEX.get(code)
+            if action is None or index is None or (modifier != 'NONE' and modifier not in BUTTON_INDEX):
+                continue
+            layer = 0
+            if modifier != 'NONE':
+                mod_index = BUTTON_INDEX[modifier]
+                if mod_index not in modifiers:
+                    modifiers.append(mod_index)
+                layer = 1 + modifiers.index(mod_index)
+            method = getattr(GAMEPAD_OT_control, 'action_' + name.lower())
+            entries.append((layer * BUTTON_COUNT + index, action, method))
+
+        size = (1 + len(modifiers)) * BUTTON_COUNT
+        press = [[[] for _ in range(size)] for _ in BINDING_MODES]
+        hold = [[[] for _ in range(size)] for _ in BINDING_MODES]
+        bound = [False] * size
+        for slot, action, method in entries:
+            table = hold if action.hold else press
+            for mode in action.modes:
+                table[mode][slot].append(method)
+            bound[slot] = True
+
+        for table in (press, hold):
+            for slots in table:
+                for layer in range(1, 1 + len(modifiers)):
+                    base = layer * BUTTON_COUNT
+                    for index in range(BUTTON_COUNT):
+                        if not bound[base + index]:
+                            slots[base + index] = slots[index]
+                for index in modifiers:
+                    slots[index] = []
+
+        self.modifiers = tuple(modifiers)
+        self.press = tuple(tuple(tuple(methods) for methods in slots) for slots in press)
+        self.hold = tuple(tuple(tuple(methods) for methods in slots) for slots in hold)
+        self.count = len(entries)
+        return self.count
 
-# 动态检测函数
-def check_gamepad_available():
-    try:
-        from inputs import get_gamepad
-        # 尝试获取手柄事件，如果没有手柄会抛出异常
-        events = get_gamepad()
-        return True
-    except:
-        return False
+    def layer(self, values):
+        """当前快照对应的层在分派表中的起始位置"""
+        for i, index in enumerate(self.modifiers):
+            if values[BUTTON_LEVEL_BASE + index]:
+                return (i + 1) * BUTTON_COUNT
+        return 0
 
-from bpy_extras import view3d_utils
 
+binding_table = BindingTable()
 
-# 手柄状态类
-class GamepadState:
-    def __init__(self):
-        self.left_stick_x = 0.0
-        self.left_stick_y = 0.0
-        self.right_stick_x = 0.0
-        self.right_stick_y = 0.0
-        self.buttons = {}
-        self.button_states = {}
-        self.dpad_up = 0
-        self.dpad_down = 0
-        self.dpad_left = 0
-        self.dpad_right = 0
-
-gamepad_state = GamepadState()
 
-# 手柄输入监听线程
-class GamepadThread(threading.Thread):
+def binding_tuples(settings):
+    """设置中的绑定列表，为空时使用默认绑定"""
+    return [(b.modifier, b.input, b.action) for b in settings.bindings or ()] or DEFAULT_BINDINGS
+
+
+def update_bindings(self, context):
+    binding_table.compile(binding_tuples(context.scene.gamepad_settings))
+
+
+# 单条按键绑定
+class GamepadBinding(PropertyGroup):
+    modifier: EnumProperty(
+        name="修饰键",
+        description="需要同时按住的按键，“无”为基础层",
+        items=_binding_modifier_items,
+        default='NONE',
+        update=update_bindings
+    )
+    input: EnumProperty(
+        name="输入",
+        description="触发动作的按键、十字键方向或扳机",
+        items=_binding_input_items,
+        default='BTN_SOUTH',
+        update=update_bindings
+    )
+    action: EnumProperty(
+        name="动作",
+        description="按下或按住输入时执行的动作",
+        items=_binding_action_items,
+        default='ZOOM_OUT',
+        update=update_bindings
+    )
+
+
+# 模态周期使用的设置快照
+class SettingsSnapshot:
+    """
+    GamepadSettings 中每个周期都要读取的设置的纯 Python 副本：周期内只读普通属性，不再经过 RNA。
+    只在属性的 update 回调、启动控制、撤销/重做/打开文件之后（应用处理函数）以及模态周期发现
+    场景切换时刷新；scene 记录快照来自哪个场景（as_pointer()）。
+    反转开关预先换算成 ±1 的符号，空闲刷新率换算成计时器间隔，关键帧模式换算成布尔值。
+    """
+    __slots__ = ('scene', 'enabled', 'pan_speed', 'rotation_speed', 'zoom_speed', 'scale_speed', 'move_speed',
+                 'object_rotation_speed', 'x_sign', 'y_sign', 'z_sign', 'orbit_mode', 'orbit_pivot',
+                 'motion_smoothing', 'motion_acceleration', 'movement_model', 'transform_selection',
+                 'buffered_keys', 'key_reduction_tolerance', 'adaptive_timer', 'idle_interval')
+
     def __init__(self):
-        super().__init__()
-        self.daemon = True
-        self.running = True
-        self.error_message = None
-        self._consecutive_errors = 0  # 添加连续错误计数器
-        self._max_consecutive_errors = 10  # 最大连续错误次数
+        self.scene = 0
+        self.enabled = False
+        self.pan_speed = self.rotation_speed = self.zoom_speed = 0.0
+        self.scale_speed = self.move_speed = self.object_rotation_speed = 0.0
+        self.x_sign = self.y_sign = self.z_sign = 1.0
+        self.orbit_mode = 'TURNTABLE'
+        self.orbit_pivot = 'VIEW'
+        self.motion_smoothing = self.motion_acceleration = 0.0
+        self.movement_model = 'VIEW'
+        self.transform_selection = False
+        self.buffered_keys = False
+        self.key_reduction_tolerance = 0.0
+        self.adaptive_timer = True
+        self.idle_interval = 0.1
 
-    def run(self):
-        while self.running:
-            try:
-                from inputs import get_gamepad
-                events = get_gamepad()
-                # 成功获取事件，重置错误计数
-                self._consecutive_errors = 0
-                self.error_message = None
+    def refresh(self, settings, scene):
+        self.scene = scene.as_pointer()
+        self.enabled = settings.enable_gamepad_control
+        self.pan_speed = settings.pan_speed
+        self.rotation_speed = settings.rotation_speed
+        self.zoom_speed = settings.zoom_speed
+        self.scale_speed = settings.scale_speed
+        self.move_speed = settings.move_speed
+        self.object_rotation_speed = settings.object_rotation_speed
+        self.x_sign = -1.0 if settings.invert_x_axis else 1.0
+        self.y_sign = -1.0 if settings.invert_y_axis else 1.0
+        self.z_sign = -1.0 if settings.invert_z_axis else 1.0
+        self.orbit_mode = settings.orbit_mode
+        self.orbit_pivot = settings.orbit_pivot
+        self.motion_smoothing = settings.motion_smoothing
+        self.motion_acceleration = settings.motion_acceleration
+        self.movement_model = settings.movement_model
+        self.transform_selection = settings.transform_selection
+        self.buffered_keys = settings.keyframe_mode == 'BUFFERED'
+        self.key_reduction_tolerance = settings.key_reduction_tolerance
+        self.adaptive_timer = settings.adaptive_timer
+        self.idle_interval = 1.0 / settings.idle_tick_rate
 
-                for event in events:
-                    if self.running:  # 检查是否仍在运行
-                        self.process_event(event)
 
-            except ImportError:
-                self.error_message = "未安装 'inputs' 包。请安装后重试。"
-                self._consecutive_errors += 1
-                time.sleep(1)
+settings_snapshot = SettingsSnapshot()
 
-            except Exception as e:
-                self._consecutive_errors += 1
-                if "No gamepad found" in str(e):
-                    self.error_message = "未检测到手柄。请确保手柄已连接。"
-                else:
-                    self.error_message = f"手柄错误: {e}"
-                time.sleep(0.5)  # 减少等待时间，提高响应速度
 
-            # 如果连续错误次数过多，可能需要关闭控制
-            if self._consecutive_errors >= self._max_consecutive_errors:
-                self.error_message = "多次无法检测到手柄，已自动关闭控制。"
-                break
+def update_settings_snapshot(self, context):
+    settings_snapshot.refresh(self, context.scene)
+
+
+def sync_scene_settings(scene):
+    """按 scene 中的设置刷新周期内使用的快照、按键分派表和摇杆响应表"""
+    settings = scene.gamepad_settings
+    settings_snapshot.refresh(settings, scene)
+    binding_table.compile(binding_tuples(settings))
+    stick_response.configure(settings)
+
+
+@bpy.app.handlers.persistent
+def _sync_scene_settings_handler(*args):
+    # 撤销/重做/打开文件会直接恢复属性值和绑定列表，不触发 update 回调
+    scene = bpy.context.scene
+    if scene is not None and hasattr(scene, "gamepad_settings"):
+        sync_scene_settings(scene)
+
+
+_SCENE_SYNC_HANDLERS = ('undo_post', 'redo_post', 'load_post')
 
-    def process_event(self, event):
-        """处理手柄事件"""
-        if event.code == 'ABS_X':
-            gamepad_state.left_stick_x = event.state / 32768.0
-        elif event.code == 'ABS_Y':
-            gamepad_state.left_stick_y = event.state / 32768.0
-        elif event.code == 'ABS_RX':
-            gamepad_state.right_stick_x = event.state / 32768.0
-        elif event.code == 'ABS_RY':
-            gamepad_state.right_stick_y = event.state / 32768.0
-        elif event.code == 'ABS_HAT0Y':
-            if event.state == -1:
-                gamepad_state.dpad_up = 1
-                gamepad_state.dpad_down = 0
-            elif event.state == 1:
-                gamepad_state.dpad_down = 1
-                gamepad_state.dpad_up = 0
-            else:
-                gamepad_state.dpad_up = 0
-                gamepad_state.dpad_down = 0
-        elif event.code == 'ABS_HAT0X':
-            if event.state == -1:
-                gamepad_state.dpad_left = 1
-                gamepad_state.dpad_right = 0
-            elif event.state == 1:
-                gamepad_state.dpad_right = 1
-                gamepad_state.dpad_left = 0
-            else:
-                gamepad_state.dpad_left = 0
-                gamepad_state.dpad_right = 0
-        elif event.code.startswith('BTN_'):
-            gamepad_state.buttons[event.code] = event.state
-            gamepad_state.button_states[event.code] = event.state
 
 # 设置属性
 class GamepadSettings(PropertyGroup):
@@ -126,60 +3032,275 @@ class GamepadSettings(PropertyGroup):
         description="视角平移的速度",
         default=0.1,
         min=0.01,
-        max=1.0
+        max=1.0,
+        update=update_settings_snapshot
     )
     rotation_speed: FloatProperty(
         name="旋转速度",
         description="视角旋转的速度",
         default=0.05,
         min=0.01,
-        max=1.0
+        max=1.0,
+        update=update_settings_snapshot
     )
     zoom_speed: FloatProperty(
         name="缩放速度",
         description="视角缩放的速度",
         default=0.5,
         min=0.1,
-        max=2.0
+        max=2.0,
+        update=update_settings_snapshot
+    )
+    orbit_mode: EnumProperty(
+        name="环绕方式",
+        description="右摇杆旋转视角的方式",
+        items=[
+            ('TURNTABLE', "转台", "左右绕世界 Z 轴、上下绕视角自身的横轴旋转，地平线保持水平"),
+            ('TRACKBALL', "轨迹球", "左右、上下都绕视角自身的轴旋转，可以自由翻转"),
+        ],
+        default='TURNTABLE',
+        update=update_settings_snapshot
+    )
+    orbit_pivot: EnumProperty(
+        name="环绕中心",
+        description="右摇杆旋转视角时围绕的点，在每次开始旋转时确定",
+        items=[
+            ('VIEW', "视图中心", "围绕视图中心旋转（1.1 版本的行为）"),
+            ('SELECTION', "选中物体", "围绕选中物体包围盒的中心旋转，没有选中物体时围绕视图中心"),
+            ('CURSOR', "3D 游标", "围绕 3D 游标旋转"),
+            ('RAYCAST', "视线命中点", "围绕视图中心射线命中的表面点旋转，未命中时沿用上一次的命中点"),
+        ],
+        default='VIEW',
+        update=update_settings_snapshot
     )
     scale_speed: FloatProperty(
         name="物体缩放速度",
         description="物体缩放的速度",
         default=0.05,
         min=0.01,
-        max=0.5
+        max=0.5,
+        update=update_settings_snapshot
     )
     move_speed: FloatProperty(
         name="物体移动速度",
         description="物体移动的速度",
         default=0.1,
         min=0.01,
-        max=1.0
+        max=1.0,
+        update=update_settings_snapshot
     )
     object_rotation_speed: FloatProperty(
         name="物体旋转速度",
         description="物体旋转的速度",
         default=0.05,
         min=0.01,
-        max=1.0
+        max=1.0,
+        update=update_settings_snapshot
     )
     invert_x_axis: BoolProperty(
         name="反转X轴",
         description="反转X轴的控制方向",
-        default=False
+        default=False,
+        update=update_settings_snapshot
     )
     invert_y_axis: BoolProperty(
         name="反转Y轴",
         description="反转Y轴的控制方向",
-        default=False
+        default=False,
+        update=update_settings_snapshot
     )
     invert_z_axis: BoolProperty(
         name="反转Z轴",
         description="反转Z轴的控制方向",
+        default=False,
+        update=update_settings_snapshot
+    )
+    motion_smoothing: FloatProperty(
+        name="输入平滑",
+        description="摇杆输入的平滑时间（秒），0 为不平滑",
+        default=0.0,
+        min=0.0,
+        max=0.5,
+        subtype='TIME_ABSOLUTE',
+        unit='TIME_ABSOLUTE',
+        update=update_settings_snapshot
+    )
+    motion_acceleration: FloatProperty(
+        name="持续加速",
+        description="持续推动摇杆时每秒增加的速度倍数，0 为不加速",
+        default=0.0,
+        min=0.0,
+        max=5.0,
+        update=update_settings_snapshot
+    )
+    left_dead_zone: FloatProperty(
+        name="左摇杆死区",
+        description="左摇杆推动幅度小于该值时视为居中（径向死区，对角方向与正方向一致）",
+        default=0.1,
+        min=0.0,
+        max=0.9,
+        update=update_stick_response
+    )
+    left_anti_dead_zone: FloatProperty(
+        name="左摇杆反死区",
+        description="左摇杆刚离开死区时的最小输出，0 为从零开始",
+        default=0.0,
+        min=0.0,
+        max=0.9,
+        update=update_stick_response
+    )
+    left_response_curve: EnumProperty(
+        name="左摇杆响应曲线",
+        description="左摇杆推动幅度到速度的映射",
+        items=[
+            ('LINEAR', "线性", "输出与推动幅度成正比"),
+            ('EXPONENT', "指数", "小幅推动更精细，推到底时不变"),
+            ('CUSTOM', "自定义", "按 25%/50%/75% 处的输出绘制折线"),
+        ],
+        default='LINEAR',
+        update=update_stick_response
+    )
+    left_response_exponent: FloatProperty(
+        name="左摇杆曲线指数",
+        description="指数曲线的指数，大于 1 时小幅推动更慢",
+        default=2.0,
+        min=0.2,
+        max=5.0,
+        update=update_stick_response
+    )
+    left_response_points: FloatVectorProperty(
+        name="左摇杆曲线控制点",
+        description="自定义曲线在推动 25%/50%/75% 时的输出",
+        size=3,
+        default=(0.25, 0.5, 0.75),
+        min=0.0,
+        max=1.0,
+        update=update_stick_response
+    )
+    right_dead_zone: FloatProperty(
+        name="右摇杆死区",
+        description="右摇杆推动幅度小于该值时视为居中（径向死区，对角方向与正方向一致）",
+        default=0.1,
+        min=0.0,
+        max=0.9,
+        update=update_stick_response
+    )
+    right_anti_dead_zone: FloatProperty(
+        name="右摇杆反死区",
+        description="右摇杆刚离开死区时的最小输出，0 为从零开始",
+        default=0.0,
+        min=0.0,
+        max=0.9,
+        update=update_stick_response
+    )
+    right_response_curve: EnumProperty(
+        name="右摇杆响应曲线",
+        description="右摇杆推动幅度到速度的映射",
+        items=[
+            ('LINEAR', "线性", "输出与推动幅度成正比"),
+            ('EXPONENT', "指数", "小幅推动更精细，推到底时不变"),
+            ('CUSTOM', "自定义", "按 25%/50%/75% 处的输出绘制折线"),
+        ],
+        default='LINEAR',
+        update=update_stick_response
+    )
+    right_response_exponent: FloatProperty(
+        name="右摇杆曲线指数",
+        description="指数曲线的指数，大于 1 时小幅推动更慢",
+        default=2.0,
+        min=0.2,
+        max=5.0,
+        update=update_stick_response
+    )
+    right_response_points: FloatVectorProperty(
+        name="右摇杆曲线控制点",
+        description="自定义曲线在推动 25%/50%/75% 时的输出",
+        size=3,
+        default=(0.25, 0.5, 0.75),
+        min=0.0,
+        max=1.0,
+        update=update_stick_response
+    )
+    auto_calibrate: BoolProperty(
+        name="自动校准中心",
+        description="摇杆静止时持续修正其中心位置（漂移），结果按设备保存",
+        default=True,
+        update=update_stick_calibration
+    )
+    input_backend: EnumProperty(
+        name="输入后端",
+        description="读取手柄事件的方式",
+        items=[
+            ('AUTO', "自动", "Linux 上有可读的手柄设备时直接读取 evdev，否则使用 inputs 包"),
+            ('INPUTS', "inputs 包", "跨平台的 inputs 包"),
+            ('EVDEV', "evdev（Linux）", "直接读取 /dev/input/event*，开销最低"),
+        ],
+        default='AUTO'
+    )
+    adaptive_timer: BoolProperty(
+        name="空闲降频",
+        description="摇杆居中且无按键时降低刷新频率，减少空闲时的 CPU 占用和重绘",
+        default=True,
+        update=update_settings_snapshot
+    )
+    keyframe_mode: EnumProperty(
+        name="关键帧录制",
+        description="物体模式下关键帧的写入方式",
+        items=[
+            ('LIVE', "逐帧插入", "每个周期调用 keyframe_insert（1.1 版本的行为）"),
+            ('BUFFERED', "批量写入", "运动过程中缓冲采样，运动停止时一次性写入 F 曲线"),
+        ],
+        default='LIVE',
+        update=update_settings_snapshot
+    )
+    key_reduction_tolerance: FloatProperty(
+        name="关键帧精简误差",
+        description="批量写入时省略可由相邻关键帧线性插值得到的关键帧，0 为不精简",
+        default=0.0,
+        min=0.0,
+        max=1.0,
+        precision=4,
+        update=update_settings_snapshot
+    )
+    record_session: BoolProperty(
+        name="录制会话",
+        description="控制期间把原始手柄事件和计时器周期写入会话日志，可在之后回放",
         default=False
     )
+    session_path: StringProperty(
+        name="会话日志",
+        description="会话日志的保存路径",
+        default="//gamepad_session.gpadlog",
+        subtype='FILE_PATH'
+    )
+    movement_model: EnumProperty(
+        name="移动方式",
+        description="物体模式下摇杆移动和旋转物体的方式",
+        items=movement_model_items,
+        update=update_settings_snapshot
+    )
+    transform_selection: BoolProperty(
+        name="变换全部选中物体",
+        description="物体模式下同时移动/旋转/缩放所有选中的物体（需要 NumPy），关闭时只变换活动物体",
+        default=False,
+        update=update_settings_snapshot
+    )
+    idle_tick_rate: FloatProperty(
+        name="空闲刷新率",
+        description="空闲时的刷新频率（Hz），越低越省电，但从静止到响应的延迟越大",
+        default=10.0,
+        min=1.0,
+        max=30.0,
+        update=update_settings_snapshot
+    )
+    bindings: CollectionProperty(
+        name="按键绑定",
+        description="输入到动作的映射，为空时使用默认绑定",
+        type=GamepadBinding
+    )
 
     def update_enable_gamepad_control(self, context):
+        settings_snapshot.refresh(self, context.scene)
         if self.enable_gamepad_control:
             bpy.ops.gamepad.control('INVOKE_DEFAULT')
         else:
@@ -194,6 +3315,11 @@ class GamepadSettings(PropertyGroup):
     )
 
 
+# 虚拟扳机按键的按压量取自扳机轴，其余按键为 1
+_BUTTON_AXES = tuple(dict(TRIGGER_BUTTONS).get(index, -1) for index in range(BUTTON_COUNT))
+_NO_PRESSES = array('i', bytes(4 * BUTTON_COUNT))
+
+
 # 主操作器
 class GAMEPAD_OT_control(Operator):
     bl_idname = "gamepad.control"
@@ -202,178 +3328,464 @@ class GAMEPAD_OT_control(Operator):
 
     _timer = None
     _thread = None
-    _last_error_time = 0  # 错误消息时间戳
-    _last_error_message = None  # 上一次错误消息
+    _buffer = None  # 与读取线程共享的快照缓冲
+    _scheduler = None  # 自适应计时器调度
+    _recorder = None  # 关键帧批量录制
+    _key_frame = 0  # 本周期写入关键帧使用的帧号
+    _buffered_keys = False  # 本周期是否使用批量录制
+    _motion = None  # 运动积分器
+    _batch = None  # 多物体批量变换
+    _orbit = None  # 视角环绕
+    _model = MOVEMENT_MODELS['VIEW']  # 当前的物体移动模型
+    _session = None  # 会话录制
+    _replay = None  # 会话回放
+    _replay_frame_offset = 0  # 回放开始时的当前帧 - 录制开始时的帧
+    _presses = None  # 本周期各按键的按下次数（由按键边沿队列统计）
+    _settings = None  # 本周期的设置，绑定动作使用
+    _target_obj = None  # 本周期物体模式下的活动物体，视角模式为 None
+    _target_batch = None  # 本周期批量变换的选中物体
+
+    replay_path: StringProperty(
+        name="回放文件",
+        description="非空时回放该会话日志，而不是读取手柄",
+        default="",
+        options={'HIDDEN', 'SKIP_SAVE'}
+    )
+    replay_speed: FloatProperty(
+        name="回放倍速",
+        default=1.0,
+        min=0.0,
+        options={'HIDDEN', 'SKIP_SAVE'}
+    )
 
     def modal(self, context, event):
-        settings = context.scene.gamepad_settings
+        settings = settings_snapshot
+        # 切换到其他场景后改用该场景的设置（包括是否启用）
+        if context.scene.as_pointer() != settings.scene:
+            sync_scene_settings(context.scene)
 
         # 检查线程状态
         if self._thread:
-            if not self._thread.is_alive():
-                # 线程已结束，说明发生了严重错误
-                settings.enable_gamepad_control = False
-                self.report({'WARNING'}, "手柄控制已自动关闭")
+            thread = self._thread
+            if thread.superseded:
+                # 控制被关闭后又立即打开：新的操作器已接管设备，这里只收尾，不改开关和运行状态
+                self.finish_superseded(context)
+                return {'CANCELLED'}
+            if not thread.is_alive():
+                # 线程已结束：输入源读完（回放），或者发生了无法恢复的错误
+                context.scene.gamepad_settings.enable_gamepad_control = False
+                if thread.status == LINK_FINISHED:
+                    self.report({'INFO'}, "输入已结束")
+                else:
+                    self.report({'WARNING'}, thread.error_message or "手柄控制已自动关闭")
                 self.cancel(context)
                 return {'CANCELLED'}
 
-            # 检查错误信息
-            if self._thread.error_message:
-                current_time = time.time()
-                # 如果是新的错误消息或者距离上次显示超过3秒
-                if (self._thread.error_message != self._last_error_message or
-                        current_time - self._last_error_time > 3):
-                    self.report({'WARNING'}, self._thread.error_message)
-                    self._last_error_time = current_time
-                    self._last_error_message = self._thread.error_message
-
-                # 如果提示自动关闭控制，则关闭
-                if "已自动关闭控制" in self._thread.error_message:
-                    settings.enable_gamepad_control = False
-                    self.cancel(context)
-                    return {'CANCELLED'}
-
-                # 如果提示未安装包，则关闭
-                if "未安装 'inputs' 包" in self._thread.error_message:
-                    settings.enable_gamepad_control = False
-                    self.cancel(context)
-                    return {'CANCELLED'}
-
-        if not settings.enable_gamepad_control:
+            coalescer = thread.coalescer
+            runtime_status.raw_events = coalescer.raw_events
+            runtime_status.delivered_events = coalescer.delivered_events
+            runtime_status.published_frames = coalescer.published_frames
+            runtime_status.coalesce_ratio = coalescer.coalesce_ratio
+
+            # 连接状态变化时提示一次；断开期间保持运行，手柄插回后自动恢复
+            status = thread.status
+            if status != runtime_status.link_status:
+                runtime_status.link_status = status
+                if status == LINK_WAITING:
+                    self.report({'WARNING'}, f"{thread.error_message} 等待手柄连接…")
+                elif status == LINK_CONNECTED and thread.reconnects:
+                    self.report({'INFO'}, "手柄已重新连接")
+
+        # 回放不依赖“启用手柄控制”开关，按 ESC 或播放完毕结束
+        if self._replay is None and not settings.enabled:
             self.cancel(context)
             return {'CANCELLED'}
 
         if event.type == 'TIMER':
-            view3d = context.space_data.region_3d
-            settings = context.scene.gamepad_settings
+            if self._replay is not None:
+                return self.replay_ticks(context)
 
-            self.handle_button_actions(context)
+            if self._session is not None:
+                self._session.write_tick(context.scene.frame_current)
+            active = self.tick(context, settings)
+            # 没有输入时降低计时器频率，有输入时立即恢复
+            self.update_timer(context, settings, active)
 
-            if context.active_object and context.active_object.select_get():
-                obj = context.active_object
-
-                if abs(gamepad_state.left_stick_x) > 0.1 or abs(gamepad_state.left_stick_y) > 0.1:
-                    move_speed = settings.move_speed
-                    dx = gamepad_state.left_stick_x * move_speed
-                    dy = -gamepad_state.left_stick_y * move_speed
+            return {'RUNNING_MODAL'}  # 改为 RUNNING_MODAL 以确保持续运行
 
-                    if settings.invert_x_axis:
-                        dx = -dx
-                    if not settings.invert_y_axis:
-                        dy = -dy
+        elif event.type == 'ESC':
+            self.cancel(context)
+            return {'CANCELLED'}
 
-                    move_vector = mathutils.Vector((dx, dy, 0.0))
-                    move_vector = view3d.view_rotation @ move_vector
-                    obj.location += move_vector
+        return {'PASS_THROUGH'}
 
-                    obj.location = obj.location.copy()
-                    obj.keyframe_insert(data_path='location', group="Location")
+    def tick(self, context, settings, frame=None):
+        """执行一个控制周期，返回本周期是否有输入（决定计时器是否降频）"""
+        view3d = context.space_data.region_3d
 
-                if abs(gamepad_state.right_stick_x) > 0.1 or abs(gamepad_state.right_stick_y) > 0.1:
-                    rot_speed = settings.object_rotation_speed
+        # 每个计时器周期只消费一帧一致的快照
+        state = self._state
+        fresh = self._buffer.read_into(state)
+        consumed = time.perf_counter()
+        runtime_status.coalesced_frames += state.coalesced
+        if stick_calibration.capturing:
+            # 校准采集期间摇杆只用于测量，不移动视角或物体
+            self._buffer.edges.clear()
+            return False
+        edges = self.drain_edges()
 
-                    delta_rot_x = -gamepad_state.right_stick_y * rot_speed
-                    delta_rot_z = -gamepad_state.right_stick_x * rot_speed
+        # 按真实经过的时间积分，速度与计时器频率无关
+        motion = self._motion
+        motion.update(state, settings.motion_smoothing, settings.motion_acceleration)
 
-                    if settings.invert_x_axis:
-                        delta_rot_x = -delta_rot_x
-                    if settings.invert_z_axis:
-                        delta_rot_z = -delta_rot_z
+        # 按下类的绑定动作先于取活动物体执行：撤销/重做之后原来的物体引用可能已失效
+        self._settings = settings
+        self._target_obj = self._target_batch = None
+        obj = context.active_object
+        mode = BINDING_MODE_OBJECT if obj and obj.select_get() else BINDING_MODE_VIEW
+        layer = binding_table.layer(state.values)
+        if edges:
+            self.dispatch_presses(context, mode, layer)
 
-                    rot_euler = mathutils.Euler((delta_rot_x, 0, delta_rot_z), 'XYZ')
-                    obj.rotation_euler.rotate(rot_euler)
+        # 回放时关键帧写在录制时的帧号上（相对回放开始时的当前帧）
+        self._key_frame = context.scene.frame_current if frame is None else frame
+        self._buffered_keys = settings.buffered_keys
 
-                    obj.rotation_euler = obj.rotation_euler.copy()
-                    obj.keyframe_insert(data_path='rotation_euler', group="Rotation")
+        # 只有视角或物体变换真正改变时才更新依赖图和重绘
+        dirty = False
 
-                scale_speed = settings.scale_speed
+        if context.active_object and context.active_object.select_get():
+            obj = context.active_object
+            if self._model.name != settings.movement_model:
+                self._model = get_movement_model(settings.movement_model)
+            # 开启“变换全部选中物体”且选中多个物体时批量变换，否则只变换活动物体
+            batch = self.selection_batch(context, settings)
 
-                if gamepad_state.buttons.get('BTN_SOUTH'):
-                    factor = 1.0 - scale_speed
-                    obj.scale *= factor
-                    obj.scale = obj.scale.copy()
-                    obj.keyframe_insert(data_path='scale', group="Scale")
-                if gamepad_state.buttons.get('BTN_EAST'):
-                    factor = 1.0 + scale_speed
-                    obj.scale *= factor
-                    obj.scale = obj.scale.copy()
-                    obj.keyframe_insert(data_path='scale', group="Scale")
+            if motion.left_active:
+                move_speed = settings.move_speed * motion.left_gain
+                dx = motion.left_x * move_speed * settings.x_sign
+                dy = motion.left_y * move_speed * settings.y_sign
 
-                obj.update_tag()
-                context.view_layer.update()
+                if batch is None:
+                    self.move_object(obj, view3d, dx, dy)
+                else:
+                    self.move_selection(batch, view3d, dx, dy)
+                dirty = True
 
-            else:
-                if abs(gamepad_state.left_stick_x) > 0.1 or abs(gamepad_state.left_stick_y) > 0.1:
-                    pan_speed = settings.pan_speed
-                    dx = gamepad_state.left_stick_x * pan_speed
-                    dy = -gamepad_state.left_stick_y * pan_speed
+            if motion.right_active:
+                rot_speed = settings.object_rotation_speed * motion.right_gain
+                delta_rot_x = -motion.right_y * rot_speed * settings.x_sign
+                delta_rot_z = -motion.right_x * rot_speed * settings.z_sign
 
-                    if settings.invert_x_axis:
-                        dx = -dx
-                    if not settings.invert_y_axis:
-                        dy = -dy
+                if batch is None:
+                    self.rotate_object(obj, delta_rot_x, delta_rot_z)
+                else:
+                    self.rotate_selection(batch, delta_rot_x, delta_rot_z)
+                dirty = True
 
-                    view3d.view_location += view3d.view_rotation @ mathutils.Vector((dx, dy, 0.0))
+            self._target_obj = obj
+            self._target_batch = batch
+            if self.dispatch_holds(context, BINDING_MODE_OBJECT, layer):
+                dirty = True
 
-                if abs(gamepad_state.right_stick_x) > 0.1 or abs(gamepad_state.right_stick_y) > 0.1:
-                    rot_speed = settings.rotation_speed
-                    euler = view3d.view_rotation.to_euler()
+            if dirty:
+                if batch is None:
+                    obj.update_tag()
+                else:
+                    batch.update_tag()
+                context.view_layer.update()
 
-                    delta_euler_z = gamepad_state.right_stick_x * rot_speed
-                    delta_euler_x = gamepad_state.right_stick_y * rot_speed
+        else:
+            if motion.left_active:
+                pan_speed = settings.pan_speed * motion.left_gain
+                dx = motion.left_x * pan_speed * settings.x_sign
+                dy = motion.left_y * pan_speed * settings.y_sign
 
-                    if settings.invert_z_axis:
-                        delta_euler_z = -delta_euler_z
-                    if settings.invert_x_axis:
-                        delta_euler_x = -delta_euler_x
+                view3d.view_location += view3d.view_rotation @ mathutils.Vector((dx, dy, 0.0))
+                dirty = True
 
-                    euler.z += delta_euler_z
-                    euler.x += delta_euler_x
-                    view3d.view_rotation = euler.to_quaternion()
+            if motion.right_active:
+                rot_speed = settings.rotation_speed * motion.right_gain
+                orbit = self._orbit
+                if orbit.stale:
+                    orbit.resolve_pivot(context, view3d, settings.orbit_pivot)
+                orbit.orbit(view3d, settings.orbit_mode,
+                            motion.right_x * rot_speed * settings.z_sign,
+                            motion.right_y * rot_speed * settings.x_sign)
+                dirty = True
 
-                zoom_speed = settings.zoom_speed
-                if gamepad_state.buttons.get('BTN_SOUTH'):
-                    view3d.view_distance += zoom_speed
-                if gamepad_state.buttons.get('BTN_EAST'):
-                    view3d.view_distance -= zoom_speed
+            if self.dispatch_holds(context, BINDING_MODE_VIEW, layer):
+                dirty = True
 
-                self.handle_dpad_view_switch(context)
+        active = motion.left_active or motion.right_active or edges or state.buttons_active()
+        # 只取决于输入，回放时与录制时一致
+        motion.resting = not active
+        if not active:
+            # 手势结束，下一次手势开始时按当时的选择重建批量变换、重新求环绕中心
+            self._batch.stale = True
+            self._orbit.stale = True
 
+        if dirty:
             context.area.tag_redraw()
+            if fresh and self._replay is None:
+                self.record_latency(consumed)
+        else:
+            runtime_status.skipped_ticks += 1
+            # 运动停止：提交本段录制
+            if self._recorder.pending:
+                self.commit_keyframes(settings)
+        runtime_status.ticks += 1
+        return active
 
-            return {'RUNNING_MODAL'}  # 改为 RUNNING_MODAL 以确保持续运行
-
-        elif event.type == 'ESC':
+    def replay_ticks(self, context):
+        """回放到期的所有录制周期"""
+        settings = settings_snapshot
+        replay = self._replay
+        offset = self._replay_frame_offset
+        for frame in replay.due_ticks(time.perf_counter()):
+            self.tick(context, settings, frame + offset)
+        if replay.finished:
+            self.report({'INFO'}, f"回放结束: {runtime_status.ticks} 个周期")
             self.cancel(context)
             return {'CANCELLED'}
+        return {'RUNNING_MODAL'}
 
-        return {'PASS_THROUGH'}
+    def record_latency(self, consumed):
+        """新帧引起了重绘：记录从事件到重绘请求的各段延迟"""
+        values = self._state.values
+        received = values[FRAME_RECEIVE_TIME]
+        published = values[FRAME_PUBLISH_TIME]
+        redrawn = time.perf_counter()
+        age = values[FRAME_EVENT_AGE]
+        latency_trace.record(age, published - received, consumed - published,
+                             redrawn - consumed, age + (redrawn - received))
+
+    def update_timer(self, context, settings, active):
+        """按调度结果重新注册计时器"""
+        scheduler = self._scheduler
+        if settings.adaptive_timer:
+            scheduler.idle_interval = settings.idle_interval
+        else:
+            scheduler.idle_interval = scheduler.active_interval
+        if scheduler.observe(active):
+            wm = context.window_manager
+            wm.event_timer_remove(self._timer)
+            self._timer = wm.event_timer_add(scheduler.interval, window=context.window)
+        runtime_status.tick_rate = scheduler.rate
+        runtime_status.idle = scheduler.idle
+
+    def insert_keyframe(self, obj, data_path, group):
+        """按录制模式插入或缓冲关键帧"""
+        if self._buffered_keys:
+            self._recorder.record(obj, data_path, group, self._key_frame)
+        else:
+            obj.keyframe_insert(data_path=data_path, frame=self._key_frame, group=group)
+
+    def commit_keyframes(self, settings):
+        sampled, written = self._recorder.commit(settings.key_reduction_tolerance)
+        runtime_status.keyframes_sampled += sampled
+        runtime_status.keyframes_written += written
+
+    def move_object(self, obj, view3d, dx, dy):
+        """按当前移动模型移动物体"""
+        model = self._model
+        model.move_object(obj, view3d, dx, dy)
+        self.insert_keyframe(obj, model.key_path, "Location")
+
+    def rotate_object(self, obj, delta_rot_x, delta_rot_z):
+        """旋转物体"""
+        rot_euler = mathutils.Euler(self._model.rotation(delta_rot_x, delta_rot_z), 'XYZ')
+        obj.rotation_euler.rotate(rot_euler)
+
+        obj.rotation_euler = obj.rotation_euler.copy()
+        self.insert_keyframe(obj, 'rotation_euler', "Rotation")
+
+    def scale_object(self, obj, batch, factor):
+        """缩放活动物体，批量模式下缩放全部选中物体"""
+        if batch is None:
+            obj.scale *= factor
+            obj.scale = obj.scale.copy()
+            self.insert_keyframe(obj, 'scale', "Scale")
+        else:
+            batch.scale(factor)
+            self.insert_selection_keyframes(batch, 'scale', "Scale")
+
+    def selection_batch(self, context, settings):
+        """批量变换选中物体时返回 SelectionBatch，否则返回 None"""
+        if not settings.transform_selection or np is None:
+            return None
+        batch = self._batch
+        if not batch.valid():
+            batch.rebuild(context)
+        batch.written.clear()  # 上个周期写回的值不能用于本周期的关键帧
+        return batch if batch.count > 1 else None
+
+    def move_selection(self, batch, view3d, dx, dy):
+        """按当前移动模型批量移动全部选中物体"""
+        model = self._model
+        model.move_selection(batch, view3d, dx, dy)
+        self.insert_selection_keyframes(batch, model.key_path, "Location")
+
+    def rotate_selection(self, batch, delta_rot_x, delta_rot_z):
+        """批量旋转全部选中物体"""
+        batch.rotate(self._model.rotation(delta_rot_x, delta_rot_z))
+        self.insert_selection_keyframes(batch, 'rotation_euler', "Rotation")
+
+    def insert_selection_keyframes(self, batch, data_path, group):
+        """批量录制时用本周期写回的数组一次采样全部选中物体；实时插入只能逐个物体调用 keyframe_insert"""
+        frame = self._key_frame
+        if self._buffered_keys:
+            self._recorder.record_values(batch.objects, data_path, group, frame, batch.values(data_path))
+        else:
+            for obj in batch.objects:
+                obj.keyframe_insert(data_path=data_path, frame=frame, group=group)
+
+    def drain_edges(self):
+        """取空按键边沿队列，统计本周期各按键的按下次数，返回取出的边沿数"""
+        presses = self._presses
+        presses[:] = _NO_PRESSES
+        ring = self._buffer.edges
+        drained = 0
+        while True:
+            edge = ring.pop()
+            if not edge:
+                break
+            drained += 1
+            if edge > 0:
+                presses[edge - 1] += 1
+        runtime_status.dropped_edges = ring.overflow
+        return drained
+
+    def dispatch_presses(self, context, mode, layer):
+        """按分派表执行按下类的绑定动作，每次按下都执行一次：同一周期内的连按不会合并"""
+        presses = self._presses
+        press = binding_table.press[mode]
+        for index in range(BUTTON_COUNT):
+            count = presses[index]
+            if count:
+                actions = press[layer + index]
+                for _ in range(count):
+                    for action in actions:
+                        action(self, context, 1.0)
+
+    def dispatch_holds(self, context, mode, layer):
+        """按分派表执行按住中的输入绑定的持续动作，返回是否改变了视角或物体"""
+        values = self._state.values
+        hold = binding_table.hold[mode]
+        gain = self._motion.button_gain
+        dirty = False
+        for index in range(BUTTON_COUNT):
+            if values[BUTTON_LEVEL_BASE + index]:
+                actions = hold[layer + index]
+                if actions:
+                    axis = _BUTTON_AXES[index]
+                    amount = gain if axis < 0 else gain * values[axis]
+                    for action in actions:
+                        if action(self, context, amount):
+                            dirty = True
+        return dirty
+
+    # 绑定动作（见 BINDING_ACTIONS），返回是否改变了视角或物体
+    def action_zoom_out(self, context, amount):
+        obj = self._target_obj
+        if obj is None:
+            context.space_data.region_3d.view_distance += self._settings.zoom_speed * amount
+        else:
+            # 每周期缩放 (1 - speed) 倍，按经过的周期数取幂
+            self.scale_object(obj, self._target_batch, (1.0 - self._settings.scale_speed) ** amount)
+        return True
+
+    def action_zoom_in(self, context, amount):
+        obj = self._target_obj
+        if obj is None:
+            context.space_data.region_3d.view_distance -= self._settings.zoom_speed * amount
+        else:
+            self.scale_object(obj, self._target_batch, (1.0 + self._settings.scale_speed) ** amount)
+        return True
 
-    def handle_button_actions(self, context):
-        if gamepad_state.button_states.get('BTN_WEST') == 1:
-            self.simulate_keypress(context, 'Z', ctrl=True)
-            gamepad_state.button_states['BTN_WEST'] = 0
+    def action_move_up(self, context, amount):
+        return self.move_vertical(context, amount)
 
-        if gamepad_state.button_states.get('BTN_NORTH') == 1:
-            self.simulate_keypress(context, 'Z', ctrl=True, shift=True)
-            gamepad_state.button_states['BTN_NORTH'] = 0
+    def action_move_down(self, context, amount):
+        return self.move_vertical(context, -amount)
 
-    def handle_dpad_view_switch(self, context):
-        if gamepad_state.dpad_up == 1:
-            bpy.ops.view3d.view_axis(type='TOP')
-            gamepad_state.dpad_up = 0
+    def move_vertical(self, context, amount):
+        """沿世界 Z 轴移动视角或物体，速度与左摇杆的平移/移动速度相同"""
+        obj = self._target_obj
+        settings = self._settings
+        if obj is None:
+            view3d = context.space_data.region_3d
+            view3d.view_location += mathutils.Vector((0.0, 0.0, settings.pan_speed * amount))
+            return True
+        dz = settings.move_speed * amount
+        batch = self._target_batch
+        if batch is None:
+            x, y, z = obj.location
+            obj.location = (x, y, z + dz)
+            self.insert_keyframe(obj, 'location', "Location")
+        else:
+            batch.translate((0.0, 0.0, dz))
+            self.insert_selection_keyframes(batch, 'location', "Location")
+        return True
+
+    def action_undo(self, context, amount):
+        self.simulate_keypress(context, 'Z', ctrl=True)
+        self.forget_objects()
+        return False
+
+    def action_redo(self, context, amount):
+        self.simulate_keypress(context, 'Z', ctrl=True, shift=True)
+        self.forget_objects()
+        return False
+
+    def forget_objects(self):
+        """撤销/重做会重建物体数据：手势中缓存的批量变换物体和未提交的录制采样都不能再使用"""
+        self._batch.stale = True
+        self._recorder.discard()
+
+    def action_view_top(self, context, amount):
+        return self.call_operator(bpy.ops.view3d.view_axis, type='TOP')
+
+    def action_view_bottom(self, context, amount):
+        return self.call_operator(bpy.ops.view3d.view_axis, type='BOTTOM')
+
+    def action_view_front(self, context, amount):
+        return self.call_operator(bpy.ops.view3d.view_axis, type='FRONT')
+
+    def action_view_back(self, context, amount):
+        return self.call_operator(bpy.ops.view3d.view_axis, type='BACK')
+
+    def action_view_left(self, context, amount):
+        return self.call_operator(bpy.ops.view3d.view_axis, type='LEFT')
+
+    def action_view_right(self, context, amount):
+        return self.call_operator(bpy.ops.view3d.view_axis, type='RIGHT')
+
+    def action_view_camera(self, context, amount):
+        return self.call_operator(bpy.ops.view3d.view_camera)
 
-        if gamepad_state.dpad_down == 1:
-            bpy.ops.view3d.view_axis(type='FRONT')
-            gamepad_state.dpad_down = 0
+    def action_view_selected(self, context, amount):
+        return self.call_operator(bpy.ops.view3d.view_selected)
 
-        if gamepad_state.dpad_left == 1:
-            bpy.ops.view3d.view_axis(type='LEFT')
-            gamepad_state.dpad_left = 0
+    def action_persp_ortho(self, context, amount):
+        return self.call_operator(bpy.ops.view3d.view_persportho)
 
-        if gamepad_state.dpad_right == 1:
-            bpy.ops.view3d.view_axis(type='RIGHT')
-            gamepad_state.dpad_right = 0
+    def action_frame_prev(self, context, amount):
+        return self.call_operator(bpy.ops.screen.frame_offset, delta=-1)
+
+    def action_frame_next(self, context, amount):
+        return self.call_operator(bpy.ops.screen.frame_offset, delta=1)
+
+    def action_play(self, context, amount):
+        return self.call_operator(bpy.ops.screen.animation_play)
+
+    def call_operator(self, operator, **kwargs):
+        """执行 Blender 操作，失败（如场景中没有摄像机）时只提示，不中断控制"""
+        try:
+            operator(**kwargs)
+        except RuntimeError as e:
+            self.report({'WARNING'}, f"操作失败: {e}")
+        return False
 
     def simulate_keypress(self, context, key, ctrl=False, shift=False, alt=False):
         try:
@@ -394,17 +3806,66 @@ class GAMEPAD_OT_control(Operator):
             self.report({'WARNING'}, "激活区域必须是3D视图")
             return {'CANCELLED'}
 
-        # 重置手柄状态
-        global gamepad_state
-        gamepad_state = GamepadState()
+        # 每次启动使用新的快照缓冲，线程与操作器各持有引用，不再替换全局对象
+        self._buffer = GamepadStateBuffer()
+        self._state = GamepadState()
+        self._motion = MotionIntegrator()
+        self._scheduler = AdaptiveTickScheduler()
+        self._recorder = KeyframeRecorder()
+        self._batch = SelectionBatch()
+        self._orbit = ViewOrbit()
+        self._presses = array('i', _NO_PRESSES)
+        runtime_status.reset()
+        runtime_status.running = True
+        latency_trace.reset()
+        settings = context.scene.gamepad_settings
+        # 周期内只读快照；之后的设置修改经属性的 update 回调和撤销/重做处理函数刷新快照
+        sync_scene_settings(context.scene)
 
-        # 开始新线程
-        self._thread = GamepadThread()
-        self._thread.start()
+        if self.replay_path:
+            # 回放会话：不启动读取线程，计时器固定为活动频率
+            self._replay = SessionReplay(bpy.path.abspath(self.replay_path), self._buffer, self.replay_speed)
+            try:
+                self._replay.open()
+            except OSError as e:
+                self._replay = None
+                self.report({'WARNING'}, f"无法打开会话日志: {e}")
+                return {'CANCELLED'}
+            self._motion.clock = self._replay.clock
+            first_frame = self._replay.first_frame
+            self._replay_frame_offset = 0 if first_frame is None else context.scene.frame_current - first_frame
+            runtime_status.replaying = True
+        else:
+            # 开始新线程
+            self._thread = GamepadThread(self._buffer, create_backend(settings.input_backend))
+            if settings.record_session:
+                self._session = SessionRecorder(bpy.path.abspath(settings.session_path))
+                try:
+                    self._session.open()
+                except OSError as e:
+                    self._session = None
+                    self.report({'WARNING'}, f"无法录制会话: {e}")
+                else:
+                    self._motion.clock = self._session.clock
+                    runtime_status.recording = True
+                self._thread.recorder = self._session
+            # 录制会话时固定校准结果（不在线跟踪中心），回放与录制时一致
+            stick_calibration.load(calibration_path())
+            update_stick_calibration(settings, context)
+            self._thread.calibrator = stick_calibration
+            if not reader_registry.start(self._thread):
+                runtime_status.running = False
+                settings.enable_gamepad_control = False
+                self.report({'WARNING'}, "上一次的手柄读取线程仍未退出，请稍后再启用")
+                if self._session is not None:
+                    self._session.close()
+                    self._session = None
+                    runtime_status.recording = False
+                return {'CANCELLED'}
 
         # 设置计时器
         wm = context.window_manager
-        self._timer = wm.event_timer_add(1 / 60, window=context.window)
+        self._timer = wm.event_timer_add(self._scheduler.interval, window=context.window)
         wm.modal_handler_add(self)
 
         return {'RUNNING_MODAL'}
@@ -412,13 +3873,235 @@ class GAMEPAD_OT_control(Operator):
     def cancel(self, context):
         if self._timer:
             context.window_manager.event_timer_remove(self._timer)
+            self._timer = None
+        runtime_status.running = False
+        runtime_status.replaying = False
+        runtime_status.recording = False
+        if self._recorder and self._recorder.pending:
+            self.commit_keyframes(settings_snapshot)
         if self._thread:
-            self._thread.running = False
-            self._thread.join(timeout=1.0)  # 添加超时
+            # 读取线程可被立即唤醒，这里通常只等待几毫秒
+            if not reader_registry.stop(self._thread):
+                print("游戏手柄读取线程未能及时退出")
+            if self._thread.calibrator is not None:
+                stick_calibration.capturing = False
+                stick_calibration.remember()
+                stick_calibration.save(calibration_path())
+        if self._session is not None:
+            self._session.close()
+            runtime_status.session_events = self._session.events
+            runtime_status.session_ticks = self._session.ticks
+            self._session = None
+        if self._replay is not None:
+            self._replay.close()
+            self._replay = None
+
+    def finish_superseded(self, context):
+        """读取线程已被新会话取代：移除计时器、写入未提交的关键帧并关闭本会话的录制，共享状态留给新会话"""
+        if self._timer:
+            context.window_manager.event_timer_remove(self._timer)
+            self._timer = None
+        if self._recorder and self._recorder.pending:
+            self.commit_keyframes(settings_snapshot)
+        if self._session is not None:
+            self._session.close()
+            self._session = None
+
+
+# 摇杆校准：采集几秒内的极限位置
+class GAMEPAD_OT_calibrate(Operator):
+    bl_idname = "gamepad.calibrate"
+    bl_label = "校准摇杆"
+    bl_description = "几秒内把两个摇杆沿各个方向推到底再松开，重新测定量程和中心，按设备保存"
+
+    _timer = None
+    _start = 0.0
+
+    @classmethod
+    def poll(cls, context):
+        return runtime_status.running and not runtime_status.replaying and not stick_calibration.capturing
+
+    def execute(self, context):
+        stick_calibration.begin_capture()
+        self._start = time.perf_counter()
+        wm = context.window_manager
+        self._timer = wm.event_timer_add(0.1, window=context.window)
+        wm.modal_handler_add(self)
+        self.report({'INFO'}, f"请在 {CALIBRATION_CAPTURE_SECONDS:.0f} 秒内把两个摇杆沿各个方向推到底，然后松开")
+        return {'RUNNING_MODAL'}
+
+    def modal(self, context, event):
+        if event.type != 'TIMER':
+            return {'PASS_THROUGH'}
+        if not runtime_status.running:
+            self.cancel(context)
+            return {'CANCELLED'}
+        if time.perf_counter() - self._start < CALIBRATION_CAPTURE_SECONDS:
+            return {'PASS_THROUGH'}
+
+        context.window_manager.event_timer_remove(self._timer)
+        self._timer = None
+        axes = stick_calibration.finish_capture()
+        stick_calibration.save(calibration_path())
+        if axes:
+            self.report({'INFO'}, f"已校准 {axes} 个摇杆轴: {stick_calibration.device}")
+        else:
+            self.report({'WARNING'}, "摇杆没有推到底，只更新了中心")
+        return {'FINISHED'}
+
+    def cancel(self, context):
+        stick_calibration.capturing = False
+        if self._timer:
+            context.window_manager.event_timer_remove(self._timer)
+            self._timer = None
+
+
+# 精简手柄录制的关键帧
+class GAMEPAD_OT_simplify_keys(Operator):
+    bl_idname = "gamepad.simplify_keys"
+    bl_label = "精简录制关键帧"
+    bl_description = "删除选中物体变换曲线上误差范围内可省略的关键帧"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    tolerance: FloatProperty(
+        name="误差",
+        description="允许的最大数值误差",
+        default=0.001,
+        min=0.0,
+        max=1.0,
+        precision=4
+    )
+
+    @classmethod
+    def poll(cls, context):
+        return np is not None and bool(context.selected_objects)
+
+    def execute(self, context):
+        before = after = 0
+        for obj in context.selected_objects:
+            anim = obj.animation_data
+            if anim is None or anim.action is None:
+                continue
+            for fcurve in anim.action.fcurves:
+                if fcurve.data_path in RECORDED_DATA_PATHS and len(fcurve.keyframe_points) > 2:
+                    count, kept = simplify_fcurve(fcurve, self.tolerance)
+                    before += count
+                    after += kept
+
+        self.report({'INFO'}, f"关键帧: {before} → {after}")
+        return {'FINISHED'}
+
 
-        # 重置手柄状态
-        global gamepad_state
-        gamepad_state = GamepadState()
+# 导出延迟样本
+class GAMEPAD_OT_export_latency(Operator, ExportHelper):
+    bl_idname = "gamepad.export_latency"
+    bl_label = "导出延迟数据"
+    bl_description = "把最近的输入延迟样本导出为 CSV（毫秒）"
+
+    filename_ext = ".csv"
+    filter_glob: StringProperty(default="*.csv", options={'HIDDEN'})
+
+    @classmethod
+    def poll(cls, context):
+        return latency_trace.count > 0
+
+    def execute(self, context):
+        try:
+            rows = latency_trace.write_csv(self.filepath)
+        except OSError as e:
+            self.report({'WARNING'}, f"导出失败: {e}")
+            return {'CANCELLED'}
+        self.report({'INFO'}, f"已导出 {rows} 个样本")
+        return {'FINISHED'}
+
+
+# 回放录制的会话
+class GAMEPAD_OT_replay_session(Operator, ImportHelper):
+    bl_idname = "gamepad.replay_session"
+    bl_label = "回放会话"
+    bl_description = "按原始或加快的速度重放录制的手柄会话，可把同一段操作应用到当前选中的物体"
+
+    filename_ext = ".gpadlog"
+    filter_glob: StringProperty(default="*.gpadlog", options={'HIDDEN'})
+    speed: FloatProperty(
+        name="倍速",
+        description="回放速度倍数，1 为原始速度",
+        default=1.0,
+        min=0.1,
+        max=16.0
+    )
+
+    @classmethod
+    def poll(cls, context):
+        return not runtime_status.running
+
+    def execute(self, context):
+        return bpy.ops.gamepad.control('INVOKE_DEFAULT', replay_path=self.filepath, replay_speed=self.speed)
+
+
+# 编辑按键绑定
+class GAMEPAD_OT_add_binding(Operator):
+    bl_idname = "gamepad.add_binding"
+    bl_label = "添加绑定"
+    bl_description = "添加一条按键绑定；使用默认绑定时先复制默认绑定以便修改"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    def execute(self, context):
+        settings = context.scene.gamepad_settings
+        if not settings.bindings:
+            for modifier, code, action in DEFAULT_BINDINGS:
+                binding = settings.bindings.add()
+                binding.modifier = modifier
+                binding.input = code
+                binding.action = action
+        else:
+            settings.bindings.add()
+        update_bindings(self, context)
+        return {'FINISHED'}
+
+
+class GAMEPAD_OT_remove_binding(Operator):
+    bl_idname = "gamepad.remove_binding"
+    bl_label = "删除绑定"
+    bl_description = "删除这条按键绑定"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    index: IntProperty(options={'HIDDEN'})
+
+    def execute(self, context):
+        settings = context.scene.gamepad_settings
+        if not 0 <= self.index < len(settings.bindings):
+            return {'CANCELLED'}
+        settings.bindings.remove(self.index)
+        update_bindings(self, context)
+        return {'FINISHED'}
+
+
+class GAMEPAD_OT_reset_bindings(Operator):
+    bl_idname = "gamepad.reset_bindings"
+    bl_label = "恢复默认绑定"
+    bl_description = "清空自定义的按键绑定，恢复默认绑定"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    def execute(self, context):
+        context.scene.gamepad_settings.bindings.clear()
+        update_bindings(self, context)
+        return {'FINISHED'}
+
+
+# 重新检测 inputs 包（安装后无需重启 Blender）
+class GAMEPAD_OT_reprobe_inputs(Operator):
+    bl_idname = "gamepad.reprobe_inputs"
+    bl_label = "重新检测 inputs 包"
+    bl_description = "安装 inputs 包后重新尝试导入"
+
+    def execute(self, context):
+        if get_inputs_module(reprobe=True) is None:
+            self.report({'WARNING'}, "仍未找到 inputs 包")
+            return {'CANCELLED'}
+        gamepad_discovery.invalidate()
+        self.report({'INFO'}, "已找到 inputs 包")
+        return {'FINISHED'}
 
 
 # UI 面板
@@ -434,11 +4117,7 @@ class GAMEPAD_PT_panel(Panel):
         return context.area.type == 'VIEW_3D'
 
     def check_inputs_package(self):
-        try:
-            import inputs
-            return True
-        except ImportError:
-            return False
+        return get_inputs_module() is not None
 
     def draw(self, context):
         layout = self.layout
@@ -447,15 +4126,30 @@ class GAMEPAD_PT_panel(Panel):
         box = layout.box()
         row = box.row()
         row.prop(settings, "enable_gamepad_control")
+        if runtime_status.replaying:
+            box.label(text="正在回放会话（ESC 停止）", icon='PLAY')
+        else:
+            box.operator("gamepad.replay_session", icon='PLAY')
 
         # 检查 inputs 包是否安装
         inputs_available = self.check_inputs_package()
 
-        if not inputs_available:
+        if not inputs_available and backend_needs_inputs(settings.input_backend):
             box.label(text="请安装 'inputs' 包", icon='ERROR')
             box.label(text="pip install inputs", icon='CONSOLE')
+            box.operator("gamepad.reprobe_inputs", icon='FILE_REFRESH')
             return
 
+        # 设备检测不阻塞：显示最近一次后台枚举的结果。
+        # 名称只读一次，后台刷新在两次读取之间清空列表也不会越界
+        names = gamepad_discovery.names
+        if runtime_status.running and runtime_status.link_status == LINK_WAITING:
+            box.label(text="手柄已断开，等待重新连接…", icon='TIME')
+        elif names:
+            box.label(text=f"已连接: {names[0]}", icon='CHECKMARK')
+        elif gamepad_discovery.checked:
+            box.label(text="未检测到手柄", icon='INFO')
+
         # 如果 inputs 包已安装，显示其他设置
         if settings.enable_gamepad_control:
             box = layout.box()
@@ -463,12 +4157,36 @@ class GAMEPAD_PT_panel(Panel):
             box.prop(settings, "pan_speed")
             box.prop(settings, "rotation_speed")
             box.prop(settings, "zoom_speed")
+            box.prop(settings, "orbit_mode")
+            box.prop(settings, "orbit_pivot")
 
             box = layout.box()
             box.label(text="物体控制设置:", icon='OBJECT_DATA')
             box.prop(settings, "scale_speed")
             box.prop(settings, "move_speed")
             box.prop(settings, "object_rotation_speed")
+            box.prop(settings, "movement_model")
+            row = box.row()
+            row.enabled = np is not None
+            row.prop(settings, "transform_selection")
+            box.prop(settings, "keyframe_mode")
+            row = box.row()
+            row.active = settings.keyframe_mode == 'BUFFERED'
+            row.prop(settings, "key_reduction_tolerance")
+            if runtime_status.keyframes_sampled:
+                box.label(text=f"批量写入: {runtime_status.keyframes_sampled} → "
+                               f"{runtime_status.keyframes_written} 个关键帧")
+            box.operator("gamepad.simplify_keys", icon='IPO_LINEAR')
+
+            box = layout.box()
+            box.label(text="会话录制:", icon='REC')
+            box.prop(settings, "record_session")
+            row = box.row()
+            row.active = settings.record_session
+            row.prop(settings, "session_path", text="")
+            if runtime_status.session_ticks:
+                box.label(text=f"上次录制: {runtime_status.session_events} 个事件, "
+                               f"{runtime_status.session_ticks} 个周期")
 
             box = layout.box()
             box.label(text="轴向设置:", icon='ORIENTATION_GIMBAL')
@@ -476,21 +4194,107 @@ class GAMEPAD_PT_panel(Panel):
             box.prop(settings, "invert_y_axis")
             box.prop(settings, "invert_z_axis")
 
+            box = layout.box()
+            box.label(text="运动手感:", icon='FORCE_HARMONIC')
+            box.prop(settings, "motion_smoothing")
+            box.prop(settings, "motion_acceleration")
+
+            box = layout.box()
+            box.label(text="摇杆响应:", icon='FCURVE')
+            row = box.row()
+            row.prop(settings, "auto_calibrate")
+            if stick_calibration.capturing:
+                row.label(text="正在校准…", icon='REC')
+            else:
+                row.operator("gamepad.calibrate", icon='PIVOT_CURSOR')
+            row = box.row()
+            for prefix in ('left', 'right'):
+                col = row.column()
+                col.prop(settings, f"{prefix}_dead_zone")
+                col.prop(settings, f"{prefix}_anti_dead_zone")
+                col.prop(settings, f"{prefix}_response_curve", text="")
+                curve = getattr(settings, f"{prefix}_response_curve")
+                if curve == 'EXPONENT':
+                    col.prop(settings, f"{prefix}_response_exponent")
+                elif curve == 'CUSTOM':
+                    col.prop(settings, f"{prefix}_response_points", text="")
+
+            box = layout.box()
+            box.label(text="按键绑定:", icon='EVENT_A')
+            if settings.bindings:
+                col = box.column(align=True)
+                for index, binding in enumerate(settings.bindings):
+                    row = col.row(align=True)
+                    row.prop(binding, "modifier", text="")
+                    row.prop(binding, "input", text="")
+                    row.prop(binding, "action", text="")
+                    row.operator("gamepad.remove_binding", text="", icon='X').index = index
+                row = box.row()
+                row.operator("gamepad.add_binding", icon='ADD')
+                row.operator("gamepad.reset_bindings", icon='LOOP_BACK')
+            else:
+                box.label(text=f"使用默认绑定（{len(DEFAULT_BINDINGS)} 条）")
+                box.operator("gamepad.add_binding", text="自定义绑定", icon='ADD')
+
+            box = layout.box()
+            box.label(text="性能:", icon='SORTTIME')
+            box.prop(settings, "input_backend")
+            box.prop(settings, "adaptive_timer")
+            row = box.row()
+            row.active = settings.adaptive_timer
+            row.prop(settings, "idle_tick_rate")
+            if runtime_status.running:
+                mode = "空闲" if runtime_status.idle else "活动"
+                box.label(text=f"当前刷新率: {runtime_status.tick_rate:.0f} Hz（{mode}）")
+                box.label(text=f"跳过重绘: {runtime_status.skipped_ticks} / {runtime_status.ticks} 周期")
+                box.label(text=f"事件合并: {runtime_status.raw_events} → {runtime_status.delivered_events} 个"
+                               f"（{runtime_status.coalesce_ratio:.1f}×）")
+                box.label(text=f"发布 {runtime_status.published_frames} 帧, "
+                               f"合并掉 {runtime_status.coalesced_frames} 帧")
+                if runtime_status.dropped_edges:
+                    box.label(text=f"按键队列溢出，丢弃 {runtime_status.dropped_edges} 个边沿", icon='ERROR')
+            box.label(text=f"插件注册耗时: {registration_time_ms:.1f} ms")
+
+            if latency_trace.count:
+                box = layout.box()
+                box.label(text=f"输入延迟（最近 {latency_trace.count} 帧, p50 / p95 / p99 ms）:",
+                          icon='TIME')
+                col = box.column(align=True)
+                for stage, (_, label) in enumerate(LATENCY_STAGES):
+                    values = latency_trace.percentiles(stage)
+                    if values is None:
+                        col.label(text=f"{label}: 无数据")
+                    else:
+                        col.label(text=f"{label}: " + " / ".join(f"{v * 1000.0:.2f}" for v in values))
+                box.operator("gamepad.export_latency", icon='EXPORT')
+
             # 添加控制说明
             help_box = layout.box()
             help_box.label(text="控制说明:", icon='HELP')
             col = help_box.column(align=True)
             col.label(text="左摇杆: 平移/物体移动")
             col.label(text="右摇杆: 旋转")
-            col.label(text="A键(BTN_SOUTH): 放大/缩小")
-            col.label(text="B键(BTN_EAST): 缩小/放大")
-            col.label(text="X键(BTN_WEST): 撤销")
-            col.label(text="Y键(BTN_NORTH): 重做")
-            col.label(text="方向键: 切换视图")
+            for modifier, code, name in binding_tuples(settings):
+                action = BINDING_ACTIONS.get(name)
+                if action is None or code not in BINDING_INPUT_LABELS:
+                    continue
+                keys = BINDING_INPUT_LABELS[code]
+                if modifier in BINDING_INPUT_LABELS:
+                    keys = f"{BINDING_INPUT_LABELS[modifier]} + {keys}"
+                col.label(text=f"{keys}: {action.label}")
 
 classes = (
+    GamepadBinding,
     GamepadSettings,
     GAMEPAD_OT_control,
+    GAMEPAD_OT_calibrate,
+    GAMEPAD_OT_simplify_keys,
+    GAMEPAD_OT_export_latency,
+    GAMEPAD_OT_replay_session,
+    GAMEPAD_OT_add_binding,
+    GAMEPAD_OT_remove_binding,
+    GAMEPAD_OT_reset_bindings,
+    GAMEPAD_OT_reprobe_inputs,
     GAMEPAD_PT_panel,
 )
 
@@ -500,13 +4304,27 @@ def safe_register():
     try:
         # 注册属性组
         if not hasattr(bpy.types.Scene, "gamepad_settings"):
+            bpy.utils.register_class(GamepadBinding)
             bpy.utils.register_class(GamepadSettings)
             bpy.types.Scene.gamepad_settings = PointerProperty(type=GamepadSettings)
 
         # 注册操作器和面板
         bpy.utils.register_class(GAMEPAD_OT_control)
+        bpy.utils.register_class(GAMEPAD_OT_calibrate)
+        bpy.utils.register_class(GAMEPAD_OT_simplify_keys)
+        bpy.utils.register_class(GAMEPAD_OT_export_latency)
+        bpy.utils.register_class(GAMEPAD_OT_replay_session)
+        bpy.utils.register_class(GAMEPAD_OT_add_binding)
+        bpy.utils.register_class(GAMEPAD_OT_remove_binding)
+        bpy.utils.register_class(GAMEPAD_OT_reset_bindings)
+        bpy.utils.register_class(GAMEPAD_OT_reprobe_inputs)
         bpy.utils.register_class(GAMEPAD_PT_panel)
 
+        for name in _SCENE_SYNC_HANDLERS:
+            handlers = getattr(bpy.app.handlers, name)
+            if _sync_scene_settings_handler not in handlers:
+                handlers.append(_sync_scene_settings_handler)
+
         return True
     except Exception as e:
         print(f"游戏手柄插件注册失败: {str(e)}")
@@ -516,30 +4334,52 @@ def safe_register():
 def safe_unregister():
     """安全注销所有类"""
     try:
+        for name in _SCENE_SYNC_HANDLERS:
+            handlers = getattr(bpy.app.handlers, name)
+            if _sync_scene_settings_handler in handlers:
+                handlers.remove(_sync_scene_settings_handler)
+
         # 注销操作器和面板
         bpy.utils.unregister_class(GAMEPAD_PT_panel)
+        bpy.utils.unregister_class(GAMEPAD_OT_reprobe_inputs)
+        bpy.utils.unregister_class(GAMEPAD_OT_reset_bindings)
+        bpy.utils.unregister_class(GAMEPAD_OT_remove_binding)
+        bpy.utils.unregister_class(GAMEPAD_OT_add_binding)
+        bpy.utils.unregister_class(GAMEPAD_OT_replay_session)
+        bpy.utils.unregister_class(GAMEPAD_OT_export_latency)
+        bpy.utils.unregister_class(GAMEPAD_OT_simplify_keys)
+        bpy.utils.unregister_class(GAMEPAD_OT_calibrate)
         bpy.utils.unregister_class(GAMEPAD_OT_control)
 
         # 注销属性组
         if hasattr(bpy.types.Scene, "gamepad_settings"):
             bpy.utils.unregister_class(GamepadSettings)
+            bpy.utils.unregister_class(GamepadBinding)
             del bpy.types.Scene.gamepad_settings
 
     except Exception as e:
         print(f"游戏手柄插件注销失败: {str(e)}")
 
 
+# 插件注册耗时（毫秒），显示在面板中
+registration_time_ms = 0.0
+
+
 def register():
     """插件注册入口点"""
+    global registration_time_ms
+    start = time.perf_counter()
     if not safe_register():
         # 如果注册失败，确保完全清理
         safe_unregister()
         return {'CANCELLED'}
+    registration_time_ms = (time.perf_counter() - start) * 1000.0
     return {'FINISHED'}
 
 
 def unregister():
     """插件注销入口点"""
+    reader_registry.stop_all()
     safe_unregister()
 
 
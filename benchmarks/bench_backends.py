@@ -0,0 +1,295 @@
+"""
+输入后端基准：无需手柄即可测量读取线程一侧的吞吐量和延迟。
+
+- replay: 把合成事件写成事件日志，用 ReplayBackend 不限速回放
+- evdev:  往管道里写入原始 struct input_event 记录，由 EvdevBackend 批量解包；
+          同时测量从写入（记录中的内核时间戳）到解码完成的延迟
+- reconnect: 反复删除/重建临时目录中的“设备节点”模拟拔插，测量节点出现到读取线程
+          重新发布第一帧的时间（inotify 通知 vs 退避轮询）
+- unplugged: inputs 的设备列表还在但 get_gamepad() 一直报 ENODEV，读取线程应按退避等待，
+          不能空转反复“重新连接”
+- teardown: 读取线程阻塞在 select / get_gamepad() 中时停止控制所需的时间，
+          以及反复开关控制后仍存活的读取线程数
+
+用法: python benchmarks/bench_backends.py [报告数]
+"""
+import errno
+import math
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+import types
+
+from blender_stubs import install_inputs, load_addon
+
+
+def synthetic_reports(addon, count, seed=1):
+    """生成 count 份报告：每份 2~4 个摇杆事件 + SYN_REPORT，时间间隔 1ms（1kHz 手柄）"""
+    rng = random.Random(seed)
+    axes = ('ABS_X', 'ABS_Y', 'ABS_RX', 'ABS_RY')
+    events = []
+    for i in range(count):
+        timestamp = i * 0.001
+        for code in rng.sample(axes, rng.randint(2, 4)):
+            events.append(addon.GamepadEvent('Absolute', code, rng.randint(-32768, 32767), timestamp))
+        events.append(addon.GamepadEvent('Sync', 'SYN_REPORT', 0, timestamp))
+    return events
+
+
+def drain(addon, backend):
+    """在当前线程中跑读取线程的解码/合并/发布循环，直到后端读完，返回事件数"""
+    thread = addon.GamepadThread(addon.GamepadStateBuffer(), backend)
+    backend.open()
+    thread.set_profile(backend.profile)
+    publish = thread.state_buffer.publish
+    total = 0
+    try:
+        while True:
+            events = backend.read(0.5)
+            if not events:
+                break
+            total += len(events)
+            if thread.process_events(events, events[-1].timestamp):
+                publish(thread._values)
+    except EOFError:
+        pass
+    finally:
+        backend.shutdown()
+    if thread.flush_pending(math.inf):
+        publish(thread._values)
+    return total, thread.coalescer
+
+
+def bench_replay(addon, events):
+    fd, path = tempfile.mkstemp(suffix='.gpadlog')
+    os.close(fd)
+    try:
+        addon.write_event_log(path, events)
+        start = time.perf_counter()
+        total, coalescer = drain(addon, addon.ReplayBackend(path, speed=0))
+        elapsed = time.perf_counter() - start
+    finally:
+        os.unlink(path)
+    print(f"replay  {total / elapsed / 1e6:6.2f} M events/s, published {coalescer.published_frames} frames")
+
+
+def bench_evdev(addon, events):
+    record = addon._INPUT_EVENT
+    read_fd, write_fd = os.pipe()
+    latencies = []
+
+    def writer():
+        # 每份报告以一次 write 写入，时间戳取写入时刻，模拟内核打时间戳
+        report = bytearray()
+        for event in events:
+            key = addon.EVDEV_CODE_NUMBERS[event.code]
+            now = time.time()
+            report += record.pack(int(now), int(now % 1 * 1e6), key >> 16, key & 0xffff, event.state)
+            if event.code == 'SYN_REPORT':
+                os.write(write_fd, report)
+                report.clear()
+        os.close(write_fd)
+
+    class TimedEvdev(addon.EvdevBackend):
+        def read(self, timeout=None):
+            try:
+                batch = super().read(timeout)
+            except OSError:
+                raise EOFError  # 写端关闭
+            now = time.time()
+            latencies.extend(now - event.timestamp for event in batch if event.code == 'SYN_REPORT')
+            return batch
+
+    producer = threading.Thread(target=writer)
+    start = time.perf_counter()
+    producer.start()
+    total, coalescer = drain(addon, TimedEvdev(fd=read_fd, batch=256))
+    elapsed = time.perf_counter() - start
+    producer.join()
+    os.close(read_fd)
+
+    latencies.sort()
+    p50 = latencies[len(latencies) // 2] * 1e6
+    p99 = latencies[int(len(latencies) * 0.99)] * 1e6
+    print(f"evdev   {total / elapsed / 1e6:6.2f} M events/s (incl. writer), "
+          f"write->decode latency p50 {p50:.0f} us, p99 {p99:.0f} us")
+
+
+def bench_reconnect(addon, cycles=20, notify=True):
+    directory = tempfile.mkdtemp()
+    node = os.path.join(directory, 'event0')
+    monitor = addon.DeviceMonitor((directory,))
+    if notify and not monitor.open():
+        os.rmdir(directory)
+        print("reconnect (inotify)  skipped: inotify unavailable")
+        return
+
+    class HotplugBackend(addon.InputBackend):
+        """节点存在时每 1ms 返回一份报告，节点被删除即视为断开"""
+        wall_clock = False
+
+        def __init__(self):
+            super().__init__()
+            self.value = 0
+
+        def open(self):
+            if not os.path.exists(node):
+                raise OSError(errno.ENODEV, "No gamepad found")
+
+        def read(self, timeout=None):
+            if not os.path.exists(node):
+                raise OSError(errno.ENODEV, "Gamepad disconnected")
+            time.sleep(0.001)
+            self.value = (self.value + 997) % 30000
+            return [addon.GamepadEvent('Absolute', 'ABS_X', self.value, 0.0),
+                    addon.GamepadEvent('Sync', 'SYN_REPORT', 0, 0.0)]
+
+        def wait_for_device(self, timeout):
+            if notify:
+                return monitor.wait(timeout)
+            return super().wait_for_device(timeout)
+
+    def until(condition, limit=5.0):
+        deadline = time.perf_counter() + limit
+        while not condition():
+            if time.perf_counter() > deadline:
+                raise RuntimeError("reconnect timed out")
+            time.sleep(0.0002)
+
+    open(node, 'w').close()
+    buffer = addon.GamepadStateBuffer()
+    thread = addon.GamepadThread(buffer, HotplugBackend())
+    thread.start()
+    samples = []
+    try:
+        until(lambda: thread.status == addon.LINK_CONNECTED)
+        for _ in range(cycles):
+            os.unlink(node)
+            until(lambda: thread.status == addon.LINK_WAITING)
+            time.sleep(0.2)  # 拔出一段时间，退避间隔已经变长
+            seq = buffer.seq
+            start = time.perf_counter()
+            open(node, 'w').close()
+            until(lambda: thread.status == addon.LINK_CONNECTED and buffer.seq > seq + 1)
+            samples.append(time.perf_counter() - start)
+    finally:
+        thread.stop()
+        thread.join()
+        monitor.close()
+        if os.path.exists(node):
+            os.unlink(node)
+        os.rmdir(directory)
+
+    samples.sort()
+    label = 'inotify' if notify else 'polling'
+    print(f"reconnect ({label})  plug->first frame p50 {samples[len(samples) // 2] * 1e3:6.1f} ms, "
+          f"max {samples[-1] * 1e3:6.1f} ms over {cycles} cycles, reconnects {thread.reconnects}")
+
+
+def check_unplugged(addon, seconds=0.5):
+    inputs = install_inputs(())
+    get_gamepad = inputs.get_gamepad
+    calls = []
+
+    def unplugged():
+        calls.append(time.perf_counter())
+        raise OSError(errno.ENODEV, "Gamepad disconnected")
+
+    inputs.get_gamepad = unplugged
+    inputs.DeviceManager = lambda: types.SimpleNamespace(gamepads=[types.SimpleNamespace(name='Stale Gamepad')])
+    buffer = addon.GamepadStateBuffer()
+    thread = addon.GamepadThread(buffer, addon.InputsBackend())
+    statuses = set()
+    threads = threading.active_count()
+    thread.start()
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        statuses.add(thread.status)
+        time.sleep(0.001)
+    thread.stop()
+    thread.join()
+    inputs.get_gamepad = get_gamepad
+    del inputs.DeviceManager
+    print(f"unplugged {seconds:g} s   get_gamepad calls {len(calls)}, reconnects {thread.reconnects}, "
+          f"frames {buffer.seq}, connected seen {addon.LINK_CONNECTED in statuses}, "
+          f"extra threads {threading.active_count() - threads}")
+
+
+def bench_teardown(addon, cycles=20):
+    registry = addon.reader_registry
+    baseline = threading.active_count()
+
+    def evdev_reader():
+        read_fd, write_fd = os.pipe()  # 没有任何写入，读取线程一直阻塞在 select 中
+        thread = addon.GamepadThread(addon.GamepadStateBuffer(), addon.EvdevBackend(fd=read_fd))
+        return thread, (read_fd, write_fd)
+
+    def inputs_reader():
+        return addon.GamepadThread(addon.GamepadStateBuffer(), addon.InputsBackend()), ()
+
+    inputs = install_inputs(())
+    inputs.block()  # get_gamepad() 一直阻塞，和没有输入的真实手柄一样
+    for label, make in (('evdev', evdev_reader), ('inputs', inputs_reader)):
+        samples = []
+        for _ in range(cycles):
+            thread, fds = make()
+            registry.start(thread)
+            time.sleep(0.005)
+            start = time.perf_counter()
+            registry.stop(thread)
+            samples.append(time.perf_counter() - start)
+            for fd in fds:
+                os.close(fd)
+        samples.sort()
+        print(f"teardown {label:<7} stop->exit p50 {samples[len(samples) // 2] * 1e3:6.2f} ms, "
+              f"max {samples[-1] * 1e3:6.2f} ms over {cycles} toggles")
+
+    # 只清除标志、不唤醒时（原来的做法），线程要等到读取超时才会退出
+    thread, fds = evdev_reader()
+    thread.start()
+    time.sleep(0.005)
+    start = time.perf_counter()
+    thread.running = False
+    thread.join()
+    print(f"teardown flag only  stop->exit {(time.perf_counter() - start) * 1e3:6.2f} ms (READ_TIMEOUT "
+          f"{addon.READ_TIMEOUT * 1e3:.0f} ms)")
+    for fd in fds:
+        os.close(fd)
+
+    # 不先停止旧线程就重复启动（交替切换后端）：注册表替换同一设备上的读取线程，
+    # 被替换的线程标记为 superseded，它们的操作器安静退出而不关闭新会话
+    threads = []
+    pipes = []
+    for i in range(cycles):
+        thread, fds = (evdev_reader if i % 2 else inputs_reader)()
+        registry.start(thread)
+        threads.append(thread)
+        pipes.extend(fds)
+    alive = registry.alive()
+    superseded = sum(thread.superseded for thread in threads)
+    registry.stop_all()
+    inputs.release()
+    for fd in pipes:
+        os.close(fd)
+    print(f"restart x{cycles} without stop (inputs/evdev alternating): {alive} reader alive, "
+          f"{superseded} superseded, {threading.active_count() - baseline} extra threads after stop_all "
+          f"(inputs pump is shared)")
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    addon = load_addon()
+    events = synthetic_reports(addon, count)
+    bench_replay(addon, events)
+    bench_evdev(addon, events)
+    bench_reconnect(addon, notify=True)
+    bench_reconnect(addon, notify=False)
+    check_unplugged(addon)
+    bench_teardown(addon)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,102 @@
+"""
+按键绑定分派的每周期开销：绑定编译成扁平分派表后，每个周期只按按键数查表，
+耗时应与绑定条数无关。另外检查 LB 层的切换和扳机虚拟按键的回差。
+
+用法: python benchmarks/bench_bindings.py [周期数]
+"""
+import sys
+import time
+import types
+
+from blender_stubs import load_addon, make_context
+
+
+def synthetic_bindings(addon, count):
+    """默认绑定之后循环补足到 count 条（重复的绑定会在同一槽位上叠加动作）"""
+    bindings = list(addon.DEFAULT_BINDINGS)
+    codes = addon.BUTTON_CODES
+    names = [name for name, action in addon.BINDING_ACTIONS.items() if not action.hold]
+    i = 0
+    while len(bindings) < count:
+        bindings.append(('BTN_SELECT' if i % 2 else 'BTN_START', codes[i % 11], names[i % len(names)]))
+        i += 1
+    return bindings
+
+
+def bench_dispatch(addon, operator, context, bindings, ticks):
+    table = addon.binding_table
+    start = time.perf_counter()
+    table.compile(bindings)
+    compile_ms = (time.perf_counter() - start) * 1e3
+    values = operator._state.values
+    presses = operator._presses
+    view = addon.BINDING_MODE_VIEW
+    start = time.perf_counter()
+    for tick in range(ticks):
+        # 每 8 个周期按一次十字键上，A 键一直按住
+        presses[addon.BUTTON_INDEX['DPAD_UP']] = tick % 8 == 0
+        layer = table.layer(values)
+        operator.dispatch_presses(context, view, layer)
+        operator.dispatch_holds(context, view, layer)
+    elapsed = time.perf_counter() - start
+    print(f"{len(bindings):5d} bindings  compile {compile_ms:7.2f} ms, "
+          f"dispatch {elapsed / ticks * 1e6:6.2f} us/tick")
+
+
+def check_layers(addon, operator, context):
+    """按住 LB 时十字键上切到底视图，松开后回到顶视图"""
+    import bpy
+    addon.binding_table.compile(addon.DEFAULT_BINDINGS)
+    values = operator._state.values
+    presses = operator._presses
+    up = addon.BUTTON_INDEX['DPAD_UP']
+    view_axis = bpy.ops.view3d.view_axis
+    calls = []
+    bpy.ops.view3d.view_axis = lambda **kwargs: calls.append(kwargs['type'])
+    try:
+        for held in (0.0, 1.0, 0.0):
+            values[addon.BUTTON_LEVEL_BASE + addon.BUTTON_INDEX['BTN_TL']] = held
+            presses[up] = 1
+            operator.dispatch_presses(context, addon.BINDING_MODE_VIEW, addon.binding_table.layer(values))
+    finally:
+        bpy.ops.view3d.view_axis = view_axis
+        values[addon.BUTTON_LEVEL_BASE + addon.BUTTON_INDEX['BTN_TL']] = 0.0
+        presses[up] = 0
+    print(f"DPAD_UP without / with / without LB: {calls}")
+
+
+def check_triggers(addon):
+    """扳机在 0.6 处按下、0.4 处松开，中间来回抖动不产生新的边沿"""
+    values = [0.0] * addon.FRAME_SIZE
+    ring = addon.ButtonEdgeRing()
+    for travel in (0.3, 0.65, 0.55, 0.45, 0.62, 0.35, 0.5, 0.7):
+        values[addon.AXIS_RIGHT_TRIGGER] = travel
+        addon._update_trigger_buttons(values, ring, travel)
+    edges = []
+    while True:
+        edge = ring.pop()
+        if not edge:
+            break
+        edges.append(('press' if edge > 0 else 'release', ring.popped_time))
+    print(f"right trigger edges: {edges}")
+
+
+def main():
+    ticks = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    addon = load_addon()
+    context = make_context(addon, 'VIEW')
+    operator = addon.GAMEPAD_OT_control()
+    operator.execute(context)
+    operator._settings = context.scene.gamepad_settings
+    operator._motion.button_gain = 1.0
+    operator._state.values[addon.BUTTON_LEVEL_BASE + addon.BUTTON_INDEX['BTN_SOUTH']] = 1.0
+    for count in (len(addon.DEFAULT_BINDINGS), 200, 2000):
+        bench_dispatch(addon, operator, context, synthetic_bindings(addon, count), ticks)
+    operator._state.values[addon.BUTTON_LEVEL_BASE + addon.BUTTON_INDEX['BTN_SOUTH']] = 0.0
+    check_layers(addon, operator, context)
+    check_triggers(addon)
+    operator.cancel(context)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,65 @@
+"""
+摇杆在线校准的离线模拟（模拟时钟，不需要手柄）：
+1. 漂移：松开的摇杆停在偏离中心 3% 处并带少量噪声，或停在 6% / 12% 处不再产生事件（只有读取超时），
+   中心应收敛到漂移位置
+2. 有意推杆：推在静止带外的 20%，或手指轻推带抖动，输出应保持不变，中心不应被拉过去
+3. 同一设备配置的两个手柄按各自的设备名保存校准结果
+
+用法: python benchmarks/bench_calibration.py [模拟秒数]
+"""
+import random
+import sys
+
+from blender_stubs import load_addon
+
+
+def simulate(addon, seconds, position, noise, event_rate, calibrator=None, device=None):
+    """返回 (各时刻左摇杆 X 的换算输出, 最终中心占量程的比例)"""
+    decoder = addon.EventDecoder()
+    coalescer = addon.EventCoalescer(decoder)
+    calibrator = calibrator or addon.AxisCalibrator()
+    calibrator.bind(decoder, coalescer, device)
+    full = addon.DEFAULT_PROFILE.axis_ranges['ABS_X']
+    raw = [0] * addon.AXIS_COUNT
+    rng = random.Random(1)
+    samples = {}
+    now = 0.0
+    step = 1.0 / event_rate if event_rate else addon.READ_TIMEOUT
+    marks = [t for t in (2.0, 5.0, seconds) if t <= seconds]
+    while now < seconds:
+        now += step
+        raw[addon.AXIS_LEFT_X] = int(full * (position + rng.gauss(0.0, noise)))
+        calibrator.observe(raw, now)
+        while marks and now >= marks[0]:
+            output = (raw[addon.AXIS_LEFT_X] - decoder.axis_offsets[0]) * decoder.axis_scales[0]
+            samples[marks.pop(0)] = output
+    return samples, calibrator.centres[addon.AXIS_LEFT_X] / full
+
+
+def main():
+    seconds = float(sys.argv[1]) if len(sys.argv) > 1 else 10.0
+    addon = load_addon()
+    cases = (
+        ('released, 3% drift', 0.03, 0.001, 250.0),
+        ('resting 6%, timeouts only', 0.06, 0.0, 0.0),
+        ('resting 12%, timeouts only', 0.12, 0.0, 0.0),
+        ('held 20%, timeouts only', 0.20, 0.0, 0.0),
+        ('held 5%, finger jitter', 0.05, 0.01, 250.0),
+        ('held 20%, finger jitter', 0.20, 0.01, 250.0),
+    )
+    for name, position, noise, rate in cases:
+        samples, centre = simulate(addon, seconds, position, noise, rate)
+        trace = " -> ".join(f"{value:.3f} ({t:g} s)" for t, value in sorted(samples.items()))
+        print(f"{name:<28} output {trace}, centre {centre:.3f}")
+
+    calibrator = addon.AxisCalibrator()
+    for device, position in (('Pad A', 0.06), ('Pad B', 0.0)):
+        simulate(addon, seconds, position, 0.0, 0.0, calibrator, device)
+        calibrator.remember()
+    full = addon.DEFAULT_PROFILE.axis_ranges['ABS_X']
+    centres = ", ".join(f"{device} {saved['ABS_X'][0] / full:.3f}" for device, saved in sorted(calibrator.profiles.items()))
+    print(f"two pads, same profile       saved centres: {centres}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,246 @@
+"""
+事件解码微基准：对比旧的 if/elif 字符串比较链与表驱动解码（只解码）、
+解码 + 轴事件合并 + 发布窗口的吞吐量，以及加上摇杆径向死区/响应曲线查表整形（默认设置）之后的吞吐量。
+
+模拟 1000Hz 回报率的手柄（每份报告 2~4 个不同的轴，每个轴一个值），按报告的时间戳重现
+读取线程的节奏：发布一帧后暂停到发布窗口（PUBLISH_INTERVAL）结束，再一次取出积压的全部批次
+（与 InputsBackend.read() 一样拼接成一个列表）解码并发布；空闲时收到的第一份报告立即处理。
+旧版本每个事件直接写入全局状态、不发布快照，因此基线只包含解码本身。
+
+最后测量拖动死区/曲线设置时每次重建一张摇杆响应查找表的耗时（numpy 与纯 Python 实现）。
+
+用法: python benchmarks/bench_decoder.py [事件数]
+
+分两种批次形态测量：一次 get_gamepad() 返回整份报告（Windows/XInput），
+以及一次只返回一个事件（Linux 上 inputs 的行为，报告跨越多次调用）。
+"""
+import math
+import random
+import sys
+import time
+
+from blender_stubs import load_addon, make_settings
+
+
+class Event:
+    __slots__ = ('ev_type', 'code', 'state', 'timestamp')
+
+    def __init__(self, ev_type, code, state, timestamp=0.0):
+        self.ev_type = ev_type
+        self.code = code
+        self.state = state
+        self.timestamp = timestamp
+
+
+REPORT_RATE = 1000.0
+
+
+def synthetic_batches(count, seed=1, split=False):
+    """生成以摇杆噪声为主的事件批次（每份报告 2~4 个不同轴的事件 + 同步事件，间隔 1ms）"""
+    rng = random.Random(seed)
+    axes = ('ABS_X', 'ABS_Y', 'ABS_RX', 'ABS_RY')
+    batches = []
+    produced = 0
+    reports = 0
+    while produced < count:
+        timestamp = reports / REPORT_RATE
+        reports += 1
+        batch = [Event('Absolute', code, rng.randint(-32768, 32767), timestamp)
+                 for code in rng.sample(axes, rng.randint(2, 4))]
+        if rng.random() < 0.02:
+            batch.append(Event('Key', 'BTN_SOUTH', rng.randint(0, 1), timestamp))
+        batch.append(Event('Sync', 'SYN_REPORT', 0, timestamp))
+        produced += len(batch)
+        if split:
+            batches.extend([event] for event in batch)
+        else:
+            batches.append(batch)
+    return batches, produced
+
+
+class LegacyState:
+    def __init__(self):
+        self.left_stick_x = 0.0
+        self.left_stick_y = 0.0
+        self.right_stick_x = 0.0
+        self.right_stick_y = 0.0
+        self.buttons = {}
+        self.button_states = {}
+        self.dpad_up = 0
+        self.dpad_down = 0
+        self.dpad_left = 0
+        self.dpad_right = 0
+
+
+gamepad_state = LegacyState()
+
+
+class LegacyThread:
+    """1.1 版本 GamepadThread 的事件处理部分原样拷贝，作为基线"""
+
+    def __init__(self):
+        self.running = True
+
+    def run_batch(self, events):
+        for event in events:
+            if self.running:  # 检查是否仍在运行
+                self.process_event(event)
+
+    def process_event(self, event):
+        """处理手柄事件"""
+        if event.code == 'ABS_X':
+            gamepad_state.left_stick_x = event.state / 32768.0
+        elif event.code == 'ABS_Y':
+            gamepad_state.left_stick_y = event.state / 32768.0
+        elif event.code == 'ABS_RX':
+            gamepad_state.right_stick_x = event.state / 32768.0
+        elif event.code == 'ABS_RY':
+            gamepad_state.right_stick_y = event.state / 32768.0
+        elif event.code == 'ABS_HAT0Y':
+            if event.state == -1:
+                gamepad_state.dpad_up = 1
+                gamepad_state.dpad_down = 0
+            elif event.state == 1:
+                gamepad_state.dpad_down = 1
+                gamepad_state.dpad_up = 0
+            else:
+                gamepad_state.dpad_up = 0
+                gamepad_state.dpad_down = 0
+        elif event.code == 'ABS_HAT0X':
+            if event.state == -1:
+                gamepad_state.dpad_left = 1
+                gamepad_state.dpad_right = 0
+            elif event.state == 1:
+                gamepad_state.dpad_right = 1
+                gamepad_state.dpad_left = 0
+            else:
+                gamepad_state.dpad_left = 0
+                gamepad_state.dpad_right = 0
+        elif event.code.startswith('BTN_'):
+            gamepad_state.buttons[event.code] = event.state
+            gamepad_state.button_states[event.code] = event.state
+
+
+REPEAT = 7
+
+
+def bench(cases, batches, total, repeat):
+    """各实现轮流运行 repeat 轮、取各自最好成绩，机器负载的起伏对所有实现的影响相同"""
+    best = [float('inf')] * len(cases)
+    for _ in range(repeat):
+        for i, (label, fn) in enumerate(cases):
+            start = time.perf_counter()
+            fn(batches)
+            best[i] = min(best[i], time.perf_counter() - start)
+    return [total / seconds for seconds in best]
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    addon = load_addon()
+
+    for split in (False, True):
+        batches, total = synthetic_batches(count, split=split)
+        print('one event per get_gamepad() call' if split else 'one report per get_gamepad() call')
+
+        legacy = LegacyThread()
+
+        def run_legacy(batches):
+            for batch in batches:
+                legacy.run_batch(batch)
+
+        def reader_reads(response):
+            """
+            按报告时间戳重现读取线程每次 read() 取出的批次：发布后暂停到窗口结束，再取出积压的全部批次；
+            空闲时收到的第一份报告立即处理。只与时间有关，在计时之外用一个读取线程预先演算
+            """
+            thread = addon.GamepadThread(addon.GamepadStateBuffer())
+            thread.coalescer.response = response
+            reads = []
+            queued = []
+            for batch in batches:
+                now = batch[-1].timestamp
+                if queued and now >= thread._next_publish:
+                    reads.append((thread._next_publish, queued))
+                    thread.process_events([event for queued_batch in queued for event in queued_batch],
+                                          thread._next_publish)
+                    queued = []
+                if now >= thread._next_publish and not queued:
+                    reads.append((now, [batch]))
+                    thread.process_events(batch, now)
+                else:
+                    queued.append(batch)
+            return reads
+
+        def runner(thread, reads):
+            def run_reads(batches):
+                process_events = thread.process_events
+                publish = thread.state_buffer.publish
+                values = thread._values
+                thread._next_publish = -math.inf  # 每轮重复从模拟时间 0 开始
+                for now, queued in reads:
+                    events = []
+                    for batch in queued:  # InputsBackend.read() 拼接队列中积压的批次
+                        events += batch
+                    if process_events(events, now):
+                        publish(values)
+            return run_reads
+
+        decoder = addon.EventDecoder()
+        raw_axes = [0] * addon.AXIS_COUNT
+        frame = [0.0] * addon.FRAME_SIZE
+        edges = addon.ButtonEdgeRing()
+
+        def run_decoder(batches):
+            decode_batch = decoder.decode_batch
+            for batch in batches:
+                decode_batch(batch, raw_axes, frame, edges)
+            edges.clear()
+
+        cases = [('  legacy if/elif', run_legacy), ('  table decode only', run_decoder)]
+        threads = []
+        shaped = addon.StickResponse()
+        shaped.configure(make_settings(addon))
+        for label, response in (('  table + coalescing', addon.StickResponse()),
+                                ('  + stick response LUT', shaped)):
+            thread = addon.GamepadThread(addon.GamepadStateBuffer())
+            thread.coalescer.response = response
+            reads = reader_reads(response)
+            threads.append((thread, reads))
+            cases.append((label, runner(thread, reads)))
+        rates = bench(cases, batches, total, REPEAT)
+        base = rates[0]
+        seconds = batches[-1][-1].timestamp
+        for (label, _), rate in zip(cases, rates):
+            print(f"{label:<28}{rate / 1e6:8.2f} M events/s" + (f"  ({rate / base:.2f}x legacy)" if rate is not base else ''))
+        print(f"  legacy reader wakeups: {len(batches) / seconds:.0f}/s (one per get_gamepad() call)")
+        for thread, reads in threads:
+            coalescer = thread.coalescer
+            print(f"  reader wakeups: {len(reads) / seconds:.0f}/s, raw/delivered events: "
+                  f"{coalescer.raw_events}/{coalescer.delivered_events} "
+                  f"({coalescer.coalesce_ratio:.2f}x), published frames: "
+                  f"{coalescer.published_frames / seconds / REPEAT:.0f}/s for {REPORT_RATE:.0f} reports/s")
+
+    bench_response_tables(addon)
+
+
+def bench_response_tables(addon):
+    """每次设置更新（拖动滑块时连续触发）重建一张查找表的耗时"""
+    numpy = addon.np
+    print('response table rebuild per settings update')
+    for curve in addon.RESPONSE_CURVES:
+        timings = []
+        for module in (numpy, None):
+            addon.np = module
+            best = float('inf')
+            for _ in range(REPEAT):
+                start = time.perf_counter()
+                addon.build_response_table(0.1, 0.05, curve, 2.0, (0.2, 0.5, 0.8))
+                best = min(best, time.perf_counter() - start)
+            timings.append(best)
+        addon.np = numpy
+        fast = f"{timings[0] * 1e3:6.2f} ms" if numpy is not None else '   n/a   '
+        print(f"  {curve:<10} numpy {fast}, pure Python {timings[1] * 1e3:6.2f} ms")
+
+if __name__ == '__main__':
+    main()
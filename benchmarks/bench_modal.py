@@ -0,0 +1,213 @@
+"""
+模态周期基准：无需 Blender、显示器和手柄，测量读取线程和 GAMEPAD_OT_control.modal 的开销。
+
+1. 读取线程：事件流经 inputs 替身进入真实的 GamepadThread.run() 循环（解码、合并、发布）
+2. 模态周期：在视角模式、物体模式和批量变换选中物体模式（需要 NumPy）下各运行 N 个计时器周期，每个周期之前把一段事件
+   （默认 16 份报告，相当于 1kHz 手柄对 60Hz 计时器）解码并发布到操作器的快照缓冲。
+   批量变换另测一个大场景中只选中少数物体的情形，并统计未选中物体被写入的次数（应为 0）
+
+输出 ticks/s、events/s，以及每周期的内存分配（tracemalloc 统计的临时峰值和净增内存块）。
+事件流默认为合成的摇杆扫动 + 按键，也可以用 --log 指定 write_event_log() 录制的日志。
+--session 指定插件录制的会话日志时，改为按日志中的周期不限速回放（确定性，可重复对比）。
+
+用法: python benchmarks/bench_modal.py [--ticks N] [--log 事件日志] [--session 会话日志] [--movement 移动方式]
+"""
+import argparse
+import math
+import sys
+import time
+import tracemalloc
+import types
+
+from blender_stubs import install_inputs, load_addon, make_context
+
+
+def synthetic_reports(addon, count):
+    """摇杆沿正弦曲线扫动，穿插静止段和按键（每 1ms 一份报告）"""
+    Event = addon.GamepadEvent
+    reports = []
+    for i in range(count):
+        t = i * 0.001
+        report = []
+        # 每 4 秒中有 1 秒摇杆回中，用于覆盖空闲分支
+        if (t % 4.0) < 3.0:
+            report.append(Event('Absolute', 'ABS_X', int(20000 * math.sin(t * 2.0)), t))
+            report.append(Event('Absolute', 'ABS_Y', int(20000 * math.cos(t * 1.3)), t))
+            report.append(Event('Absolute', 'ABS_RX', int(15000 * math.sin(t * 0.7)), t))
+        else:
+            report.append(Event('Absolute', 'ABS_X', 0, t))
+            report.append(Event('Absolute', 'ABS_Y', 0, t))
+            report.append(Event('Absolute', 'ABS_RX', 0, t))
+        if i % 500 == 0:
+            report.append(Event('Key', 'BTN_SOUTH', (i // 500) % 2, t))
+        report.append(Event('Sync', 'SYN_REPORT', 0, t))
+        reports.append(report)
+    return reports
+
+
+def recorded_reports(addon, path):
+    """按报告切分录制的事件日志"""
+    backend = addon.ReplayBackend(path, speed=0)
+    backend.open()
+    reports = []
+    try:
+        while True:
+            reports.append(backend.read())
+    except EOFError:
+        pass
+    finally:
+        backend.close()
+    return reports
+
+
+def bench_thread(addon, reports):
+    install_inputs(reports)
+    events = sum(len(report) for report in reports)
+    thread = addon.GamepadThread(addon.GamepadStateBuffer(), addon.InputsBackend())
+    start = time.perf_counter()
+    thread.start()
+    thread.join()
+    elapsed = time.perf_counter() - start
+    print(f"reader thread      {events / elapsed / 1e6:6.2f} M events/s "
+          f"({thread.coalescer.published_frames} frames published, finished={thread.finished})")
+
+
+class SimClock:
+    """模拟 60Hz 计时器的时钟，使运动积分结果与机器速度无关"""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def bench_modal(addon, reports, mode, ticks, per_tick, objects=1, movement='VIEW', selected=None, **settings):
+    inputs = install_inputs(())
+    inputs.block()  # 操作器自己的读取线程保持阻塞，事件由下面的 feeder 在主线程中送入
+    context = make_context(addon, mode, objects, selected, input_backend='INPUTS', movement_model=movement,
+                           **settings)
+    for item in addon.bpy.data.objects:
+        item.rna_writes = 0  # 只统计周期中的写入
+    operator = addon.GAMEPAD_OT_control()
+    operator.execute(context)
+    clock = SimClock()
+    operator._motion.clock = clock
+    feeder = addon.GamepadThread(operator._buffer, addon.InputsBackend())
+    timer = types.SimpleNamespace(type='TIMER')
+
+    def publish():
+        feeder._values[addon.FRAME_PUBLISH_TIME] = time.perf_counter()
+        operator._buffer.publish(feeder._values)
+
+    def run(count, offset, trace=False):
+        feed_time = modal_time = 0.0
+        events = 0
+        peaks = 0
+        for tick in range(count):
+            start = time.perf_counter()
+            base = ((offset + tick) * per_tick) % len(reports)
+            for i, report in enumerate(reports[base:base + per_tick]):
+                events += len(report)
+                # 报告均匀分布在周期内，发布窗口按模拟时间判断
+                if feeder.process_events(report, clock.now + i / (per_tick * 60.0)):
+                    publish()
+            clock.now += 1.0 / 60.0
+            # 读取线程在发布窗口结束时发布推迟的报告，早于下一个计时器周期
+            if feeder.flush_pending(clock.now):
+                publish()
+            middle = time.perf_counter()
+            if trace:
+                tracemalloc.reset_peak()
+                before = tracemalloc.get_traced_memory()[0]
+            result = operator.modal(context, timer)
+            if trace:
+                peaks += tracemalloc.get_traced_memory()[1] - before
+            modal_time += time.perf_counter() - middle
+            feed_time += middle - start
+            if 'CANCELLED' in result:
+                raise RuntimeError("modal cancelled")
+        return feed_time, modal_time, events, peaks
+
+    run(min(ticks, 200), 0)  # 预热
+    settings = context.scene.gamepad_settings
+    reads = settings.rna_reads
+    blocks = sys.getallocatedblocks()
+    feed_time, modal_time, events, _ = run(ticks, 200)
+    retained = (sys.getallocatedblocks() - blocks) / ticks
+    reads = (settings.rna_reads - reads) / ticks
+
+    tracemalloc.start()
+    _, _, _, peaks = run(min(ticks, 2000), 200 + ticks, trace=True)
+    tracemalloc.stop()
+    transient = peaks / min(ticks, 2000)
+
+    inputs.release()
+    operator.cancel(context)
+
+    obj = context.active_object
+    if selected is not None:
+        mode = f"{mode} {selected}/{objects}"
+        untouched = sum(item.rna_writes for item in addon.bpy.data.objects if not item.selected)
+        print(f"selection {selected} of {objects} objects: unselected objects written {untouched} times")
+    print(f"modal {mode:<9}    {ticks / modal_time:9.0f} ticks/s, "
+          f"{events / feed_time / 1e6:5.2f} M events/s fed, "
+          f"{transient / 1024:6.2f} KiB transient/tick, {retained:+.2f} blocks retained/tick")
+    print(f"                   redraws {context.area.tag_redraw.calls}, "
+          f"skipped {addon.runtime_status.skipped_ticks}, "
+          f"keyframes {obj.keyframes_inserted if obj else 0}, "
+          f"settings reads {reads:.1f}/tick")
+
+
+def bench_session(addon, path, mode, movement='VIEW'):
+    """不限速回放会话日志：周期数和运动结果只取决于日志内容"""
+    context = make_context(addon, mode, movement_model=movement)
+    operator = addon.GAMEPAD_OT_control()
+    operator.replay_path = path
+    operator.replay_speed = 0.0
+    operator.execute(context)
+    timer = types.SimpleNamespace(type='TIMER')
+    start = time.perf_counter()
+    operator.modal(context, timer)
+    elapsed = time.perf_counter() - start
+    ticks = addon.runtime_status.ticks
+    obj = context.active_object
+    result = obj.location if obj else context.space_data.region_3d.view_location
+    print(f"session {mode:<6}     {ticks / elapsed:9.0f} ticks/s over {ticks} recorded ticks, "
+          f"final position {tuple(round(v, 6) for v in result)}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--ticks', type=int, default=5000, help="每种模式运行的计时器周期数")
+    parser.add_argument('--per-tick', type=int, default=16, help="每个周期送入的报告数")
+    parser.add_argument('--log', help="write_event_log() 录制的事件日志，默认使用合成事件")
+    parser.add_argument('--session', help="插件录制的会话日志（.gpadlog），按录制的周期回放")
+    parser.add_argument('--movement', default='VIEW', help="物体移动方式（VIEW / WALK）")
+    parser.add_argument('--objects', type=int, default=200, help="批量变换模式下选中的物体数")
+    args = parser.parse_args()
+
+    addon = load_addon()
+    if args.session:
+        for mode in ('VIEW', 'OBJECT'):
+            bench_session(addon, args.session, mode, args.movement)
+        return
+    if args.log:
+        reports = recorded_reports(addon, args.log)
+    else:
+        reports = synthetic_reports(addon, 20000)
+    print(f"movement {args.movement}: {len(reports)} reports, "
+          f"{sum(len(r) for r in reports)} events")
+
+    bench_thread(addon, reports)
+    for mode in ('VIEW', 'OBJECT'):
+        bench_modal(addon, reports, mode, args.ticks, args.per_tick, movement=args.movement)
+    if addon.np is not None:
+        # 替身的 foreach_get/foreach_set 是逐元素的 Python 循环，这里只反映 NumPy 一侧的开销变化
+        bench_modal(addon, reports, 'SELECTION', args.ticks, args.per_tick, args.objects, args.movement)
+        bench_modal(addon, reports, 'SELECTION', args.ticks, args.per_tick, args.objects * 10, args.movement,
+                    selected=args.objects // 10)
+
+
+if __name__ == '__main__':
+    main()
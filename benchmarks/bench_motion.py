@@ -0,0 +1,95 @@
+"""
+与帧率无关的运动：模拟时钟驱动完整的模态周期（快照 -> 运动积分 -> 视角平移 -> 计时器调度），
+不需要 Blender 和手柄。
+
+1. 左摇杆推到一半持续 2 秒，计时器分别为 60Hz 和 20Hz，视角平移的速度应相同
+2. 空闲降频（默认 10Hz）后推杆：第一个周期的位移不应因积分了整个空闲间隔而跳跃，
+   并覆盖最低的 1Hz 空闲频率
+
+用法: python benchmarks/bench_motion.py
+"""
+import types
+
+from blender_stubs import install_inputs, load_addon, make_context
+
+
+class SimClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def start(addon, **settings):
+    inputs = install_inputs(())
+    inputs.block()  # 读取线程保持阻塞，快照直接写入缓冲
+    context = make_context(addon, 'VIEW', input_backend='INPUTS', **settings)
+    operator = addon.GAMEPAD_OT_control()
+    operator.execute(context)
+    clock = SimClock()
+    operator._motion.clock = clock
+    operator._scheduler.clock = clock
+    operator._scheduler._last_active = 0.0
+    frame = [0.0] * addon.FRAME_SIZE
+
+    def stop():
+        inputs.release()
+        operator.cancel(context)
+
+    return context, operator, clock, frame, stop
+
+
+def push(addon, operator, frame, x):
+    frame[addon.AXIS_LEFT_X] = x
+    operator._buffer.publish(frame)
+
+
+def run_ticks(addon, context, operator, clock, seconds, interval=None):
+    """按调度器给出的间隔（或固定的 interval）运行模态周期，返回每个周期的平移距离"""
+    timer = types.SimpleNamespace(type='TIMER')
+    view3d = context.space_data.region_3d
+    steps = []
+    end = clock.now + seconds
+    while clock.now < end - 1e-9:
+        clock.now += interval or operator._scheduler.interval
+        before = view3d.view_location
+        operator.modal(context, timer)
+        steps.append((view3d.view_location - before).length)
+    return steps
+
+
+def check_rates(addon):
+    # 第一个周期没有上一周期可比，按参考帧率积分，速度从第二个周期算起
+    print("left stick at 50% for 2 s:")
+    for rate in (60.0, 20.0):
+        context, operator, clock, frame, stop = start(addon)
+        push(addon, operator, frame, 0.5)
+        steps = run_ticks(addon, context, operator, clock, 2.0, 1.0 / rate)
+        stop()
+        speed = sum(steps[1:]) / ((len(steps) - 1) / rate)
+        print(f"  {rate:4.0f} Hz  {len(steps):4d} ticks, distance {sum(steps):.4f}, {speed:.4f} units/s")
+
+
+def check_idle_resume(addon):
+    print("first ticks after pushing the stick from idle (distance per tick, 60 Hz tick = 1.00):")
+    for idle_rate in (10.0, 1.0):
+        context, operator, clock, frame, stop = start(addon, idle_tick_rate=idle_rate)
+        run_ticks(addon, context, operator, clock, 3.0)
+        idle_hz = operator._scheduler.rate
+        push(addon, operator, frame, 0.5)
+        steps = run_ticks(addon, context, operator, clock, 0.05 + 1.0 / idle_rate)
+        stop()
+        unit = 0.5 * context.scene.gamepad_settings.pan_speed
+        trace = ", ".join(f"{step / unit:.2f}" for step in steps[:4])
+        print(f"  idle at {idle_hz:4.1f} Hz  {trace}")
+
+
+def main():
+    addon = load_addon()
+    check_rates(addon)
+    check_idle_resume(addon)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,145 @@
+"""
+视角环绕的每周期开销：对比 1.1 版本的欧拉角往返（to_euler -> 改 x/z -> to_quaternion）
+与 ViewOrbit 的四元数增量（转台 / 轨迹球，视图中心 / 固定环绕中心）。
+
+1. 转台方式与欧拉角写法的结果一致（两极之外）
+2. 俯仰连续越过两极时每周期的旋转角是否均匀
+3. 每周期耗时和 tracemalloc 统计的临时内存峰值
+4. 环绕中心在视图坐标系中保持不动
+5. 完整模态周期中环绕中心（选中物体包围盒中心）只在手势开始时计算
+
+用法: python benchmarks/bench_orbit.py [周期数]
+"""
+import math
+import sys
+import time
+import tracemalloc
+
+import bench_modal
+from blender_stubs import FakeRegion3D, Quaternion, Vector, load_addon
+
+
+def legacy_orbit(view3d, yaw, pitch):
+    """1.1 版本视角模式下右摇杆的写法"""
+    euler = view3d.view_rotation.to_euler()
+    euler.z += yaw
+    euler.x += pitch
+    view3d.view_rotation = euler.to_quaternion()
+
+
+def angle_between(a, b):
+    dot = abs(a.w * b.w + a.x * b.x + a.y * b.y + a.z * b.z)
+    return 2.0 * math.acos(min(1.0, dot))
+
+
+def check_equivalence(addon, ticks):
+    legacy = FakeRegion3D()
+    view3d = FakeRegion3D()
+    orbit = addon.ViewOrbit()
+    for view in (legacy, view3d):
+        view.view_rotation = Quaternion((1.0, 0.3, 0.0, 0.2)).normalized()
+    drift = 0.0
+    for tick in range(ticks):
+        yaw = 0.02 * math.sin(tick * 0.01)
+        pitch = 0.01 * math.sin(tick * 0.003)  # 俯仰在 ±约 3.3 rad 内往返，不越过两极
+        legacy_orbit(legacy, yaw, pitch)
+        orbit.orbit(view3d, 'TURNTABLE', yaw, pitch)
+        drift = max(drift, angle_between(legacy.view_rotation, view3d.view_rotation))
+    print(f"turntable vs Euler round trip: max difference {drift:.2e} rad over {ticks} ticks")
+
+
+def check_poles(addon):
+    """每周期俯仰 0.02 rad 并转向 0.01 rad，连续绕过两极两圈"""
+    step = math.hypot(0.02, 0.01)
+    for name, run in (('Euler round trip', lambda v, y, p: legacy_orbit(v, y, p)),
+                      ('turntable', lambda v, y, p, o=addon.ViewOrbit(): o.orbit(v, 'TURNTABLE', y, p)),
+                      ('trackball', lambda v, y, p, o=addon.ViewOrbit(): o.orbit(v, 'TRACKBALL', y, p))):
+        view3d = FakeRegion3D()
+        previous = view3d.view_rotation
+        worst = 0.0
+        for _ in range(int(4 * math.pi / 0.02)):
+            run(view3d, 0.01, 0.02)
+            current = view3d.view_rotation
+            worst = max(worst, angle_between(previous, current))
+            previous = current
+        print(f"through the poles  {name:<17} largest per-tick rotation {worst:.4f} rad "
+              f"(at most {step:.4f} expected)")
+
+
+def bench_cost(addon, ticks):
+    orbit = addon.ViewOrbit()
+    pivot = addon.ViewOrbit()
+    pivot.pivot = (3.0, 1.0, 0.5)
+    pivot.stale = False
+    cases = (
+        ('Euler round trip', lambda v: legacy_orbit(v, 0.01, 0.005)),
+        ('turntable', lambda v: orbit.orbit(v, 'TURNTABLE', 0.01, 0.005)),
+        ('trackball', lambda v: orbit.orbit(v, 'TRACKBALL', 0.01, 0.005)),
+        ('turntable + pivot', lambda v: pivot.orbit(v, 'TURNTABLE', 0.01, 0.005)),
+    )
+    for name, step in cases:
+        view3d = FakeRegion3D()
+        start = time.perf_counter()
+        for _ in range(ticks):
+            step(view3d)
+        elapsed = time.perf_counter() - start
+        tracemalloc.start()
+        peaks = 0
+        for _ in range(1000):
+            tracemalloc.reset_peak()
+            before = tracemalloc.get_traced_memory()[0]
+            step(view3d)
+            peaks += tracemalloc.get_traced_memory()[1] - before
+        tracemalloc.stop()
+        print(f"{name:<18} {elapsed / ticks * 1e6:6.2f} us/tick, {peaks / 1000:6.0f} B transient/tick")
+
+
+def check_pivot(addon, ticks):
+    """环绕中心在视图坐标系中的位置 = 旋转的共轭 · (中心 - 视图中心)，应保持不变"""
+    pivot = (3.0, 1.0, 0.5)
+    for mode in ('TURNTABLE', 'TRACKBALL'):
+        view3d = FakeRegion3D()
+        orbit = addon.ViewOrbit()
+        orbit.pivot = pivot
+        orbit.stale = False
+
+        def view_space():
+            return view3d.view_rotation.conjugated() @ (Vector(pivot) - view3d.view_location)
+
+        start = view_space()
+        worst = 0.0
+        for tick in range(ticks):
+            orbit.orbit(view3d, mode, 0.02 * math.sin(tick * 0.01), 0.015)
+            worst = max(worst, (view_space() - start).length)
+        print(f"pivot drift in view space ({mode.lower()}): {worst:.2e}")
+
+
+def bench_gestures(addon, ticks):
+    calls = [0]
+    centroid = addon.selection_centroid
+
+    def counted(context):
+        calls[0] += 1
+        return centroid(context)
+
+    addon.selection_centroid = counted
+    try:
+        reports = bench_modal.synthetic_reports(addon, 20000)
+        bench_modal.bench_modal(addon, reports, 'VIEW', ticks, 16, orbit_pivot='SELECTION', orbit_mode='TRACKBALL')
+    finally:
+        addon.selection_centroid = centroid
+    print(f"                   pivot computed {calls[0]} times")
+
+
+def main():
+    ticks = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    addon = load_addon()
+    check_equivalence(addon, min(ticks, 5000))
+    check_poles(addon)
+    bench_cost(addon, ticks)
+    check_pivot(addon, min(ticks, 5000))
+    bench_gestures(addon, min(ticks, 5000))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,92 @@
+"""
+关键帧精简基准：在合成的手柄录制曲线上运行 simplify_keys，输出精简前后的关键帧数、
+最大误差和耗时。需要 numpy。
+同时运行无 numpy 时 reduce_keys 使用的纯 Python 实现，误差同样不应超过 tolerance。
+最后在按 Bezier 求值的 F 曲线替身上运行 simplify_fcurve：实际曲线在原关键帧处的误差不应超过 tolerance，
+保留下来的关键帧的其余属性（关键帧类型、选择状态等）应与原关键帧一致。
+
+用法: python benchmarks/bench_simplify.py [秒数] [误差]
+"""
+import sys
+import time
+
+import numpy as np
+
+from blender_stubs import FakeFCurve, load_addon
+
+
+def synthetic_take(seconds, rate=60, seed=1):
+    """模拟摇杆驱动的 location.x：匀速段、停顿、带噪声的缓慢转向"""
+    rng = np.random.default_rng(seed)
+    frames = np.arange(seconds * rate, dtype=np.float64)
+    velocity = np.repeat(rng.uniform(-0.2, 0.2, len(frames) // 90 + 1), 90)[:len(frames)]
+    velocity[rng.random(len(frames)) < 0.2] = 0.0
+    values = np.cumsum(velocity) + rng.normal(0.0, 1e-4, len(frames))
+    return frames, values
+
+
+def main():
+    seconds = int(sys.argv[1]) if len(sys.argv) > 1 else 30
+    tolerance = float(sys.argv[2]) if len(sys.argv) > 2 else 0.001
+    addon = load_addon()
+    frames, values = synthetic_take(seconds)
+
+    start = time.perf_counter()
+    keep = addon.simplify_keys(frames, values, tolerance)
+    elapsed = time.perf_counter() - start
+
+    kept = np.flatnonzero(keep)
+    error = np.abs(np.interp(frames, frames[kept], values[kept]) - values).max()
+    print(f"keys: {len(frames)} -> {len(kept)} "
+          f"({100.0 * len(kept) / len(frames):.1f}%), max error {error:.6f} "
+          f"(tolerance {tolerance}), {elapsed * 1000:.2f} ms")
+
+    numpy = addon.np
+    addon.np = None
+    try:
+        start = time.perf_counter()
+        kept = addon.reduce_keys(frames.tolist(), values.tolist(), tolerance)
+        elapsed = time.perf_counter() - start
+    finally:
+        addon.np = numpy
+    error = np.abs(np.interp(frames, frames[kept], values[kept]) - values).max()
+    print(f"pure Python fallback: {len(frames)} -> {len(kept)}, max error {error:.6f}, "
+          f"{elapsed * 1000:.2f} ms")
+
+    bench_fcurve(addon, frames, values, tolerance)
+
+
+def bench_fcurve(addon, frames, values, tolerance):
+    """simplify_fcurve 按曲线实际的 Bezier 插值检查误差，并随关键帧移动全部属性"""
+    fcurve = FakeFCurve(frames, values)
+    points = fcurve.keyframe_points
+    rng = np.random.default_rng(2)
+    types = rng.integers(0, 5, len(frames)).astype(np.int32)  # 关键帧类型（KEYFRAME、BREAKDOWN ...）
+    selected = rng.random(len(frames)) < 0.5
+    points.foreach_set('type', types)
+    points.foreach_set('select_control_point', selected)
+    original = {int(f): (t, s) for f, t, s in zip(frames, types, selected)}
+
+    # 只按线性插值挑选的关键帧在 Bezier 曲线上的误差
+    linear = FakeFCurve(frames[addon.simplify_keys(frames, values, tolerance)],
+                        values[addon.simplify_keys(frames, values, tolerance)])
+    linear_error = max(abs(linear.evaluate(f) - v) for f, v in zip(frames.tolist(), values.tolist()))
+
+    start = time.perf_counter()
+    count, kept = addon.simplify_fcurve(fcurve, tolerance)
+    elapsed = time.perf_counter() - start
+    error = max(abs(fcurve.evaluate(f) - v) for f, v in zip(frames.tolist(), values.tolist()))
+    co = np.empty(2 * kept, dtype=np.float32)
+    points.foreach_get('co', co)
+    kept_types = np.empty(kept, dtype=np.int32)
+    points.foreach_get('type', kept_types)
+    kept_selected = np.empty(kept, dtype=bool)
+    points.foreach_get('select_control_point', kept_selected)
+    mismatched = sum(original[int(f)] != (t, s) for f, t, s in zip(co[0::2], kept_types, kept_selected))
+    print(f"fcurve (Bezier): {count} -> {kept} keys, max error {error:.6f} "
+          f"(linear-only selection {linear_error:.6f}), {mismatched} keys with mismatched attributes, "
+          f"{elapsed * 1000:.2f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,66 @@
+"""
+漫游（物体朝向）移动的每周期开销：对比 1.1 漫游版的写法（每周期四次三角函数、
+四次分量写入再整体复制赋值）与缓存朝向矩阵 + 一次整体写入的 HeadingRelativeMovement。
+
+替身物体统计 RNA 属性的读写次数；在 Blender 中每次读写都要经过 RNA，比替身贵得多。
+最后用 bench_modal 的完整模态周期（物体模式 + WALK）给出整体的每周期耗时。
+
+用法: python benchmarks/bench_walk.py [周期数]
+"""
+import math
+import sys
+import time
+
+import bench_modal
+from blender_stubs import FakeObject, load_addon
+
+
+def legacy_move(obj, dx, dy):
+    """1.1 漫游版 GamepadControls--walkInBlender.py 中 move_object 的写法"""
+    obj.location.x += -1*dy*math.sin((obj.rotation_euler[2]))
+    obj.location.y +=    dy*math.cos((obj.rotation_euler[2]))
+
+    obj.location.y += dx*math.sin(obj.rotation_euler[2])
+    obj.location.x += dx*math.cos(obj.rotation_euler[2])
+
+    obj.location = obj.location.copy()
+
+
+def run(move, ticks, turn_every):
+    """每个周期推左摇杆移动；每 turn_every 个周期右摇杆转向一次"""
+    obj = FakeObject()
+    start = time.perf_counter()
+    for tick in range(ticks):
+        if tick % turn_every == 0:
+            obj.rotation_euler = (0.0, 0.0, 0.01 * (tick // turn_every + 1))
+        move(obj, 0.05, 0.1)
+    elapsed = time.perf_counter() - start
+    return elapsed, obj
+
+
+def main():
+    ticks = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    addon = load_addon()
+    model = addon.get_movement_model('WALK')
+
+    def cached_move(obj, dx, dy):
+        model.move_object(obj, None, dx, dy)
+
+    for turn_every in (1, 10):
+        results = {}
+        for name, move in (('legacy', legacy_move), ('cached basis', cached_move)):
+            elapsed, obj = run(move, ticks, turn_every)
+            turns = ticks // turn_every + (ticks % turn_every > 0)
+            results[name] = obj.location[:]
+            print(f"turn every {turn_every:>2} ticks  {name:<13} {elapsed / ticks * 1e6:6.2f} us/tick, "
+                  f"RNA reads {obj.rna_reads / ticks:4.1f}/tick, "
+                  f"writes {(obj.rna_writes - turns) / ticks:3.1f}/tick")
+        drift = max(abs(a - b) for a, b in zip(results['legacy'], results['cached basis']))
+        print(f"                     max position difference {drift:.2e}")
+
+    reports = bench_modal.synthetic_reports(addon, 20000)
+    bench_modal.bench_modal(addon, reports, 'OBJECT', min(ticks, 5000), 16, movement='WALK')
+
+
+if __name__ == '__main__':
+    main()
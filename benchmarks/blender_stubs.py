@@ -0,0 +1,636 @@
+"""
+无 Blender 环境下加载并驱动插件用的轻量替身模块。
+
+- bpy / bpy.types / bpy.props / bpy_extras: 只提供插件导入和模态操作器运行时用到的名字
+- mathutils: 纯 Python 的 Vector / Quaternion / Euler，语义与 Blender 一致，速度远慢于 C 实现
+- inputs: 从给定事件批次依次返回的 get_gamepad()
+- make_context(): 视角模式 / 物体模式下模态操作器所需的 context
+- FakeFCurve: 关键帧属性按列存放、按自动手柄 Bezier 求值的 F 曲线，用于关键帧精简
+
+足够在普通 Python（无显示、无手柄）中导入 GamepadControls.py，并运行读取线程和模态周期。
+测得的绝对数值不代表 Blender 内的耗时，只用于同一台机器上的前后对比。
+"""
+import bisect
+import importlib.util
+import math
+import os
+import sys
+import tempfile
+import threading
+import types
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _prop(*args, **kwargs):
+    return ('prop', args, kwargs)
+
+
+# mathutils 替身
+class Vector:
+    __slots__ = ('_data',)
+
+    def __init__(self, seq=(0.0, 0.0, 0.0)):
+        self._data = [float(v) for v in seq]
+
+    def __len__(self):
+        return len(self._data)
+
+    def __iter__(self):
+        return iter(self._data)
+
+    def __getitem__(self, index):
+        return self._data[index]
+
+    def __setitem__(self, index, value):
+        self._data[index] = value
+
+    def __repr__(self):
+        return f"Vector({tuple(self._data)})"
+
+    x = property(lambda self: self._data[0], lambda self, v: self._data.__setitem__(0, v))
+    y = property(lambda self: self._data[1], lambda self, v: self._data.__setitem__(1, v))
+    z = property(lambda self: self._data[2], lambda self, v: self._data.__setitem__(2, v))
+
+    def copy(self):
+        return Vector(self._data)
+
+    def __add__(self, other):
+        return Vector([a + b for a, b in zip(self._data, other)])
+
+    def __sub__(self, other):
+        return Vector([a - b for a, b in zip(self._data, other)])
+
+    def __mul__(self, scalar):
+        return Vector([a * scalar for a in self._data])
+
+    __rmul__ = __mul__
+
+    def __neg__(self):
+        return Vector([-a for a in self._data])
+
+    def __iadd__(self, other):
+        data = self._data
+        for i, b in enumerate(other):
+            data[i] += b
+        return self
+
+    def __isub__(self, other):
+        data = self._data
+        for i, b in enumerate(other):
+            data[i] -= b
+        return self
+
+    def __imul__(self, scalar):
+        data = self._data
+        for i in range(len(data)):
+            data[i] *= scalar
+        return self
+
+    def dot(self, other):
+        return sum(a * b for a, b in zip(self._data, other))
+
+    def cross(self, other):
+        ax, ay, az = self._data
+        bx, by, bz = other
+        return Vector((ay * bz - az * by, az * bx - ax * bz, ax * by - ay * bx))
+
+    @property
+    def length(self):
+        return math.sqrt(self.dot(self))
+
+    def normalized(self):
+        length = self.length
+        return self * (1.0 / length) if length else self.copy()
+
+
+class Quaternion:
+    __slots__ = ('w', 'x', 'y', 'z')
+
+    def __init__(self, seq=(1.0, 0.0, 0.0, 0.0), angle=None):
+        if angle is not None:
+            axis = Vector(seq).normalized()
+            s = math.sin(angle / 2.0)
+            seq = (math.cos(angle / 2.0), axis.x * s, axis.y * s, axis.z * s)
+        self.w, self.x, self.y, self.z = (float(v) for v in seq)
+
+    def __iter__(self):
+        return iter((self.w, self.x, self.y, self.z))
+
+    def __repr__(self):
+        return f"Quaternion({tuple(self)})"
+
+    def copy(self):
+        return Quaternion(tuple(self))
+
+    def normalized(self):
+        n = math.sqrt(self.w ** 2 + self.x ** 2 + self.y ** 2 + self.z ** 2)
+        return Quaternion((self.w / n, self.x / n, self.y / n, self.z / n))
+
+    def conjugated(self):
+        return Quaternion((self.w, -self.x, -self.y, -self.z))
+
+    def __matmul__(self, other):
+        if isinstance(other, Quaternion):
+            aw, ax, ay, az = self
+            bw, bx, by, bz = other
+            return Quaternion((aw * bw - ax * bx - ay * by - az * bz,
+                               aw * bx + ax * bw + ay * bz - az * by,
+                               aw * by - ax * bz + ay * bw + az * bx,
+                               aw * bz + ax * by - ay * bx + az * bw))
+        # 旋转向量: v' = v + w·t + q×t，t = 2·(q×v)
+        vx, vy, vz = other
+        qw, qx, qy, qz = self.w, self.x, self.y, self.z
+        tx = 2.0 * (qy * vz - qz * vy)
+        ty = 2.0 * (qz * vx - qx * vz)
+        tz = 2.0 * (qx * vy - qy * vx)
+        return Vector((vx + qw * tx + (qy * tz - qz * ty),
+                       vy + qw * ty + (qz * tx - qx * tz),
+                       vz + qw * tz + (qx * ty - qy * tx)))
+
+    def to_euler(self, order='XYZ'):
+        w, x, y, z = self
+        sinp = max(-1.0, min(1.0, 2.0 * (w * y - z * x)))
+        return Euler((math.atan2(2.0 * (w * x + y * z), 1.0 - 2.0 * (x * x + y * y)),
+                      math.asin(sinp),
+                      math.atan2(2.0 * (w * z + x * y), 1.0 - 2.0 * (y * y + z * z))), order)
+
+
+class Euler:
+    __slots__ = ('_data', 'order')
+
+    def __init__(self, seq=(0.0, 0.0, 0.0), order='XYZ'):
+        self._data = [float(v) for v in seq]
+        self.order = order
+
+    def __getitem__(self, index):
+        return self._data[index]
+
+    def __setitem__(self, index, value):
+        self._data[index] = value
+
+    def __iter__(self):
+        return iter(self._data)
+
+    def __len__(self):
+        return 3
+
+    def __repr__(self):
+        return f"Euler({tuple(self._data)}, '{self.order}')"
+
+    x = property(lambda self: self._data[0], lambda self, v: self._data.__setitem__(0, v))
+    y = property(lambda self: self._data[1], lambda self, v: self._data.__setitem__(1, v))
+    z = property(lambda self: self._data[2], lambda self, v: self._data.__setitem__(2, v))
+
+    def copy(self):
+        return Euler(self._data, self.order)
+
+    def to_quaternion(self):
+        hx, hy, hz = (a / 2.0 for a in self._data)
+        cx, sx = math.cos(hx), math.sin(hx)
+        cy, sy = math.cos(hy), math.sin(hy)
+        cz, sz = math.cos(hz), math.sin(hz)
+        return Quaternion((cx * cy * cz + sx * sy * sz,
+                           sx * cy * cz - cx * sy * sz,
+                           cx * sy * cz + sx * cy * sz,
+                           cx * cy * sz - sx * sy * cz))
+
+    def rotate(self, other):
+        """与 Blender 相同：在当前旋转之后再施加 other"""
+        self._data[:] = (other.to_quaternion() @ self.to_quaternion()).to_euler(self.order)._data
+
+
+class Matrix:
+    """只支持 3x3 旋转矩阵与向量相乘"""
+    __slots__ = ('rows',)
+
+    def __init__(self, rows=((1.0, 0.0, 0.0), (0.0, 1.0, 0.0), (0.0, 0.0, 1.0))):
+        self.rows = [Vector(row) for row in rows]
+
+    def __matmul__(self, other):
+        return Vector([row.dot(other) for row in self.rows])
+
+    def transposed(self):
+        return Matrix(zip(*self.rows))
+
+
+class Counter:
+    """记录调用次数的可调用替身（bpy.ops 等）"""
+
+    def __init__(self, result=None):
+        self.calls = 0
+        self.result = result
+
+    def __call__(self, *args, **kwargs):
+        self.calls += 1
+        return {'FINISHED'} if self.result is None else self.result
+
+
+def _install_mathutils():
+    mathutils = types.ModuleType('mathutils')
+    mathutils.Vector = Vector
+    mathutils.Quaternion = Quaternion
+    mathutils.Euler = Euler
+    mathutils.Matrix = Matrix
+    sys.modules['mathutils'] = mathutils
+
+
+def install():
+    """把 bpy / mathutils / bpy_extras 替身注册到 sys.modules"""
+    if 'bpy' in sys.modules:
+        return
+
+    bpy = types.ModuleType('bpy')
+    bpy.types = types.ModuleType('bpy.types')
+    bpy.props = types.ModuleType('bpy.props')
+    bpy.utils = types.ModuleType('bpy.utils')
+    bpy.path = types.SimpleNamespace(abspath=lambda path: path)
+    bpy.app = types.SimpleNamespace(handlers=types.SimpleNamespace(
+        persistent=lambda function: function, undo_post=[], redo_post=[], load_post=[]))
+    bpy.ops = types.SimpleNamespace(
+        view3d=types.SimpleNamespace(view_axis=Counter(), view_camera=Counter(), view_selected=Counter(),
+                                     view_persportho=Counter()),
+        screen=types.SimpleNamespace(frame_offset=Counter(), animation_play=Counter()),
+        ed=types.SimpleNamespace(undo=Counter(), redo=Counter()),
+        gamepad=types.SimpleNamespace(control=Counter()),
+    )
+
+    class Operator:
+        def __init__(self):
+            # 与 Blender 一样，注解声明的操作器属性取默认值
+            for cls in reversed(type(self).__mro__):
+                for name, value in getattr(cls, '__annotations__', {}).items():
+                    if isinstance(value, tuple) and value[:1] == ('prop',):
+                        setattr(self, name, value[2].get('default'))
+
+        def report(self, level, message):
+            pass
+
+    class Panel:
+        pass
+
+    class PropertyGroup:
+        pass
+
+    bpy.types.Operator = Operator
+    bpy.types.Panel = Panel
+    bpy.types.PropertyGroup = PropertyGroup
+    bpy.types.Scene = type('Scene', (), {})
+    for name in ('FloatProperty', 'PointerProperty', 'BoolProperty', 'IntProperty',
+                 'EnumProperty', 'StringProperty', 'CollectionProperty', 'FloatVectorProperty'):
+        setattr(bpy.props, name, _prop)
+    bpy.utils.register_class = lambda cls: None
+    bpy.utils.user_resource = lambda resource_type, path='', create=False: tempfile.gettempdir()
+    bpy.utils.unregister_class = lambda cls: None
+
+    bpy_extras = types.ModuleType('bpy_extras')
+    bpy_extras.view3d_utils = types.ModuleType('bpy_extras.view3d_utils')
+    bpy_extras.io_utils = types.ModuleType('bpy_extras.io_utils')
+    bpy_extras.io_utils.ExportHelper = type('ExportHelper', (), {})
+    bpy_extras.io_utils.ImportHelper = type('ImportHelper', (), {})
+
+    sys.modules['bpy'] = bpy
+    sys.modules['bpy.types'] = bpy.types
+    sys.modules['bpy.props'] = bpy.props
+    sys.modules['bpy.utils'] = bpy.utils
+    sys.modules['bpy_extras'] = bpy_extras
+    sys.modules['bpy_extras.view3d_utils'] = bpy_extras.view3d_utils
+    sys.modules['bpy_extras.io_utils'] = bpy_extras.io_utils
+    _install_mathutils()
+
+
+def install_inputs(batches=()):
+    """
+    注册 inputs 替身：get_gamepad() 依次返回 batches 中的事件批次，用完后抛出 EOFError
+    （读取线程把它当作输入结束）。release() 之前调用 block() 可让 get_gamepad() 一直阻塞，
+    用于模态基准中保持线程存活而不抢占事件。
+    插件会缓存导入的 inputs 模块，因此重复调用时复用同一个模块对象，只替换事件来源。
+    """
+    inputs = sys.modules.get('inputs')
+    if not getattr(inputs, 'is_stub', False):
+        inputs = types.ModuleType('inputs')
+        inputs.is_stub = True
+    source = iter(batches)
+    gate = threading.Event()
+    gate.set()
+
+    def get_gamepad():
+        gate.wait()
+        batch = next(source, None)
+        if batch is None:
+            raise EOFError
+        return batch
+
+    inputs.get_gamepad = get_gamepad
+    inputs.devices = types.SimpleNamespace(gamepads=[types.SimpleNamespace(name='Stub Gamepad')])
+    inputs.block = gate.clear
+    inputs.release = gate.set
+    sys.modules['inputs'] = inputs
+    return inputs
+
+
+def load_addon(filename='GamepadControls.py'):
+    """以模块形式加载插件文件"""
+    install()
+    path = os.path.join(ROOT, filename)
+    name = os.path.splitext(os.path.basename(path))[0].replace('-', '_')
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+# 场景与 context 替身
+class FakeSettings:
+    """GamepadSettings 替身，统计属性读取次数（在 Blender 中每次读取都要经过 RNA）"""
+
+    def __init__(self):
+        object.__setattr__(self, 'rna_reads', 0)
+
+    def __getattribute__(self, name):
+        if name != 'rna_reads' and not name.startswith('__'):
+            object.__setattr__(self, 'rna_reads', object.__getattribute__(self, 'rna_reads') + 1)
+        return object.__getattribute__(self, name)
+
+
+def make_settings(addon, **overrides):
+    """按 GamepadSettings 中声明的默认值构造设置对象"""
+    settings = FakeSettings()
+    for name, (_, _, kwargs) in addon.GamepadSettings.__annotations__.items():
+        default = kwargs.get('default')
+        items = kwargs.get('items')
+        if default is None and callable(items):
+            default = items(None, None)[0][0]  # 动态枚举默认取第一项
+        setattr(settings, name, default)
+    settings.enable_gamepad_control = True
+    for name, value in overrides.items():
+        setattr(settings, name, value)
+    return settings
+
+
+def _counted(base):
+    """RNA 属性包装：分量赋值同样直接写入 RNA，计入所属物体的写入次数"""
+
+    def component(index):
+        def setter(self, value):
+            self.owner.rna_writes += 1
+            self._data[index] = value
+        return property(lambda self: self._data[index], setter)
+
+    def setitem(self, index, value):
+        self.owner.rna_writes += 1
+        self._data[index] = value
+
+    return type(f'RNA{base.__name__}', (base,), {
+        '__slots__': ('owner',),
+        '__setitem__': setitem,
+        'x': component(0), 'y': component(1), 'z': component(2),
+    })
+
+
+_RNAVector = _counted(Vector)
+_RNAEuler = _counted(Euler)
+
+
+def _rna_vector(name, wrapper):
+    """模拟 RNA 向量属性：读取返回写穿的包装，整体赋值时逐分量复制进去；统计读写次数"""
+    attr = '_' + name
+
+    def getter(self):
+        self.rna_reads += 1
+        return getattr(self, attr)
+
+    def setter(self, value):
+        self.rna_writes += 1
+        getattr(self, attr)._data[:] = [float(v) for v in value]
+
+    def init(self, value):
+        target = wrapper(value)
+        target.owner = self
+        setattr(self, attr, target)
+
+    prop = property(getter, setter)
+    return prop, init
+
+
+class FakeObject:
+    location, _init_location = _rna_vector('location', _RNAVector)
+    delta_location, _init_delta_location = _rna_vector('delta_location', _RNAVector)
+    rotation_euler, _init_rotation_euler = _rna_vector('rotation_euler', _RNAEuler)
+    scale, _init_scale = _rna_vector('scale', _RNAVector)
+
+    def __init__(self, name='Cube'):
+        self.name = name
+        self._init_location((0.0, 0.0, 0.0))
+        self._init_delta_location((0.0, 0.0, 0.0))
+        self._init_rotation_euler((0.0, 0.0, 0.0))
+        self._init_scale((1.0, 1.0, 1.0))
+        self.animation_data = None
+        self.selected = True
+        self.keyframes_inserted = 0
+        self.rna_reads = 0
+        self.rna_writes = 0
+
+    def select_get(self):
+        return self.selected
+
+    def keyframe_insert(self, data_path, group=None, index=-1, frame=None):
+        self.keyframes_inserted += 1
+        return True
+
+    def update_tag(self):
+        pass
+
+
+class FakeCollection(list):
+    """bpy.data.objects 替身：支持按属性批量读写的 foreach_get / foreach_set"""
+
+    def foreach_get(self, attribute, buffer):
+        i = 0
+        for item in self:
+            for value in getattr(item, attribute):
+                buffer[i] = value
+                i += 1
+
+    def foreach_set(self, attribute, buffer):
+        i = 0
+        for item in self:
+            target = getattr(item, attribute)
+            for j in range(len(target)):
+                target[j] = float(buffer[i])
+                i += 1
+
+
+# 关键帧属性：名称 -> (分量数, 默认值)
+_KEYFRAME_DEFAULTS = {
+    'co': (2, 0.0), 'handle_left': (2, 0.0), 'handle_right': (2, 0.0),
+    'interpolation': (1, 0), 'handle_left_type': (1, 0), 'handle_right_type': (1, 0),
+    'easing': (1, 0), 'type': (1, 0), 'back': (1, 1.70158), 'amplitude': (1, 0.8), 'period': (1, 4.1),
+    'select_control_point': (1, False), 'select_left_handle': (1, False), 'select_right_handle': (1, False),
+}
+
+
+class FakeKeyframePoints:
+    """fcurve.keyframe_points 替身：按属性存放各关键帧的分量，foreach_get/foreach_set 要求长度完全一致"""
+
+    def __init__(self, count=0):
+        self._data = {name: [default] * (size * count) for name, (size, default) in _KEYFRAME_DEFAULTS.items()}
+
+    def __len__(self):
+        return len(self._data['co']) // 2
+
+    def __getitem__(self, index):
+        count = len(self)
+        if not -count <= index < count:
+            raise IndexError(index)
+        return index % count
+
+    def add(self, count):
+        for name, (size, default) in _KEYFRAME_DEFAULTS.items():
+            self._data[name].extend([default] * (size * count))
+
+    def remove(self, point, fast=False):
+        for name, (size, _) in _KEYFRAME_DEFAULTS.items():
+            del self._data[name][point * size:(point + 1) * size]
+
+    def _check(self, name, buffer):
+        expected = len(self) * _KEYFRAME_DEFAULTS[name][0]
+        if len(buffer) != expected:
+            raise RuntimeError(f"foreach: {name} expects {expected} items, got {len(buffer)}")
+
+    def foreach_get(self, name, buffer):
+        self._check(name, buffer)
+        buffer[:] = self._data[name]
+
+    def foreach_set(self, name, buffer):
+        self._check(name, buffer)
+        self._data[name] = [v.item() if hasattr(v, 'item') else v for v in buffer]
+
+
+class FakeFCurve:
+    """
+    F 曲线替身：所有关键帧按自动钳制手柄的 Bezier 求值（Blender 新插入关键帧的默认设置）。
+    update() 按相邻关键帧重新计算手柄：斜率取两侧关键帧连线，局部极值处钳制为水平，
+    手柄横向长度为所在一段的 1/3，因此段内的帧号随 Bezier 参数线性变化。
+    """
+
+    def __init__(self, frames, values):
+        self.keyframe_points = FakeKeyframePoints(len(frames))
+        self.keyframe_points._data['co'] = [float(v) for pair in zip(frames, values) for v in pair]
+        self.update()
+
+    def update(self):
+        data = self.keyframe_points._data
+        co = data['co']
+        xs, ys = co[0::2], co[1::2]
+        count = len(xs)
+        left = [0.0] * (2 * count)
+        right = [0.0] * (2 * count)
+        for i in range(count):
+            if count == 1:
+                slope = 0.0
+            elif i == 0 or i == count - 1:
+                j = 1 if i == 0 else i
+                slope = (ys[j] - ys[j - 1]) / (xs[j] - xs[j - 1])
+            elif (ys[i] - ys[i - 1]) * (ys[i + 1] - ys[i]) <= 0.0:
+                slope = 0.0
+            else:
+                slope = (ys[i + 1] - ys[i - 1]) / (xs[i + 1] - xs[i - 1])
+            before = (xs[i] - xs[i - 1]) / 3.0 if i else 1.0
+            after = (xs[i + 1] - xs[i]) / 3.0 if i < count - 1 else 1.0
+            left[2 * i:2 * i + 2] = (xs[i] - before, ys[i] - slope * before)
+            right[2 * i:2 * i + 2] = (xs[i] + after, ys[i] + slope * after)
+        data['handle_left'] = left
+        data['handle_right'] = right
+
+    def evaluate(self, frame):
+        data = self.keyframe_points._data
+        co = data['co']
+        xs = co[0::2]
+        if frame <= xs[0]:
+            return co[1]
+        if frame >= xs[-1]:
+            return co[-1]
+        i = bisect.bisect_right(xs, frame) - 1
+        t = (frame - xs[i]) / (xs[i + 1] - xs[i])
+        y0, y3 = co[2 * i + 1], co[2 * i + 3]
+        y1, y2 = data['handle_right'][2 * i + 1], data['handle_left'][2 * i + 3]
+        u = 1.0 - t
+        return u * u * u * y0 + 3.0 * u * u * t * y1 + 3.0 * u * t * t * y2 + t * t * t * y3
+
+
+class FakeRegion3D:
+    """与 RNA 一样，赋值时复制数值，读取时返回新的包装对象"""
+
+    def __init__(self):
+        self._location = Vector()
+        self._rotation = Quaternion()
+        self.view_distance = 10.0
+
+    @property
+    def view_location(self):
+        return self._location.copy()
+
+    @view_location.setter
+    def view_location(self, value):
+        self._location = Vector(value)
+
+    @property
+    def view_rotation(self):
+        return self._rotation.copy()
+
+    @view_rotation.setter
+    def view_rotation(self, value):
+        self._rotation = Quaternion(value)
+
+
+class FakeScene:
+    def __init__(self, settings):
+        self.gamepad_settings = settings
+        self.frame_current = 1
+
+    def as_pointer(self):
+        return id(self)
+
+
+class FakeWindowManager:
+    def __init__(self):
+        self.timers_added = 0
+
+    def event_timer_add(self, interval, window=None):
+        self.timers_added += 1
+        return types.SimpleNamespace(time_step=interval)
+
+    def event_timer_remove(self, timer):
+        pass
+
+    def modal_handler_add(self, operator):
+        pass
+
+
+def make_context(addon, mode='VIEW', objects=1, selected=None, **settings):
+    """
+    mode 为 'VIEW'（没有选中物体，控制视角）、'OBJECT'（控制选中的活动物体）
+    或 'SELECTION'（场景中 objects 个物体，选中其中前 selected 个（默认全部）并开启批量变换）
+    """
+    scene_objects = FakeCollection(FakeObject(f'Cube.{i:03d}') for i in range(max(objects, 1)))
+    if selected is None:
+        selected = len(scene_objects)
+    for i, item in enumerate(scene_objects):
+        item.selected = mode != 'VIEW' and i < selected
+        item.location[0] = float(i)
+    sys.modules['bpy'].data = types.SimpleNamespace(objects=scene_objects)
+    obj = scene_objects[0]
+    if mode == 'SELECTION':
+        settings.setdefault('transform_selection', True)
+    area = types.SimpleNamespace(type='VIEW_3D', tag_redraw=Counter())
+    return types.SimpleNamespace(
+        scene=FakeScene(make_settings(addon, **settings)),
+        active_object=None if mode == 'VIEW' else obj,
+        selected_objects=[item for item in scene_objects if item.selected],
+        view_layer=types.SimpleNamespace(update=Counter()),
+        area=area,
+        space_data=types.SimpleNamespace(region_3d=FakeRegion3D()),
+        window_manager=FakeWindowManager(),
+        window=None,
+    )